@@ -21,6 +21,16 @@ export default function Dashboard() {
     const [filterDate, setFilterDate] = useState(new Date().toISOString().slice(0, 7));
     const [data, setData] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [yearMonths, setYearMonths] = useState([]);
+    const selectedYear = filterDate.split('-')[0];
+
+    // Year at a glance: all 12 months in one request (one query on the server)
+    useEffect(() => {
+        fetch(`http://127.0.0.1:8000/api/dashboard-range/?from=${selectedYear}-01&to=${selectedYear}-12`)
+            .then(res => res.json())
+            .then(json => setYearMonths(json.months || []))
+            .catch(err => console.error("API Error:", err));
+    }, [selectedYear]);
 
     useEffect(() => {
         setLoading(true);
@@ -131,6 +141,29 @@ export default function Dashboard() {
         );
     };
 
+    const YearGlance = () => (
+        <div style={{ display: 'grid', gridTemplateColumns: 'repeat(12, 1fr)', gap: '6px', marginBottom: '25px' }}>
+            {yearMonths.map((m, i) => {
+                const value = `${m.year}-${String(i + 1).padStart(2, '0')}`;
+                return (
+                    <div
+                        key={value}
+                        onClick={() => setFilterDate(value)}
+                        title={m.data.found ? `${m.month}: ${m.data.progress}%` : `${m.month}: no report`}
+                        style={{
+                            cursor: 'pointer', padding: '6px 4px', textAlign: 'center', borderRadius: '6px',
+                            border: value === filterDate ? '2px solid #2196f3' : '1px solid #e0e0e0',
+                            background: m.data.found ? `rgba(39, 174, 96, ${0.15 + m.data.progress / 125})` : '#f5f5f5'
+                        }}
+                    >
+                        <div style={{ fontSize: '12px' }}>{m.month.slice(0, 3)}</div>
+                        <strong style={{ fontSize: '12px' }}>{m.data.found ? `${m.data.progress}%` : '-'}</strong>
+                    </div>
+                );
+            })}
+        </div>
+    );
+
     return (
         <div className="dashboard-layout">
             {/* Top Navigation Bar */}
@@ -158,6 +191,9 @@ export default function Dashboard() {
                     </div>
                 ) : data ? (
                     <>
+                        <div className="section-title">{selectedYear} at a Glance</div>
+                        <YearGlance />
+
                         <div className="section-title">Current Period</div>
                         <MonthCard sectionData={data.current} isCurrent={true} />
 
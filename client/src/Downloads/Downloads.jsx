@@ -9,6 +9,16 @@ export default function Dashboard() {
 
     const [filterDate, setFilterDate] = useState(new Date().toISOString().slice(0, 7));
     const [data, setData] = useState(null);
+    const [yearMonths, setYearMonths] = useState([]);
+    const selectedYear = filterDate.split('-')[0];
+
+    // Whole year in one request for the summary table
+    useEffect(() => {
+        fetch(`http://127.0.0.1:8000/api/dashboard-range/?from=${selectedYear}-01&to=${selectedYear}-12`)
+            .then(res => res.json())
+            .then(json => setYearMonths(json.months || []))
+            .catch(err => console.error("API Error:", err));
+    }, [selectedYear]);
 
     // Fetch Data
     useEffect(() => {
@@ -89,8 +99,35 @@ export default function Dashboard() {
                 <button onClick={() => navigate('/downloads')} style={{ padding: '8px 12px', cursor: 'pointer', background: '#e3f2fd', border: '1px solid #2196f3', borderRadius: '4px' }}>
                     📂 Downloads
                 </button>
+                {/* Streamed exports of the resolved address -> locality -> zone -> KM table */}
+                <a href="http://127.0.0.1:8000/api/export-localities/?format=csv" style={{ padding: '8px 12px', background: '#e8f5e9', border: '1px solid #4caf50', borderRadius: '4px', textDecoration: 'none', color: 'inherit' }}>
+                    ⬇️ Localities CSV
+                </a>
+                <a href="http://127.0.0.1:8000/api/export-localities/?format=xlsx" style={{ padding: '8px 12px', background: '#e8f5e9', border: '1px solid #4caf50', borderRadius: '4px', textDecoration: 'none', color: 'inherit' }}>
+                    ⬇️ Localities XLSX
+                </a>
             </div>
 
+            {/* Year at a glance */}
+            <table style={{ width: '100%', borderCollapse: 'collapse', marginBottom: '30px' }}>
+                <thead>
+                    <tr>
+                        <th style={{ textAlign: 'left' }}>{selectedYear}</th>
+                        {yearMonths.map(m => <th key={m.month}>{m.month.slice(0, 3)}</th>)}
+                    </tr>
+                </thead>
+                <tbody>
+                    <tr>
+                        <td>Progress</td>
+                        {yearMonths.map(m => (
+                            <td key={m.month} style={{ textAlign: 'center', color: m.data.found ? 'inherit' : '#aaa' }}>
+                                {m.data.found ? `${m.data.progress}%` : '-'}
+                            </td>
+                        ))}
+                    </tr>
+                </tbody>
+            </table>
+
             {renderMonthSection(data.current, true)}
 
             <div className="divider"><span>PREVIOUS MONTH</span></div>
@@ -5,6 +5,65 @@ import './Dashboard.css';
 export default function GPSChecker() {
     const navigate = useNavigate();
     const [coords, setCoords] = useState('');
+    const [zone, setZone] = useState('');
+    const [csvFile, setCsvFile] = useState(null);
+    const [result, setResult] = useState(null);
+    const [loading, setLoading] = useState(false);
+
+    // Track upload (GPX / CSV) -> per-track summaries for the MIS month
+    const [trackFile, setTrackFile] = useState(null);
+    const [trackMonth, setTrackMonth] = useState(new Date().toISOString().slice(0, 7));
+    const [trackStage, setTrackStage] = useState('');
+    const [trackResult, setTrackResult] = useState(null);
+    const [uploading, setUploading] = useState(false);
+
+    // Pasted points go as JSON; a CSV of trips (trip_id, lat, lng, timestamp, zone) as a file
+    const validate = async () => {
+        setLoading(true);
+        setResult(null);
+        try {
+            let res;
+            if (csvFile) {
+                const formData = new FormData();
+                formData.append('file', csvFile);
+                formData.append('zone', zone);
+                res = await fetch('http://127.0.0.1:8000/api/validate-gps/', { method: 'POST', body: formData });
+            } else {
+                res = await fetch('http://127.0.0.1:8000/api/validate-gps/', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ text: coords, zone })
+                });
+            }
+            const data = await res.json();
+            if (data.success) setResult(data);
+            else alert("Error: " + data.error);
+        } catch (err) {
+            console.error("API Error:", err);
+        }
+        setLoading(false);
+    };
+
+    const uploadTracks = async () => {
+        const [year, month] = trackMonth.split('-');
+        const formData = new FormData();
+        formData.append('file', trackFile);
+        formData.append('year', year);
+        formData.append('month', String(parseInt(month, 10)));
+        formData.append('stage', trackStage);
+
+        setUploading(true);
+        setTrackResult(null);
+        try {
+            const res = await fetch('http://127.0.0.1:8000/api/upload-tracks/', { method: 'POST', body: formData });
+            const data = await res.json();
+            if (data.success) setTrackResult(data);
+            else alert("Error: " + data.error);
+        } catch (err) {
+            console.error("API Error:", err);
+        }
+        setUploading(false);
+    };
 
     return (
         <div className="dashboard-container">
@@ -26,9 +85,87 @@ export default function GPSChecker() {
                         style={{ width: '100%', padding: '10px', marginTop: '5px' }}
                     />
                 </div>
-                <button style={{ width: '100%', padding: '10px', background: '#27ae60', color: 'white', border: 'none' }}>
-                    Validate Coordinates
+                <div style={{ marginBottom: '15px' }}>
+                    <label>Or upload trips CSV:</label>
+                    <input type="file" accept=".csv" onChange={(e) => setCsvFile(e.target.files[0] || null)} style={{ marginTop: '5px' }} />
+                </div>
+                <div style={{ marginBottom: '15px' }}>
+                    <label>Billing Zone (optional):</label>
+                    <input
+                        value={zone}
+                        onChange={(e) => setZone(e.target.value)}
+                        placeholder="e.g. South Zone"
+                        style={{ width: '100%', padding: '8px', marginTop: '5px' }}
+                    />
+                </div>
+                <button
+                    onClick={validate}
+                    disabled={loading || (!coords.trim() && !csvFile)}
+                    style={{ width: '100%', padding: '10px', background: '#27ae60', color: 'white', border: 'none' }}
+                >
+                    {loading ? 'Validating...' : 'Validate Coordinates'}
                 </button>
+
+                {result && (
+                    <div style={{ marginTop: '20px' }}>
+                        <h3>{result.summary.passed ? '✅ All checks passed' : '⚠️ Issues found'}</h3>
+                        <p>
+                            {result.summary.points} points in {result.summary.trips} trip(s) |
+                            Out of range: {result.summary.invalid} |
+                            Duplicates: {result.summary.duplicates} |
+                            Teleports: {result.summary.teleports} |
+                            KM mismatches: {result.summary.km_mismatches}
+                        </p>
+                        <table style={{ width: '100%', borderCollapse: 'collapse' }}>
+                            <thead>
+                                <tr>
+                                    <th>Trip</th><th>Points</th><th>Distance (km)</th><th>Zone</th><th>Billing KM</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                                {result.trips.slice(0, 100).map(trip => (
+                                    <tr key={trip.trip_id} style={{ color: trip.km_ok === false || trip.teleports ? '#c0392b' : 'inherit' }}>
+                                        <td>{trip.trip_id}</td>
+                                        <td>{trip.points}</td>
+                                        <td>{trip.distance_km}</td>
+                                        <td>{trip.zone}</td>
+                                        <td>{trip.billing_km}</td>
+                                    </tr>
+                                ))}
+                            </tbody>
+                        </table>
+                    </div>
+                )}
+            </div>
+
+            <div className="sub-tasks-panel" style={{ maxWidth: '500px', margin: '20px auto 0' }}>
+                <h3>Upload GPX / CSV Tracks</h3>
+                <div style={{ marginBottom: '15px' }}>
+                    <input type="file" accept=".gpx,.csv" onChange={(e) => setTrackFile(e.target.files[0] || null)} />
+                </div>
+                <div style={{ display: 'flex', gap: '10px', marginBottom: '15px' }}>
+                    <input type="month" value={trackMonth} onChange={(e) => setTrackMonth(e.target.value)} />
+                    <select value={trackStage} onChange={(e) => setTrackStage(e.target.value)}>
+                        <option value="">Stage from track date</option>
+                        <option value="1">Stage 1 (1st - 10th)</option>
+                        <option value="2">Stage 2 (11th - 20th)</option>
+                        <option value="3">Stage 3 (21st - End)</option>
+                    </select>
+                </div>
+                <button
+                    onClick={uploadTracks}
+                    disabled={uploading || !trackFile}
+                    style={{ width: '100%', padding: '10px', background: '#2980b9', color: 'white', border: 'none' }}
+                >
+                    {uploading ? 'Uploading...' : 'Upload Tracks'}
+                </button>
+
+                {trackResult && (
+                    <p style={{ marginTop: '15px' }}>
+                        ✅ {trackResult.tracks} track(s), {trackResult.points} points,
+                        {' '}{trackResult.distance_km} km in {trackResult.seconds}s
+                    </p>
+                )}
             </div>
         </div>
     );
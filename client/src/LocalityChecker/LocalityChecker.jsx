@@ -10,11 +10,21 @@ const IconSave = () => <span>💾</span>;
 const IconCancel = () => <span>❌</span>;
 const IconPlus = () => <span>➕</span>;
 
+// Work-queue identity: next-pending leases addresses per operator so two
+// people never get the same row. Generated once and kept per browser.
+const getOperatorId = () => {
+    let id = localStorage.getItem('localityOperator');
+    if (!id) {
+        id = `op-${crypto.randomUUID()}`;
+        localStorage.setItem('localityOperator', id);
+    }
+    return id;
+};
+
 export default function LocalityManager() {
     const [activeTab, setActiveTab] = useState('view'); // 'view', 'set', 'add'
 
     // --- Global Data ---
-    const [masterLocalities, setMasterLocalities] = useState([]); // Dropdown data
     const [uniqueZones, setUniqueZones] = useState([]); // List of unique zones for Tab 3
     const [globalPending, setGlobalPending] = useState(0);
 
@@ -22,6 +32,8 @@ export default function LocalityManager() {
     const [tableData, setTableData] = useState([]);
     const [page, setPage] = useState(1);
     const [totalPages, setTotalPages] = useState(1);
+    const [cursors, setCursors] = useState(['']); // cursors[n] = "after" id for page n + 1
+    const [hasMore, setHasMore] = useState(false);
     const [viewSearch, setViewSearch] = useState('');
     const [editingId, setEditingId] = useState(null);
     const [editValue, setEditValue] = useState('');
@@ -31,6 +43,8 @@ export default function LocalityManager() {
     const [pendingItem, setPendingItem] = useState(null);
     const [selectedLocality, setSelectedLocality] = useState('');
     const [previewData, setPreviewData] = useState({ zone: '', km: '' });
+    const [typeaheadText, setTypeaheadText] = useState('');
+    const [typeaheadHits, setTypeaheadHits] = useState([]);
 
     // Bulk States
     const [bulkSearch, setBulkSearch] = useState('');
@@ -46,37 +60,43 @@ export default function LocalityManager() {
 
     // --- Initial Loads ---
     useEffect(() => {
-        fetchMasterDropdown();
+        fetchZones();
         fetchTableData(1);
     }, []);
 
     // --- API Calls ---
 
-    const fetchMasterDropdown = async () => {
+    // Zones for the Tab 3 dropdown. Localities are never loaded whole: every
+    // locality picker goes through the server-side typeahead below
+    const fetchZones = async () => {
         try {
-            const res = await fetch('http://127.0.0.1:8000/api/dropdown-localities/');
+            const res = await fetch('http://127.0.0.1:8000/api/master-zones/');
             const data = await res.json();
-            setMasterLocalities(data);
-
-            // Extract Unique Zones for Tab 3 Dropdown
-            const zones = [...new Set(data.map(item => item.billing_zone).filter(z => z))];
-            setUniqueZones(zones.sort());
-
+            setUniqueZones((data.results || []).map(item => item.billing_zone));
         } catch (error) {
-            console.error("Error fetching dropdown:", error);
+            console.error("Error fetching zones:", error);
         }
     };
 
     const fetchTableData = async (pageNo = 1) => {
         try {
-            const res = await fetch(`http://127.0.0.1:8000/api/localities/?page=${pageNo}&search=${viewSearch}`);
+            // Keyset paging: each page asks for rows "after" the last id of the previous one
+            const after = pageNo === 1 ? '' : (cursors[pageNo - 1] || '');
+            const res = await fetch(`http://127.0.0.1:8000/api/localities/?after=${after}&approx=1&search=${viewSearch}`);
             const data = await res.json();
 
             if (data && data.results) {
+                const nextCursor = data.pagination ? data.pagination.next_cursor : null;
                 setTableData(data.results);
-                setTotalPages(data.pagination ? data.pagination.total_pages : 1);
+                setTotalPages(data.pagination && data.pagination.total_pages ? data.pagination.total_pages : pageNo);
                 setGlobalPending(data.global_pending || 0);
                 setPage(pageNo);
+                setHasMore(Boolean(nextCursor));
+                setCursors(prev => {
+                    const next = pageNo === 1 ? [''] : prev.slice(0, pageNo);
+                    if (nextCursor) next[pageNo] = nextCursor;
+                    return next;
+                });
             } else {
                 setTableData([]);
             }
@@ -88,11 +108,12 @@ export default function LocalityManager() {
 
     const fetchNextPending = async () => {
         try {
-            const res = await fetch('http://127.0.0.1:8000/api/next-pending/');
+            const res = await fetch(`http://127.0.0.1:8000/api/next-pending/?operator=${encodeURIComponent(getOperatorId())}`);
             const data = await res.json();
             if (data.found) {
                 setPendingItem(data.data);
                 setSelectedLocality('');
+                setTypeaheadText('');
                 setPreviewData({ zone: '', km: '' });
             } else {
                 setPendingItem(null);
@@ -105,8 +126,8 @@ export default function LocalityManager() {
     // --- Logic: Inline Editing (View Tab) ---
     const startEditing = (row) => {
         setEditingId(row.id);
-        const currentLoc = masterLocalities.find(l => l.locality_name === row.locality);
-        setEditValue(row.locality_id || (currentLoc ? currentLoc.id : ''));
+        setEditValue(row.locality || '');
+        setTypeaheadText(row.locality || '');
     };
 
     const cancelEditing = () => {
@@ -114,43 +135,78 @@ export default function LocalityManager() {
         setEditValue('');
     };
 
+    // Saves {address_id, locality} pairs in one request and patches the
+    // returned rows into the table instead of refetching the page
+    const saveMappings = async (mappings) => {
+        const res = await fetch('http://127.0.0.1:8000/api/save-mappings/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ mappings })
+        });
+        const data = await res.json();
+        if (!data.success) throw new Error(data.error);
+
+        const saved = Object.fromEntries(data.results.map(row => [row.id, row]));
+        const nowDone = tableData.filter(row => saved[row.id] && row.status === 'Pending' && saved[row.id].status !== 'Pending').length;
+        setTableData(prev => prev.map(row => saved[row.id] || row));
+        setGlobalPending(prev => Math.max(0, prev - nowDone));
+        if (data.errors.length > 0) throw new Error(data.errors.map(e => `#${e.address_id}: ${e.error}`).join(', '));
+        return data;
+    };
+
     const saveEdit = async (rowId) => {
         if (!editValue) return;
+        const hit = findHit(editValue);
+        if (!hit) { alert("Pick a locality from the list!"); return; }
         try {
-            const res = await fetch('http://127.0.0.1:8000/api/save-mapping/', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ address_id: rowId, locality_id: editValue })
-            });
-            const data = await res.json();
-            if (data.success) { fetchTableData(page); cancelEditing(); }
-            else { alert("Update failed: " + data.error); }
-        } catch (err) { alert("Network error."); }
+            await saveMappings([{ address_id: rowId, locality: hit.id }]);
+            cancelEditing();
+        } catch (err) { alert("Update failed: " + err.message); }
     };
 
     // --- Logic: Tab 2 (Set/Bulk) ---
-    const handleLocalitySelect = (locId) => {
-        setSelectedLocality(locId);
-        const loc = masterLocalities.find(l => l.id == locId);
-        if (loc) {
-            setPreviewData({ zone: loc.billing_zone, km: loc.billing_km });
-        } else {
-            setPreviewData({ zone: '', km: '' });
-        }
+    // Server-side typeahead: only the top matches come over the wire
+    useEffect(() => {
+        if (!typeaheadText.trim()) { setTypeaheadHits([]); return; }
+        const timer = setTimeout(async () => {
+            try {
+                const res = await fetch(`http://127.0.0.1:8000/api/locality-typeahead/?prefix=${encodeURIComponent(typeaheadText)}&limit=20`);
+                const data = await res.json();
+                setTypeaheadHits(data.results || []);
+            } catch (error) {
+                console.error("Typeahead error:", error);
+            }
+        }, 150);
+        return () => clearTimeout(timer);
+    }, [typeaheadText]);
+
+    // Only a typeahead hit can be saved, so the master spelling is what gets stored
+    const findHit = (text) => {
+        const key = text.trim().toLowerCase();
+        return key ? typeaheadHits.find(l => l.locality_name.toLowerCase() === key) : undefined;
+    };
+
+    const selectHit = (hit) => {
+        setSelectedLocality(hit ? hit.id : '');
+        setPreviewData(hit ? { zone: hit.billing_zone, km: hit.billing_km } : { zone: '', km: '' });
     };
 
+    const handleTypeahead = (text) => {
+        setTypeaheadText(text);
+        selectHit(findHit(text));
+    };
+
+    // Hits arrive after the text was typed: match it again once they do
+    useEffect(() => {
+        selectHit(findHit(typeaheadText));
+    }, [typeaheadHits]);
+
     const handleSavePending = async () => {
         if (!pendingItem || !selectedLocality) { alert("Select a locality!"); return; }
         try {
-            const res = await fetch('http://127.0.0.1:8000/api/save-mapping/', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ address_id: pendingItem.id, locality_id: selectedLocality })
-            });
-            const data = await res.json();
-            if (data.success) { fetchNextPending(); fetchTableData(page); }
-            else { alert("Error: " + data.error); }
-        } catch (err) { console.error(err); }
+            await saveMappings([{ address_id: pendingItem.id, locality: selectedLocality }]);
+            fetchNextPending();
+        } catch (err) { alert("Error: " + err.message); }
     };
 
     // Bulk Logic
@@ -167,16 +223,23 @@ export default function LocalityManager() {
         if (activeTab === 'set' && setMode === 'bulk') { handleBulkSearch(1); }
     }, [activeTab, setMode]);
 
-    const handleBulkSave = async () => {
-        if (selectedBulkIds.length === 0 || !selectedLocality) { alert("Select addresses!"); return; }
+    // allMatches: map every pending row matching the search, not just the ticked ones
+    const handleBulkSave = async (allMatches = false) => {
+        if (!selectedLocality) { alert("Select a locality!"); return; }
+        if (!allMatches && selectedBulkIds.length === 0) { alert("Select addresses!"); return; }
+        if (allMatches && !window.confirm(`Map all ${bulkTotalRecords} addresses matching "${bulkSearch}" to ${selectedLocality}?`)) return;
         const res = await fetch('http://127.0.0.1:8000/api/bulk-save/', {
             method: 'POST',
-            body: JSON.stringify({ address_ids: selectedBulkIds, locality_id: selectedLocality })
+            body: JSON.stringify(allMatches
+                ? { q: bulkSearch, locality_id: selectedLocality }
+                : { address_ids: selectedBulkIds, locality_id: selectedLocality })
         });
         const data = await res.json();
         if (data.success) {
             alert(`Updated ${data.count} addresses!`);
-            setBulkResults([]); setBulkSearch(''); setSelectedBulkIds([]); fetchTableData(1);
+            setBulkResults([]); setBulkSearch(''); setSelectedBulkIds([]); handleTypeahead(''); fetchTableData(1);
+        } else {
+            alert("Error: " + data.error);
         }
     };
 
@@ -207,7 +270,7 @@ export default function LocalityManager() {
                 alert(data.message);
                 setNewLocalityName('');
                 setNewLocalityZone('');
-                fetchMasterDropdown(); // Refresh the master list so the new locality is available immediately
+                fetchZones(); // The typeahead sees the new locality right away (master ETag changes)
             } else {
                 alert("Error: " + data.error);
             }
@@ -229,6 +292,11 @@ export default function LocalityManager() {
                 </div>
             </header>
 
+            {/* Suggestions for every locality input (single, bulk, inline edit) */}
+            <datalist id="locality-typeahead">
+                {typeaheadHits.map(loc => <option key={loc.id} value={loc.locality_name}>{loc.billing_zone}</option>)}
+            </datalist>
+
             <div className="action-bar">
                 <button className={`btn-action ${activeTab === 'view' ? 'active' : ''}`} onClick={() => setActiveTab('view')}>View All</button>
                 <button className={`btn-action ${activeTab === 'set' ? 'active' : ''}`} onClick={() => { setActiveTab('set'); fetchNextPending(); }}>Set Locality (Auto)</button>
@@ -255,10 +323,7 @@ export default function LocalityManager() {
                                     <td><div style={{ maxHeight: '60px', overflowY: 'auto', fontSize: '0.85rem' }}>{row.address}</div></td>
                                     <td>
                                         {editingId === row.id ? (
-                                            <select value={editValue} onChange={(e) => setEditValue(e.target.value)} className="edit-select" autoFocus>
-                                                <option value="">-- Select --</option>
-                                                {masterLocalities.map(loc => <option key={loc.id} value={loc.id}>{loc.locality_name}</option>)}
-                                            </select>
+                                            <input list="locality-typeahead" value={editValue} onChange={(e) => { setEditValue(e.target.value); setTypeaheadText(e.target.value); }} className="edit-select" autoFocus />
                                         ) : (<strong>{row.locality || '-'}</strong>)}
                                     </td>
                                     <td>{row.billing_zone || '-'}</td>
@@ -280,8 +345,8 @@ export default function LocalityManager() {
                     </table>
                     <div className="pagination-controls">
                         <button disabled={page === 1} onClick={() => fetchTableData(page - 1)} className="btn-action">⬅ Prev</button>
-                        <span>Page {page} of {totalPages}</span>
-                        <button disabled={page === totalPages} onClick={() => fetchTableData(page + 1)} className="btn-action">Next ➡</button>
+                        <span>Page {page} of ~{totalPages}</span>
+                        <button disabled={!hasMore} onClick={() => fetchTableData(page + 1)} className="btn-action">Next ➡</button>
                     </div>
                 </div>
             )}
@@ -299,10 +364,7 @@ export default function LocalityManager() {
                                 <div className="pending-card"><label>Address:</label><div className="highlight-box">{pendingItem.address}</div></div>
                                 <div className="form-group">
                                     <label>Select Locality</label>
-                                    <select value={selectedLocality} onChange={(e) => handleLocalitySelect(e.target.value)}>
-                                        <option value="">-- Select --</option>
-                                        {masterLocalities.map(loc => <option key={loc.id} value={loc.id}>{loc.locality_name}</option>)}
-                                    </select>
+                                    <input list="locality-typeahead" placeholder="Start typing a locality..." value={typeaheadText} onChange={(e) => handleTypeahead(e.target.value)} />
                                 </div>
                                 <div className="info-row"><div>Zone: <strong>{previewData.zone}</strong></div><div>KM: <strong>{previewData.km}</strong></div></div>
                                 <button className="btn-primary" onClick={handleSavePending}>Save & Next ➡</button>
@@ -324,11 +386,11 @@ export default function LocalityManager() {
                                         </table>
                                     </div>
                                     <div className="bulk-action-area">
-                                        <select value={selectedLocality} onChange={(e) => handleLocalitySelect(e.target.value)}>
-                                            <option value="">-- Target Locality --</option>
-                                            {masterLocalities.map(loc => <option key={loc.id} value={loc.id}>{loc.locality_name}</option>)}
-                                        </select>
-                                        <button className="btn-primary" onClick={handleBulkSave}>Update Selected</button>
+                                        <input list="locality-typeahead" placeholder="Target locality..." value={typeaheadText} onChange={(e) => handleTypeahead(e.target.value)} />
+                                        <button className="btn-primary" onClick={() => handleBulkSave()}>Update Selected</button>
+                                        {bulkSearch.trim() && (
+                                            <button className="btn-primary" onClick={() => handleBulkSave(true)}>Update All {bulkTotalRecords} Matches</button>
+                                        )}
                                     </div>
                                 </>
                             )}
@@ -5,6 +5,8 @@ export default function VehicleList() {
     // 1. State for Data
     const [vehicles, setVehicles] = useState([]);
     const [searchTerm, setSearchTerm] = useState('');
+    const [nextCursor, setNextCursor] = useState(null);
+    const [totalCount, setTotalCount] = useState(0);
 
     // 2. State for Form (Adding New Vehicle)
     const [showForm, setShowForm] = useState(false);
@@ -16,17 +18,27 @@ export default function VehicleList() {
         rc_document: null // This will hold the file object
     });
 
-    // 3. Load Data on Page Load
+    // Bulk import (CSV / XLSX roster)
+    const [importing, setImporting] = useState(false);
+    const [importResult, setImportResult] = useState(null);
+
+    // 3. Load Data on Page Load / Search (server-side, debounced)
     useEffect(() => {
-        fetchVehicles();
-    }, []);
+        const timer = setTimeout(() => fetchVehicles(), 300);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
 
-    const fetchVehicles = async () => {
+    // First page, or the next one when `after` (a cursor) is given
+    const fetchVehicles = async (after = null) => {
         try {
-            const res = await fetch('http://127.0.0.1:8000/api/vehicles/');
+            const params = new URLSearchParams({ search: searchTerm });
+            if (after) params.set('after', after);
+            const res = await fetch(`http://127.0.0.1:8000/api/vehicles/?${params}`);
             const data = await res.json();
             if (data.results) {
-                setVehicles(data.results);
+                setVehicles(prev => (after ? [...prev, ...data.results] : data.results));
+                setNextCursor(data.pagination.next_cursor);
+                setTotalCount(data.pagination.total_records);
             }
         } catch (error) {
             console.error("Error fetching vehicles:", error);
@@ -67,11 +79,33 @@ export default function VehicleList() {
         }
     };
 
-    // 5. Filter Logic
-    const filteredVehicles = vehicles.filter(v =>
-        v.vehicle_no.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        (v.contact_no && v.contact_no.includes(searchTerm))
-    );
+    // 5. Bulk Import: one request upserts the whole roster on vehicle_no
+    const handleImport = async (e) => {
+        const file = e.target.files[0];
+        e.target.value = ''; // allow re-selecting the same file
+        if (!file) return;
+
+        const uploadData = new FormData();
+        uploadData.append('file', file);
+        setImporting(true);
+        try {
+            const res = await fetch('http://127.0.0.1:8000/api/import-vehicles/', {
+                method: 'POST',
+                body: uploadData
+            });
+            const result = await res.json();
+            if (result.success) {
+                setImportResult(result);
+                fetchVehicles();
+            } else {
+                alert("Error: " + result.error);
+            }
+        } catch (error) {
+            console.error("Error importing:", error);
+        } finally {
+            setImporting(false);
+        }
+    };
 
     return (
         <div className="vl-container">
@@ -79,13 +113,45 @@ export default function VehicleList() {
             <header className="vl-header">
                 <div className="title-group">
                     <h1>🚚 Vehicle List</h1>
-                    <span className="badge-count">{filteredVehicles.length} Total</span>
+                    <span className="badge-count">{totalCount} Total</span>
+                </div>
+                <div style={{ display: 'flex', gap: '10px' }}>
+                    <label className="btn-add">
+                        {importing ? '⏳ Importing...' : '📥 Import Roster'}
+                        <input type="file" accept=".csv,.xlsx" hidden disabled={importing} onChange={handleImport} />
+                    </label>
+                    <button className="btn-add" onClick={() => setShowForm(!showForm)}>
+                        {showForm ? '❌ Cancel' : '➕ Add New Vehicle'}
+                    </button>
                 </div>
-                <button className="btn-add" onClick={() => setShowForm(!showForm)}>
-                    {showForm ? '❌ Cancel' : '➕ Add New Vehicle'}
-                </button>
             </header>
 
+            {/* IMPORT REPORT (after a roster upload) */}
+            {importResult && (
+                <div className="form-panel">
+                    <h3>
+                        Import: {importResult.created} added, {importResult.updated} updated, {importResult.error_count} skipped
+                        <button className="btn-link" style={{ marginLeft: '10px' }} onClick={() => setImportResult(null)}>✖</button>
+                    </h3>
+                    {importResult.errors.length > 0 && (
+                        <table className="vl-table">
+                            <thead>
+                                <tr><th>Row</th><th>Vehicle Number</th><th>Error</th></tr>
+                            </thead>
+                            <tbody>
+                                {importResult.errors.map((err) => (
+                                    <tr key={err.row}>
+                                        <td>{err.row}</td>
+                                        <td>{err.vehicle_no || '-'}</td>
+                                        <td>{err.error}</td>
+                                    </tr>
+                                ))}
+                            </tbody>
+                        </table>
+                    )}
+                </div>
+            )}
+
             {/* ADD VEHICLE FORM (Visible only when showForm is true) */}
             {showForm && (
                 <div className="form-panel">
@@ -144,7 +210,7 @@ export default function VehicleList() {
                     <span className="search-icon">🔍</span>
                     <input
                         type="text"
-                        placeholder="Search by Vehicle No..."
+                        placeholder="Search by Vehicle No or Contact..."
                         value={searchTerm}
                         onChange={(e) => setSearchTerm(e.target.value)}
                     />
@@ -165,8 +231,8 @@ export default function VehicleList() {
                         </tr>
                     </thead>
                     <tbody>
-                        {filteredVehicles.length > 0 ? (
-                            filteredVehicles.map((row) => (
+                        {vehicles.length > 0 ? (
+                            vehicles.map((row) => (
                                 <tr key={row.id}>
                                     <td>#{row.id}</td>
                                     <td className="vehicle-no">{row.vehicle_no}</td>
@@ -175,10 +241,14 @@ export default function VehicleList() {
                                     <td>{row.ownership || '-'}</td>
                                     {/* Find this section in your table body */}
                                     <td>
-                                        {row.rc_document ? (
+                                        {(row.rc_status === 'pending' || row.rc_status === 'processing') ? (
+                                            <span className="text-muted">⏳ Processing...</span>
+                                        ) : row.rc_status === 'failed' ? (
+                                            <span className="text-muted">⚠️ Upload Failed</span>
+                                        ) : row.rc_document ? (
                                             <a
                                                 /* 🔥 FIX: Prepend the Backend URL to the file path */
-                                                href={`http://127.0.0.1:8000${row.rc_document}`}
+                                                href={row.rc_document.startsWith('http') ? row.rc_document : `http://127.0.0.1:8000${row.rc_document}`}
                                                 target="_blank"
                                                 rel="noopener noreferrer"
                                                 className="btn-link"
@@ -199,6 +269,14 @@ export default function VehicleList() {
                     </tbody>
                 </table>
             </div>
+
+            {nextCursor && (
+                <div style={{ textAlign: 'center', margin: '15px 0' }}>
+                    <button className="btn-add" onClick={() => fetchVehicles(nextCursor)}>
+                        Load More
+                    </button>
+                </div>
+            )}
         </div>
     );
 }
\ No newline at end of file
@@ -1,3 +1,4 @@
+import importlib.util
 import os
 import json
 from pathlib import Path
@@ -59,6 +60,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    # brotli / gzip for the /api/ responses only (tracker.middleware)
+    'tracker.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -101,6 +104,63 @@ DATABASES = {
         'PORT': secrets.get('DB_PORT'),
     }
 }
+# Reported by the tracker.W001 system check (runserver / manage.py check)
+DB_FALLBACK_SQLITE = 'DB_ENGINE' not in secrets
+
+# How Postgres connections are reused (DB_CONN_MODE in secrets.json):
+#   "pool"       - default. psycopg 3 connection pool (psycopg[binary,pool]
+#                  in pyproject.toml): connections are reused across requests
+#                  under ASGI (config/asgi.py) as well as WSGI
+#   "request"    - a connection per request, closed at its end (CONN_MAX_AGE
+#                  0); what the app did before DB_CONN_MODE existed
+#   "persistent" - WSGI only. One connection per worker thread, kept for
+#                  DB_CONN_MAX_AGE seconds and health-checked before reuse.
+#                  Under ASGI every request runs on a new thread, so these
+#                  connections pile up instead of being reused
+#   "pgbouncer"  - behind PgBouncer / the Supabase pooler in transaction mode:
+#                  no server-side cursors or prepared statements
+DB_CONN_MODE = secrets.get('DB_CONN_MODE', 'pool')
+
+# manage.py test also creates the unmanaged T3 tables (tracker.test_runner)
+TEST_RUNNER = 'tracker.test_runner.TrackerTestRunner'
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    _db = DATABASES['default']
+    if DB_CONN_MODE == 'pool':
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError:
+            raise ImproperlyConfigured("DB_CONN_MODE 'pool' needs psycopg 3 with psycopg_pool installed")
+        _db['CONN_MAX_AGE'] = 0  # the pool owns connection lifetimes
+        _db['OPTIONS'] = {
+            'pool': {
+                'min_size': secrets.get('DB_POOL_MIN_SIZE', 2),
+                'max_size': secrets.get('DB_POOL_MAX_SIZE', 10),
+                'timeout': secrets.get('DB_POOL_TIMEOUT', 10),
+                'check': ConnectionPool.check_connection,
+            },
+        }
+    elif DB_CONN_MODE == 'persistent':
+        _db['CONN_MAX_AGE'] = secrets.get('DB_CONN_MAX_AGE', 60)
+        _db['CONN_HEALTH_CHECKS'] = True
+    elif DB_CONN_MODE == 'request':
+        # Closed after every request: nothing is reused, nothing to health-check
+        _db['CONN_MAX_AGE'] = 0
+    elif DB_CONN_MODE == 'pgbouncer':
+        # Opening a connection to PgBouncer is cheap, so one per request by
+        # default; with DB_CONN_MAX_AGE set it is kept and checked before reuse
+        _db['CONN_MAX_AGE'] = secrets.get('DB_CONN_MAX_AGE', 0)
+        _db['CONN_HEALTH_CHECKS'] = _db['CONN_MAX_AGE'] != 0
+    else:
+        raise ImproperlyConfigured(f"Unknown DB_CONN_MODE: {DB_CONN_MODE}")
+
+    if DB_CONN_MODE == 'pgbouncer':
+        # Transaction pooling hands each transaction a different server
+        # connection, so nothing may outlive one: named cursors (.iterator())
+        # and psycopg 3's server-side prepared statements
+        _db['DISABLE_SERVER_SIDE_CURSORS'] = True
+        if importlib.util.find_spec('psycopg'):
+            _db['OPTIONS'] = {'prepare_threshold': None}
 
 
 # ==========================================
@@ -173,3 +233,26 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:5173",
 ]
 CORS_ALLOW_CREDENTIALS = True
+
+# ==========================================
+# 7. TRACKER SETTINGS
+# ==========================================
+# "Set Locality (Auto)" work queue: how long a claimed address stays reserved
+# for an operator, and how many addresses are handed out (current + prefetch)
+LOCALITY_CLAIM_LEASE_SECONDS = 300
+LOCALITY_CLAIM_BATCH = 5
+
+# Locality suggestions: mapped addresses sampled into the per-worker index,
+# and seconds before a worker rebuilds it; auto-mapping also needs a match
+# backed by at least SUGGEST_MIN_SUPPORT mapped addresses
+SUGGEST_SAMPLE_SIZE = 200000
+SUGGEST_INDEX_TTL = 600
+SUGGEST_MIN_SUPPORT = 3
+
+# Vehicle list: seconds a signed RC document URL is reused (keep below the
+# storage backend's URL expiry)
+RC_URL_CACHE_SECONDS = 3000
+
+# RC uploads are staged here and pushed to storage by background worker threads
+RC_STAGING_DIR = os.path.join(BASE_DIR, 'server/1media_staging')
+RC_WORKERS = 2
@@ -1,13 +1,31 @@
 from django.contrib import admin
 from rangefilter.filters import DateRangeFilterBuilder
 from django.utils.html import format_html
-from .models import MISReport, T3Locality, T3BillingZone, T3BillingKM, VehicleList
+from .models import MISReport, TrackSummary, T3Locality, T3BillingZone, T3BillingKM, T3LocalityBilling, LocalityClaim, LocalityCentroid, VehicleList
+from .search import search_addresses
 
 # --- 1. MIS REPORT ADMIN (Your existing code) ---
+class ProgressFilter(admin.SimpleListFilter):
+    # Buckets over the stored MISReport.progress column (indexed)
+    title = "progress"
+    parameter_name = "progress"
+    BUCKETS = {
+        'not_started': ("Not started", {'progress': 0}),
+        'in_progress': ("In progress", {'progress__gt': 0, 'progress__lt': 100}),
+        'done': ("Completed", {'progress': 100}),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (label, _) in self.BUCKETS.items()]
+
+    def queryset(self, request, queryset):
+        bucket = self.BUCKETS.get(self.value())
+        return queryset.filter(**bucket[1]) if bucket else queryset
+
 @admin.register(MISReport)
 class MISReportAdmin(admin.ModelAdmin):
     list_display = ('billing_month', 'billing_year', 'visual_progress', 'status_badge', 'created_at')
-    list_filter = (("created_at", DateRangeFilterBuilder()), 'billing_year',)
+    list_filter = (("created_at", DateRangeFilterBuilder()), 'billing_year', ProgressFilter)
     search_fields = ('billing_month', 'billing_year')
     
     fieldsets = (
@@ -18,25 +36,18 @@ class MISReportAdmin(admin.ModelAdmin):
         ('Final Stage', {'fields': ('final_mis_status', 'bill_approval_status'), 'classes': ('wide',), }),
     )
 
+    @admin.display(description="Progress Bar", ordering='progress')
     def visual_progress(self, obj):
-        total_steps = 8 
-        completed = sum([
-            obj.stage1_locality_set, obj.stage1_gps_check,
-            obj.stage2_locality_set, obj.stage2_gps_check,
-            obj.stage3_locality_set, obj.stage3_gps_check,
-            obj.final_mis_status, obj.bill_approval_status
-        ])
-        percent = int((completed / total_steps) * 100)
+        # Stored by MISReport.save(), no per-row recount
+        percent = obj.progress
         color = "red"
         if percent > 30: color = "orange"
         if percent > 70: color = "#2ecc71"
-        from django.utils.html import format_html
         return format_html(
-            '<div style="width:100px; background:#eee; border-radius:3px;">'
+            '<div style="width:100px; background:#eee; border-radius:3px;" title="{}%">'
             '<div style="width:{}%; background:{}; height:10px; border-radius:3px;"></div>'
-            '</div>', percent, color
+            '</div>', percent, percent, color
         )
-    visual_progress.short_description = "Progress Bar"
 
     def status_badge(self, obj):
         if obj.final_mis_status and obj.bill_approval_status: return "✅ Completed"
@@ -44,6 +55,14 @@ class MISReportAdmin(admin.ModelAdmin):
     status_badge.short_description = "Status"
 
 
+@admin.register(TrackSummary)
+class TrackSummaryAdmin(admin.ModelAdmin):
+    list_display = ('track_name', 'report', 'stage', 'points', 'distance_km', 'duration_seconds', 'started_at', 'source_file')
+    list_filter = ('stage', 'report')
+    search_fields = ('track_name', 'source_file')
+    list_select_related = ('report',)
+
+
 # --- 2. NEW ADMINS FOR LOCALITY DATA (So you can check the data) ---
 
 @admin.register(T3BillingZone)
@@ -51,6 +70,12 @@ class T3BillingZoneAdmin(admin.ModelAdmin):
     list_display = ('id', 't3_locality', 't3_billing_zone')
     search_fields = ('t3_locality', 't3_billing_zone')
 
+@admin.register(LocalityCentroid)
+class LocalityCentroidAdmin(admin.ModelAdmin):
+    list_display = ('locality', 'latitude', 'longitude', 'updated_at')
+    search_fields = ('locality__t3_locality',)
+    list_select_related = ('locality',)
+
 @admin.register(T3BillingKM)
 class T3BillingKMAdmin(admin.ModelAdmin):
     list_display = ('id', 't3_billing_zone', 't3_billing_km')
@@ -62,19 +87,37 @@ class T3LocalityAdmin(admin.ModelAdmin):
     search_fields = ('address', 't3_locality')
     list_filter = ('t3_locality',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the trigram / FTS5 index instead of ILIKE '%term%' scans
+        if not search_term:
+            return queryset, False
+        return search_addresses(queryset, search_term, fields=self.search_fields), False
+
+@admin.register(T3LocalityBilling)
+class T3LocalityBillingAdmin(admin.ModelAdmin):
+    list_display = ('address_id', 'billing_zone', 'billing_km', 'status', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('zone_key', 'locality_key')
+
+@admin.register(LocalityClaim)
+class LocalityClaimAdmin(admin.ModelAdmin):
+    list_display = ('address_id', 'operator', 'claimed_at', 'expires_at')
+    list_filter = ('operator',)
+
 # Don't forget to add VehicleList to your import at the top!
 # from .models import MISReport, T3Locality, T3BillingZone, T3BillingKM, VehicleList
 
 @admin.register(VehicleList)
 class VehicleListAdmin(admin.ModelAdmin):
     # 1. Columns to show in the list
-    list_display = ('id', 'vehicle_no', 'contact_no', 'cab_type', 'vehicle_ownership', 'rc_document_link')
+    list_display = ('id', 'vehicle_no', 'contact_no', 'cab_type', 'vehicle_ownership', 'rc_document_link', 'rc_status', 'rc_processed_at')
     
     # 2. Search bar configuration
     search_fields = ('vehicle_no', 'contact_no')
     
     # 3. Filters on the right sidebar
-    list_filter = ('cab_type', 'vehicle_ownership')
+    list_filter = ('cab_type', 'vehicle_ownership', 'rc_status')
+    readonly_fields = ('rc_status', 'rc_staged_path', 'rc_queued_at', 'rc_started_at', 'rc_processed_at', 'rc_error')
 
     # 4. Custom function to make the RC link clickable
     def rc_document_link(self, obj):
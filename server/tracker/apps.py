@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class TrackerConfig(AppConfig):
     name = 'tracker'
+
+    def ready(self):
+        # Wire up cache invalidation for the master tables
+        from . import signals  # noqa: F401
+        # System checks (SQLite fallback warning)
+        from . import checks  # noqa: F401
@@ -0,0 +1,139 @@
+# Batch auto-mapping of pending addresses.
+# Scoring runs in a process pool; this module only imports Django lazily so
+# spawned workers can load it before django.setup() has run.
+import multiprocessing
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+AUTOMAP_CHUNK = 2000
+DEFAULT_CUTOFF = 0.8
+
+_worker_index = None
+
+
+# ==========================================
+# 1. WORKER SIDE
+# ==========================================
+def _init_worker(state):
+    global _worker_index
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+    from .suggest import SuggestionIndex
+    _worker_index = SuggestionIndex(*state)
+
+
+def _score_chunk(rows):
+    """[(id, address)] -> [(id, best_locality or None, score, support)]."""
+    scored = []
+    for pk, address in rows:
+        best = _worker_index.suggest(address, limit=1)
+        if best:
+            scored.append((pk, *best[0]))
+        else:
+            scored.append((pk, None, 0.0, 0))
+    return scored
+
+
+# ==========================================
+# 2. PARENT SIDE
+# ==========================================
+def _pending_chunks(chunk_size):
+    """Pending, unclaimed (id, address) rows in id order, one chunk at a time."""
+    from .models import T3Locality, LocalityClaim
+    from .counters import PENDING_Q
+
+    pending = (
+        T3Locality.objects.filter(PENDING_Q)
+        .exclude(id__in=LocalityClaim.objects.values('address_id'))
+        .order_by('id')
+    )
+    last_id = 0
+    while True:
+        rows = list(pending.filter(id__gt=last_id).values_list('id', 'address')[:chunk_size])
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+
+
+def run_automap(cutoff=DEFAULT_CUTOFF, workers=None, chunk_size=AUTOMAP_CHUNK,
+                dry_run=False, progress=None, min_support=None):
+    """
+    Scores every pending address against the master localities in a process
+    pool and applies matches scoring >= `cutoff` and backed by at least
+    `min_support` mapped addresses through mapping.fill_pending.
+    Lower-confidence rows are left pending for the operators, and rows an
+    operator mapped or claimed while the run was scoring them are left
+    alone (counted as `skipped`).
+    Returns a stats dict; `progress(stats)` is called after every chunk.
+    """
+    from django.db import connections
+    from .suggest import MIN_SUPPORT, build_index
+    from . import mapping
+
+    if min_support is None:
+        min_support = MIN_SUPPORT
+
+    index = build_index()
+    state = (index.postings, index.token_totals, index.doc_count, index.names)
+
+    # Workers never touch the database; don't let them inherit connections
+    connections.close_all()
+
+    stats = {"scanned": 0, "applied": 0, "below_cutoff": 0, "low_support": 0,
+             "no_match": 0, "skipped": 0}
+    started = time.monotonic()
+    max_workers = workers or multiprocessing.cpu_count()
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(state,),
+    ) as pool:
+        in_flight = deque()
+        chunks = _pending_chunks(chunk_size)
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is not None:
+                in_flight.append(pool.submit(_score_chunk, chunk))
+
+        # Keep a bounded number of chunks queued so memory stays flat
+        for _ in range(max_workers * 2):
+            submit_next()
+
+        while in_flight:
+            scored = in_flight.popleft().result()
+            submit_next()
+
+            accepted = defaultdict(list)
+            for pk, locality, score, support in scored:
+                if locality is None:
+                    stats["no_match"] += 1
+                elif score < cutoff:
+                    stats["below_cutoff"] += 1
+                elif support < min_support:
+                    stats["low_support"] += 1
+                else:
+                    accepted[locality].append(pk)
+            stats["scanned"] += len(scored)
+
+            for locality, ids in accepted.items():
+                # Re-checked at write time: still pending, not leased to an operator
+                applied = len(ids) if dry_run else mapping.fill_pending(ids, locality, skip_claimed=True)
+                stats["applied"] += applied
+                stats["skipped"] += len(ids) - applied
+
+            if progress:
+                elapsed = time.monotonic() - started
+                progress(dict(stats, rows_per_sec=int(stats["scanned"] / elapsed) if elapsed else 0))
+
+    elapsed = time.monotonic() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["rows_per_sec"] = int(stats["scanned"] / elapsed) if elapsed else stats["scanned"]
+    return stats
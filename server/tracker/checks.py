@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+# Untagged so runserver / every manage.py check shows it (database-tagged
+# checks only run with --database)
+@register()
+def sqlite_fallback_check(app_configs, **kwargs):
+    """Warns when secrets.json has no DB_ENGINE and the app runs on local SQLite."""
+    if not getattr(settings, 'DB_FALLBACK_SQLITE', False):
+        return []
+    return [Warning(
+        "DB_ENGINE is not set in secrets.json; using the local SQLite fallback database.",
+        hint="Add DB_ENGINE / DB_NAME / DB_HOST ... to server/1credintial/secrets.json to use Postgres.",
+        id='tracker.W001',
+    )]
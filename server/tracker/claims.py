@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import T3Locality, LocalityClaim
+from .counters import PENDING_Q
+
+LEASE_SECONDS = getattr(settings, 'LOCALITY_CLAIM_LEASE_SECONDS', 300)
+BATCH_SIZE = getattr(settings, 'LOCALITY_CLAIM_BATCH', 5)
+
+# Attempts when another operator wins the race for the same rows (SQLite path)
+MAX_ATTEMPTS = 3
+
+
+def _grab(operator, wanted, expires_at):
+    """Claims up to `wanted` unclaimed pending rows; returns the ids we got."""
+    candidates = (
+        T3Locality.objects.filter(PENDING_Q)
+        .exclude(id__in=LocalityClaim.objects.values('address_id'))
+        .order_by('id')
+    )
+    if connection.features.has_select_for_update_skip_locked:
+        # PostgreSQL: rows another operator is claiming right now are skipped
+        candidates = candidates.select_for_update(skip_locked=True, of=('self',))
+    ids = list(candidates.values_list('id', flat=True)[:wanted])
+    if not ids:
+        return []
+
+    # The primary key on address_id is the final arbiter: on SQLite two
+    # claimers can read the same candidates, and the loser's rows are ignored
+    LocalityClaim.objects.bulk_create(
+        [LocalityClaim(address_id=pk, operator=operator, expires_at=expires_at) for pk in ids],
+        ignore_conflicts=True,
+    )
+    return list(
+        LocalityClaim.objects.filter(address_id__in=ids, operator=operator)
+        .values_list('address_id', flat=True)
+    )
+
+
+def claim_pending(operator, batch_size=BATCH_SIZE, lease_seconds=LEASE_SECONDS):
+    """
+    Hands `operator` a batch of pending addresses nobody else holds.
+
+    Leases the operator already holds are renewed and reused first, expired
+    leases go back to the pool, and the batch is topped up to `batch_size`.
+    Returns [{id, address, expires_at}] ordered by id (first = current row,
+    the rest = prefetch).
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lease_seconds)
+
+    for _ in range(MAX_ATTEMPTS):
+        with transaction.atomic():
+            LocalityClaim.objects.filter(expires_at__lte=now).delete()
+
+            held = LocalityClaim.objects.filter(operator=operator)
+            held.update(expires_at=expires_at)
+            held_ids = set(held.values_list('address_id', flat=True))
+
+            wanted = batch_size - len(held_ids)
+            if wanted > 0:
+                held_ids.update(_grab(operator, wanted, expires_at))
+        if wanted <= 0 or len(held_ids) >= batch_size:
+            break
+        # Lost some rows to another operator; only retry if more are pending
+        if not T3Locality.objects.filter(PENDING_Q).exclude(
+            id__in=LocalityClaim.objects.values('address_id')
+        ).exists():
+            break
+
+    rows = T3Locality.objects.filter(id__in=held_ids).values('id', 'address').order_by('id')
+    return [dict(row, expires_at=expires_at) for row in rows]
+
+
+def release(address_ids, operator=None):
+    """Drops the leases on the given addresses (e.g. once they are saved)."""
+    claims = LocalityClaim.objects.filter(address_id__in=list(address_ids))
+    if operator:
+        claims = claims.filter(operator=operator)
+    return claims.delete()[0]
+
+
+def release_operator(operator):
+    """Returns everything an operator holds to the pool."""
+    return LocalityClaim.objects.filter(operator=operator).delete()[0]
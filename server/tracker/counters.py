@@ -0,0 +1,46 @@
+from asgiref.sync import sync_to_async
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import T3Locality, TrackerCounter
+
+PENDING_KEY = 'pending_addresses'
+
+# Same predicate as the partial index t3_locality_pending_idx
+PENDING_Q = Q(t3_locality__isnull=True) | Q(t3_locality='')
+
+
+def is_pending(locality_name):
+    return locality_name in (None, '')
+
+
+def recount_pending():
+    """Resets the pending counter from a real COUNT(*) and returns it."""
+    value = T3Locality.objects.filter(PENDING_Q).count()
+    TrackerCounter.objects.update_or_create(key=PENDING_KEY, defaults={'value': value})
+    return value
+
+
+def pending_count():
+    """Number of addresses without a locality (one indexed row read)."""
+    value = TrackerCounter.objects.filter(key=PENDING_KEY).values_list('value', flat=True).first()
+    if value is None:
+        # First read after deploy: seed the counter once
+        return recount_pending()
+    return value
+
+
+async def apending_count():
+    """pending_count for async views."""
+    value = await TrackerCounter.objects.filter(key=PENDING_KEY).values_list('value', flat=True).afirst()
+    if value is None:
+        return await sync_to_async(recount_pending)()
+    return value
+
+
+def adjust_pending(delta):
+    """Adds `delta` to the pending counter (call inside the writing transaction)."""
+    if delta:
+        TrackerCounter.objects.filter(key=PENDING_KEY).update(
+            value=F('value') + delta, updated_at=timezone.now()
+        )
@@ -0,0 +1,74 @@
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+# Per-process counters, fed by the connection_created / request_started
+# receivers in tracker.signals. With a pool, connection_created fires on
+# every checkout, so db_stats takes real opens from the pool instead.
+_lock = threading.Lock()
+_counts = {'requests': 0, 'connections_opened': 0}
+
+
+def request_started():
+    with _lock:
+        _counts['requests'] += 1
+
+
+def connection_opened():
+    with _lock:
+        _counts['connections_opened'] += 1
+
+
+def _pool_stats(pool):
+    """psycopg_pool's counters reshaped for monitoring (checkouts, waits, saturation)."""
+    raw = pool.get_stats()
+    size = raw.get('pool_size', 0)
+    in_use = size - raw.get('pool_available', 0)
+    checkouts = raw.get('requests_num', 0)
+    wait_ms = raw.get('requests_wait_ms', 0)
+    return {
+        "min_size": pool.min_size,
+        "max_size": pool.max_size,
+        "size": size,
+        "in_use": in_use,
+        "saturation": round(in_use / pool.max_size, 3) if pool.max_size else None,
+        "waiting": raw.get('requests_waiting', 0),
+        "checkouts": checkouts,
+        "queued": raw.get('requests_queued', 0),
+        "timeouts": raw.get('requests_errors', 0),
+        "wait_ms_total": wait_ms,
+        "avg_wait_ms": round(wait_ms / checkouts, 3) if checkouts else 0,
+        "connections_opened": raw.get('connections_num', 0),
+        "connect_ms_total": raw.get('connections_ms', 0),
+        "connection_errors": raw.get('connections_errors', 0),
+    }
+
+
+def db_stats(alias='default'):
+    """Connection settings and reuse counters of this worker process."""
+    connection = connections[alias]
+    config = connection.settings_dict
+    with _lock:
+        counts = dict(_counts)
+    pool = getattr(connection, 'pool', None)
+    pool_data = _pool_stats(pool) if pool is not None else None
+    if pool_data is not None:
+        counts['connections_opened'] = pool_data['connections_opened']
+
+    data = {
+        "vendor": connection.vendor,
+        "mode": getattr(settings, 'DB_CONN_MODE', 'request') if connection.vendor == 'postgresql' else None,
+        "sqlite_fallback": getattr(settings, 'DB_FALLBACK_SQLITE', False),
+        "conn_max_age": config.get('CONN_MAX_AGE'),
+        "health_checks": config.get('CONN_HEALTH_CHECKS', False),
+        "server_side_cursors": not config.get('DISABLE_SERVER_SIDE_CURSORS', False),
+        "process": {
+            **counts,
+            # Share of requests that did not have to open a new connection
+            "reuse_ratio": round(1 - counts['connections_opened'] / counts['requests'], 3)
+            if counts['requests'] else None,
+        },
+        "pool": pool_data,
+    }
+    return data
@@ -0,0 +1,109 @@
+import csv
+import tempfile
+
+from .models import T3Locality
+from .resolver import normalize, resolver
+from . import mapping
+
+EXPORT_CHUNK = 2000
+
+# (key in resolved_row, column header)
+EXPORT_COLUMNS = [
+    ('id', 'ID'),
+    ('address', 'Address'),
+    ('locality', 'Locality'),
+    ('billing_zone', 'Billing Zone'),
+    ('billing_km', 'Billing KM'),
+    ('status', 'Status'),
+]
+
+
+def export_queryset(zone=None, status=None):
+    """All addresses with their materialized zone/KM, optionally filtered."""
+    queryset = T3Locality.objects.values(*mapping.RESOLVED_VALUES).order_by('id')
+    if zone:
+        queryset = queryset.filter(billing__zone_key=normalize(zone))
+    if status:
+        queryset = queryset.filter(billing__status__iexact=status)
+    return queryset
+
+
+def iter_resolved_rows(queryset, chunk_size=EXPORT_CHUNK):
+    """
+    Yields resolved rows one by one. .iterator() uses a server-side cursor
+    on PostgreSQL, so only `chunk_size` rows are ever held in memory.
+    """
+    master = resolver.current()
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield mapping.resolved_row(row, master)
+
+
+async def aiter_resolved_rows(queryset, chunk_size=EXPORT_CHUNK):
+    """iter_resolved_rows for ASGI (async ORM, one thread hop per chunk)."""
+    master = await resolver.acurrent()
+    async for row in queryset.aiterator(chunk_size=chunk_size):
+        yield mapping.resolved_row(row, master)
+
+
+# ==========================================
+# CSV (streamed)
+# ==========================================
+class Echo:
+    """File-like object whose write() just hands the line back (csv.writer target)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, batch=500):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for _, header in EXPORT_COLUMNS])
+
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([row[key] for key, _ in EXPORT_COLUMNS]))
+        if len(lines) >= batch:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+async def astream_csv(rows, batch=500):
+    """
+    stream_csv over an async iterator of rows. Under ASGI django buffers a
+    sync iterator whole before sending it, so the export must be async there.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for _, header in EXPORT_COLUMNS])
+
+    lines = []
+    async for row in rows:
+        lines.append(writer.writerow([row[key] for key, _ in EXPORT_COLUMNS]))
+        if len(lines) >= batch:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+# ==========================================
+# XLSX (write-only workbook spooled to disk)
+# ==========================================
+def write_xlsx(rows):
+    """
+    Writes rows to a temporary .xlsx file and returns it rewound.
+    Needs openpyxl; raises ImportError when it is not installed.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Localities')
+    sheet.append([header for _, header in EXPORT_COLUMNS])
+    for row in rows:
+        sheet.append([row[key] for key, _ in EXPORT_COLUMNS])
+
+    tmp = tempfile.TemporaryFile(suffix='.xlsx')
+    workbook.save(tmp)
+    tmp.seek(0)
+    return tmp
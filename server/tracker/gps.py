@@ -0,0 +1,228 @@
+import csv
+import io
+from datetime import datetime
+
+import numpy as np
+
+from .resolver import normalize, resolver
+from .spatial import get_grid, haversine_km
+
+# Defaults for the checks (overridable per request)
+MAX_SPEED_KMH = 120.0   # faster than this between two fixes = teleport
+MAX_JUMP_KM = 5.0       # without timestamps: a jump this long = teleport
+KM_TOLERANCE = 0.2      # trip distance may exceed the zone KM by 20%
+DROP_TOLERANCE_KM = 2.0 # drop this close to the mapped locality is accepted
+
+# Flags returned in detail (the counts always cover everything)
+MAX_FLAGS = 1000
+
+LAT_COLUMNS = ('lat', 'latitude')
+LNG_COLUMNS = ('lng', 'lon', 'long', 'longitude')
+TRIP_COLUMNS = ('trip_id', 'trip', 'vehicle_no', 'track')
+TIME_COLUMNS = ('ts', 'timestamp', 'time', 'datetime')
+# Per-trip details (the last value seen for a trip wins)
+TRIP_FIELDS = ('zone', 'locality', 'address_id')
+
+
+# ==========================================
+# 1. INPUT PARSING
+# ==========================================
+def _parse_time(value):
+    """Epoch seconds or ISO-8601 string -> epoch seconds (NaN when missing)."""
+    if value in (None, ''):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _remember_trip(info, trip, row):
+    for field in TRIP_FIELDS:
+        if row.get(field):
+            info.setdefault(trip, {})[field] = row[field]
+
+
+def points_from_json(points):
+    """[{trip_id, lat, lng, ts, zone, locality, address_id}] -> (trips, lat, lng, ts, info)."""
+    trips, lat, lng, ts, info = [], [], [], [], {}
+    for p in points:
+        trip = str(p.get('trip_id') or p.get('trip') or 'trip')
+        trips.append(trip)
+        lat.append(_to_float(p.get('lat', p.get('latitude'))))
+        lng.append(_to_float(p.get('lng', p.get('lon', p.get('longitude')))))
+        ts.append(_parse_time(p.get('ts', p.get('timestamp'))))
+        _remember_trip(info, trip, p)
+    return trips, lat, lng, ts, info
+
+
+def points_from_text(text, trip_id='pasted'):
+    """Pasted 'lat, long' lines (the GPS Checker textarea) -> one trip."""
+    trips, lat, lng, ts = [], [], [], []
+    for line in text.splitlines():
+        parts = [part.strip() for part in line.replace(';', ',').split(',')]
+        if len(parts) < 2 or not parts[0]:
+            continue
+        trips.append(trip_id)
+        lat.append(_to_float(parts[0]))
+        lng.append(_to_float(parts[1]))
+        ts.append(_parse_time(parts[2]) if len(parts) > 2 else np.nan)
+    return trips, lat, lng, ts, {}
+
+
+def points_from_csv(fileobj):
+    """CSV with lat/lng columns (+ optional trip_id, timestamp, zone, locality, address_id)."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    fields = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+
+    def column(options):
+        return next((fields[c] for c in options if c in fields), None)
+
+    lat_col, lng_col = column(LAT_COLUMNS), column(LNG_COLUMNS)
+    if not lat_col or not lng_col:
+        raise ValueError("CSV needs latitude and longitude columns")
+    trip_col, time_col = column(TRIP_COLUMNS), column(TIME_COLUMNS)
+    extra_cols = {field: fields[field] for field in TRIP_FIELDS if field in fields}
+
+    trips, lat, lng, ts, info = [], [], [], [], {}
+    for row in reader:
+        trip = (row.get(trip_col) if trip_col else None) or 'trip'
+        trips.append(trip)
+        lat.append(_to_float(row.get(lat_col)))
+        lng.append(_to_float(row.get(lng_col)))
+        ts.append(_parse_time(row.get(time_col)) if time_col else np.nan)
+        if extra_cols:
+            _remember_trip(info, trip, {field: row.get(col) for field, col in extra_cols.items()})
+    return trips, lat, lng, ts, info
+
+
+# ==========================================
+# 2. VECTORIZED CHECKS
+# ==========================================
+def validate_points(trips, lat, lng, ts, info=None, max_speed_kmh=MAX_SPEED_KMH,
+                    max_jump_km=MAX_JUMP_KM, km_tolerance=KM_TOLERANCE,
+                    drop_tolerance_km=DROP_TOLERANCE_KM):
+    """
+    Bulk GPS validation for many trips at once.
+
+    Per point: range check (and 0,0), duplicate fixes, teleports (speed over
+    `max_speed_kmh`, or a jump over `max_jump_km` when there are no
+    timestamps). Per trip: haversine distance over the valid points compared
+    with the T3BillingKM of the trip's zone, and the drop point (last fix)
+    checked against the trip's mapped locality via the centroid grid.
+    `info` is {trip_id: {zone, locality}}.
+    """
+    info = info or {}
+    lat = np.asarray(lat, dtype=float)
+    lng = np.asarray(lng, dtype=float)
+    ts = np.asarray(ts, dtype=float)
+    trip_names, trip_code = np.unique(np.asarray(trips, dtype=str), return_inverse=True)
+    n = lat.size
+
+    # --- Range check ---
+    invalid = (
+        ~np.isfinite(lat) | ~np.isfinite(lng)
+        | (np.abs(lat) > 90) | (np.abs(lng) > 180)
+        | ((lat == 0) & (lng == 0))
+    )
+
+    # --- Order each trip by time (input order when there is no timestamp) ---
+    sort_time = np.where(np.isnan(ts), np.arange(n, dtype=float), ts)
+    order = np.lexsort((np.arange(n), sort_time, trip_code))
+    order = order[~invalid[order]]
+
+    o_trip, o_lat, o_lng, o_ts = trip_code[order], lat[order], lng[order], ts[order]
+
+    # --- Consecutive segments inside the same trip ---
+    same_trip = o_trip[1:] == o_trip[:-1]
+    seg_km = haversine_km(o_lat[:-1], o_lng[:-1], o_lat[1:], o_lng[1:])
+    seg_hours = (o_ts[1:] - o_ts[:-1]) / 3600.0
+
+    duplicate = same_trip & (seg_km == 0) & ~(seg_hours > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        speed = np.where(seg_hours > 0, seg_km / seg_hours, np.nan)
+    teleport = same_trip & np.where(
+        np.isnan(seg_hours), seg_km > max_jump_km, speed > max_speed_kmh
+    )
+
+    # Per-point flags (a segment flag belongs to its second point)
+    duplicate_pt = np.zeros(n, dtype=bool)
+    teleport_pt = np.zeros(n, dtype=bool)
+    duplicate_pt[order[1:][duplicate]] = True
+    teleport_pt[order[1:][teleport]] = True
+
+    # --- Trip distance (teleport segments are not counted) ---
+    counted = same_trip & ~teleport
+    trip_km = np.bincount(o_trip[:-1][counted], weights=seg_km[counted], minlength=trip_names.size)
+    points_per_trip = np.bincount(trip_code, minlength=trip_names.size)
+    invalid_per_trip = np.bincount(trip_code[invalid], minlength=trip_names.size)
+    dup_per_trip = np.bincount(trip_code[duplicate_pt], minlength=trip_names.size)
+    tele_per_trip = np.bincount(trip_code[teleport_pt], minlength=trip_names.size)
+
+    # --- Drop point (last valid fix per trip) vs the mapped locality ---
+    grid = get_grid()
+    is_last = np.r_[o_trip[1:] != o_trip[:-1], True] if o_trip.size else np.zeros(0, dtype=bool)
+    drop_trip = o_trip[is_last]
+    nearest_idx, _ = grid.nearest(o_lat[is_last], o_lng[is_last])
+    mapped = [info.get(name, {}).get('locality') or '' for name in trip_names[drop_trip]]
+    mapped_km = grid.distance_to(mapped, o_lat[is_last], o_lng[is_last])
+    drops = {}
+    for code, idx, name, km in zip(drop_trip.tolist(), nearest_idx.tolist(), mapped, mapped_km.tolist()):
+        nearest_name = grid.names[idx] if idx >= 0 else "-"
+        drop_ok = None
+        if name and not np.isnan(km):
+            drop_ok = normalize(nearest_name) == normalize(name) or km <= drop_tolerance_km
+        drops[code] = (nearest_name, drop_ok)
+
+    master = resolver.current()
+    trip_rows = []
+    for i, name in enumerate(trip_names):
+        zone = info.get(name, {}).get('zone')
+        drop_locality, drop_ok = drops.get(i, ("-", None))
+        billing_km = master.km_for(zone) if zone else "-"
+        distance = round(float(trip_km[i]), 3)
+        km_ok = None
+        if billing_km != "-":
+            km_ok = distance <= float(billing_km) * (1 + km_tolerance)
+        trip_rows.append({
+            "trip_id": str(name),
+            "points": int(points_per_trip[i]),
+            "invalid": int(invalid_per_trip[i]),
+            "duplicates": int(dup_per_trip[i]),
+            "teleports": int(tele_per_trip[i]),
+            "distance_km": distance,
+            "zone": zone or "-",
+            "billing_km": billing_km,
+            "km_ok": km_ok,
+            "mapped_locality": info.get(name, {}).get('locality') or "-",
+            "drop_locality": drop_locality,
+            "drop_ok": drop_ok,
+        })
+
+    flags = []
+    for issue, mask in (("out_of_range", invalid), ("duplicate", duplicate_pt), ("teleport", teleport_pt)):
+        for idx in np.flatnonzero(mask)[:MAX_FLAGS - len(flags)]:
+            flags.append({"index": int(idx), "trip_id": str(trip_names[trip_code[idx]]), "issue": issue})
+
+    summary = {
+        "points": int(n),
+        "trips": int(trip_names.size),
+        "invalid": int(invalid.sum()),
+        "duplicates": int(duplicate_pt.sum()),
+        "teleports": int(teleport_pt.sum()),
+        "km_mismatches": sum(1 for t in trip_rows if t["km_ok"] is False),
+        "drop_mismatches": sum(1 for t in trip_rows if t["drop_ok"] is False),
+    }
+    summary["passed"] = not (
+        summary["invalid"] or summary["teleports"]
+        or summary["km_mismatches"] or summary["drop_mismatches"]
+    )
+    return {"summary": summary, "trips": trip_rows, "flags": flags}
@@ -0,0 +1,167 @@
+import csv
+import io
+import time
+from itertools import chain
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .models import T3Locality
+from . import counters, mapping
+
+INGEST_CHUNK = 5000
+STAGING_TABLE = 't3_locality_staging'
+
+# Header names accepted for the two columns (case-insensitive)
+ADDRESS_COLUMNS = ('address', 'pickup_address', 'addresses', 'pickup address')
+LOCALITY_COLUMNS = ('t3_locality', 'locality', 'locality_name')
+
+
+# ==========================================
+# 1. CSV READER (streaming)
+# ==========================================
+def read_address_rows(fileobj):
+    """
+    Yields (address, locality) tuples from a CSV file object, one row at a
+    time. Understands a header row with an address / locality column;
+    without one, the first column is the address.
+    """
+    if isinstance(fileobj, io.TextIOBase):
+        text = fileobj
+    else:
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+
+    reader = csv.reader(text)
+    first = next(reader, None)
+    if first is None:
+        return
+
+    header = [cell.strip().lower() for cell in first]
+    addr_idx = next((header.index(c) for c in ADDRESS_COLUMNS if c in header), None)
+    loc_idx = next((header.index(c) for c in LOCALITY_COLUMNS if c in header), None)
+
+    if addr_idx is None:
+        # No header: the first row is data
+        addr_idx = 0
+        rows = chain([first], reader)
+    else:
+        rows = reader
+
+    for row in rows:
+        if len(row) <= addr_idx:
+            continue
+        address = row[addr_idx].strip()
+        if not address:
+            continue
+        locality = row[loc_idx].strip() if loc_idx is not None and len(row) > loc_idx else ''
+        yield address, (locality or None)
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==========================================
+# 2. STAGING (COPY on PostgreSQL, executemany elsewhere)
+# ==========================================
+def _create_staging(cursor):
+    if connection.vendor == 'postgresql':
+        cursor.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} "
+            f"(seq bigserial, address text, t3_locality varchar(255)) ON COMMIT DROP"
+        )
+    else:
+        cursor.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} "
+            f"(seq integer primary key, address text, t3_locality varchar(255))"
+        )
+
+
+def _stage_chunk(cursor, chunk):
+    if connection.vendor != 'postgresql':
+        cursor.executemany(
+            f"INSERT INTO {STAGING_TABLE} (address, t3_locality) VALUES (%s, %s)", chunk
+        )
+        return
+
+    raw = cursor.cursor
+    copy_sql = f"COPY {STAGING_TABLE} (address, t3_locality) FROM STDIN WITH (FORMAT csv)"
+    if hasattr(raw, 'copy_expert'):
+        # psycopg2: feed one CSV buffer per chunk
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(chunk)
+        buffer.seek(0)
+        raw.copy_expert(copy_sql, buffer)
+    else:
+        # psycopg 3: stream rows straight into COPY
+        with raw.copy(f"COPY {STAGING_TABLE} (address, t3_locality) FROM STDIN") as copy:
+            for row in chunk:
+                copy.write_row(row)
+
+
+def _merge_staging(cursor):
+    """Inserts staged addresses that are new (deduped in-file and against t3_locality)."""
+    if connection.vendor == 'postgresql':
+        # Planned as a hash anti-join: one pass over t3_locality
+        not_loaded = "NOT EXISTS (SELECT 1 FROM t3_locality t WHERE t.address = s.address)"
+    else:
+        # SQLite builds a transient index for IN (...) but not for NOT EXISTS
+        not_loaded = "s.address NOT IN (SELECT address FROM t3_locality WHERE address IS NOT NULL)"
+    cursor.execute(
+        f"INSERT INTO t3_locality (address, t3_locality) "
+        f"SELECT s.address, MAX(s.t3_locality) FROM {STAGING_TABLE} s "
+        f"WHERE {not_loaded} "
+        f"GROUP BY s.address ORDER BY MIN(s.seq)"
+    )
+    return cursor.rowcount
+
+
+# ==========================================
+# 3. PIPELINE
+# ==========================================
+def ingest_addresses(fileobj, chunk_size=INGEST_CHUNK, progress=None):
+    """
+    Streams a CSV of addresses into t3_locality with constant memory.
+
+    Rows are staged chunk by chunk, merged in one INSERT ... SELECT that
+    skips addresses already present, and the new rows get their billing
+    rows and pending-counter entries in the same transaction.
+    `progress(rows_read)` is called after every chunk.
+    """
+    started = time.monotonic()
+    read = 0
+
+    with transaction.atomic():
+        last_id = T3Locality.objects.aggregate(Max('id'))['id__max'] or 0
+
+        with connection.cursor() as cursor:
+            _create_staging(cursor)
+            for chunk in _chunks(read_address_rows(fileobj), chunk_size):
+                _stage_chunk(cursor, chunk)
+                read += len(chunk)
+                if progress:
+                    progress(read)
+            inserted = _merge_staging(cursor)
+            if connection.vendor != 'postgresql':
+                cursor.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+
+        new_rows = T3Locality.objects.filter(id__gt=last_id)
+        counters.adjust_pending(new_rows.filter(counters.PENDING_Q).count())
+        mapping.materialize(new_rows)
+
+    elapsed = time.monotonic() - started
+    return {
+        "read": read,
+        "inserted": inserted,
+        "duplicates": read - inserted,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": int(read / elapsed) if elapsed else read,
+    }
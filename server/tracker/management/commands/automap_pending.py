@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.automap import AUTOMAP_CHUNK, DEFAULT_CUTOFF, run_automap
+
+
+class Command(BaseCommand):
+    help = "Auto-maps pending addresses whose best locality suggestion clears the cutoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cutoff', type=float, default=DEFAULT_CUTOFF,
+                            help="Minimum suggestion score (0-1) to apply a match")
+        parser.add_argument('--min-support', type=int, default=None,
+                            help="Mapped addresses a match must be backed by "
+                                 "(default: SUGGEST_MIN_SUPPORT)")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Scoring processes (default: CPU count)")
+        parser.add_argument('--chunk-size', type=int, default=AUTOMAP_CHUNK)
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Score and report without writing anything")
+
+    def handle(self, *args, **options):
+        if not 0 < options['cutoff'] <= 1:
+            raise CommandError("--cutoff must be between 0 and 1")
+
+        def progress(stats):
+            self.stdout.write(
+                f"  scanned {stats['scanned']}, applied {stats['applied']} "
+                f"({stats['rows_per_sec']} rows/s)"
+            )
+
+        stats = run_automap(
+            cutoff=options['cutoff'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            progress=progress,
+            min_support=options['min_support'],
+        )
+        verb = "Would apply" if options['dry_run'] else "Applied"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {stats['applied']} of {stats['scanned']} pending addresses "
+            f"(cutoff {options['cutoff']}); {stats['below_cutoff']} below cutoff, "
+            f"{stats['low_support']} with too little evidence, "
+            f"{stats['skipped']} mapped or claimed meanwhile, "
+            f"{stats['no_match']} with no match left for review. "
+            f"{stats['seconds']}s, {stats['rows_per_sec']} rows/s"
+        ))
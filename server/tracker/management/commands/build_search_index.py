@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tracker.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = "Creates (or rebuilds) the address search index for t3_locality."
+
+    def handle(self, *args, **options):
+        if install_search_index():
+            self.stdout.write(self.style.SUCCESS("Address search index is ready"))
+        else:
+            self.stdout.write(self.style.WARNING("t3_locality not found; nothing to index"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.ingest import INGEST_CHUNK, ingest_addresses
+
+
+class Command(BaseCommand):
+    help = "Streams a month's *_locality.csv into t3_locality (skips addresses already loaded)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--chunk-size', type=int, default=INGEST_CHUNK)
+
+    def handle(self, *args, **options):
+        def progress(rows_read):
+            self.stdout.write(f"  staged {rows_read} rows...")
+
+        try:
+            with open(options['csv_path'], 'rb') as f:
+                stats = ingest_addresses(f, chunk_size=options['chunk_size'], progress=progress)
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {options['csv_path']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {stats['read']} rows, inserted {stats['inserted']}, "
+            f"skipped {stats['duplicates']} duplicates in {stats['seconds']}s "
+            f"({stats['rows_per_sec']} rows/s)"
+        ))
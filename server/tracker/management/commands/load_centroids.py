@@ -0,0 +1,55 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import T3BillingZone, LocalityCentroid
+from tracker.resolver import normalize
+from tracker import spatial
+
+
+class Command(BaseCommand):
+    help = "Loads locality centroids from a CSV (locality, latitude, longitude) for GPS lookups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+
+    def handle(self, *args, **options):
+        masters = {
+            normalize(name): pk
+            for pk, name in T3BillingZone.objects.values_list('id', 't3_locality')
+        }
+
+        centroids, unknown = [], []
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    row = {k.strip().lower(): (v or '').strip() for k, v in row.items() if k}
+                    name = row.get('locality') or row.get('t3_locality')
+                    pk = masters.get(normalize(name))
+                    if pk is None:
+                        unknown.append(name)
+                        continue
+                    try:
+                        centroids.append(LocalityCentroid(
+                            locality_id=pk,
+                            latitude=float(row.get('latitude') or row.get('lat')),
+                            longitude=float(row.get('longitude') or row.get('lng') or row.get('lon')),
+                        ))
+                    except (TypeError, ValueError):
+                        unknown.append(name)
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {options['csv_path']}")
+
+        LocalityCentroid.objects.bulk_create(
+            centroids, batch_size=1000,
+            update_conflicts=True, unique_fields=['locality'],
+            update_fields=['latitude', 'longitude', 'updated_at'],
+        )
+        # bulk_create skips signals: rebuild the spatial grid everywhere
+        spatial.bump_centroid_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Loaded {len(centroids)} centroids"))
+        if unknown:
+            self.stdout.write(self.style.WARNING(
+                f"Skipped {len(unknown)} rows (unknown locality or bad coordinates): {unknown[:10]}"
+            ))
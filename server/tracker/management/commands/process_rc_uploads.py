@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tracker.rc_worker import sweep
+
+
+class Command(BaseCommand):
+    help = "Processes staged RC uploads the background worker did not finish (run from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-minutes', type=int, default=30,
+                            help="Re-run uploads stuck in 'processing' for this long")
+        parser.add_argument('--retry-failed', action='store_true')
+
+    def handle(self, *args, **options):
+        stats = sweep(stale_minutes=options['stale_minutes'], retry_failed=options['retry_failed'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {stats['processed']} RC uploads, {stats['failed']} failed, "
+            f"{stats['skipped']} skipped (already taken by another worker)"
+        ))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker import counters, mapping
+
+
+class Command(BaseCommand):
+    help = "Rebuilds t3_locality_billing (resolved zone/KM/status) and the pending counter from t3_locality."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=mapping.MATERIALIZE_CHUNK)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = mapping.materialize(chunk_size=options['chunk_size'])
+        elapsed = time.monotonic() - started
+        pending = counters.recount_pending()
+        self.stdout.write(self.style.SUCCESS(
+            f"Materialized {total} addresses in {elapsed:.1f}s ({pending} pending)"
+        ))
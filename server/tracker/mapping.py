@@ -0,0 +1,252 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import T3Locality, T3LocalityBilling, LocalityClaim
+from .resolver import normalize, resolver
+from . import claims, counters
+
+# Rows per bulk upsert when (re)materializing t3_locality_billing
+MATERIALIZE_CHUNK = 2000
+# Rows per transaction on the bulk save path (bounded IN lists, short locks)
+SAVE_CHUNK = 1000
+
+
+# ==========================================
+# HELPER: RESOLVED ROW FOR ONE ADDRESS
+# ==========================================
+def resolved_fields(locality_name, master):
+    """Locality name -> the column values stored in T3LocalityBilling."""
+    raw_loc_name = locality_name or ""
+    if not raw_loc_name.strip():
+        return {
+            "locality_key": "", "billing_zone": None, "zone_key": "",
+            "billing_km": None, "status": "Pending",
+        }
+
+    found_zone, found_km = master.resolve(raw_loc_name)
+    return {
+        "locality_key": normalize(raw_loc_name),
+        "billing_zone": None if found_zone == "-" else found_zone,
+        "zone_key": "" if found_zone == "-" else normalize(found_zone),
+        "billing_km": None if found_km == "-" else found_km,
+        "status": "Done",
+    }
+
+
+# Columns to .values() on T3Locality for resolved_row()
+RESOLVED_VALUES = (
+    'id', 'address', 't3_locality',
+    'billing__billing_zone', 'billing__billing_km', 'billing__status',
+)
+
+
+def resolved_row(row, master):
+    """
+    One address as the APIs return it (id, address, locality, zone, KM,
+    status). Uses the materialized t3_locality_billing columns when present,
+    otherwise resolves through the cached master tables.
+    """
+    raw_loc_name = row.get('t3_locality') or ""
+
+    if row.get('billing__status'):
+        # --- MATERIALIZED ---
+        found_zone = row['billing__billing_zone'] or "-"
+        found_km = row['billing__billing_km']
+        if found_km is None:
+            found_km = "-"
+        status = row['billing__status']
+    else:
+        # --- SMART LOOKUP (row not materialized yet) ---
+        found_zone, found_km = master.resolve(raw_loc_name)
+        status = "Done" if raw_loc_name.strip() else "Pending"
+
+    return {
+        "id": row['id'],
+        "address": row['address'],
+        "locality": raw_loc_name,
+        "locality_id": raw_loc_name,
+        "billing_zone": found_zone,
+        "billing_km": found_km,
+        "status": status
+    }
+
+
+def _upsert(rows, master):
+    objs = [
+        T3LocalityBilling(address_id=row['id'], **resolved_fields(row['t3_locality'], master))
+        for row in rows
+    ]
+    T3LocalityBilling.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=['address'],
+        update_fields=['locality_key', 'billing_zone', 'zone_key', 'billing_km', 'status', 'updated_at'],
+    )
+    return len(objs)
+
+
+# ==========================================
+# 1. MATERIALIZE (full or partial rebuild)
+# ==========================================
+def materialize(queryset=None, chunk_size=MATERIALIZE_CHUNK):
+    """
+    Recomputes T3LocalityBilling for every address in `queryset`
+    (all of t3_locality by default). Streams in chunks, returns rows written.
+    """
+    if queryset is None:
+        queryset = T3Locality.objects.all()
+
+    master = resolver.current()
+    rows = queryset.values('id', 't3_locality').order_by('id').iterator(chunk_size=chunk_size)
+
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            total += _upsert(batch, master)
+            batch = []
+    if batch:
+        total += _upsert(batch, master)
+    return total
+
+
+# ==========================================
+# 2. INCREMENTAL UPDATES FROM THE SAVE PATHS
+# ==========================================
+def set_locality(address_ids, locality_name):
+    """
+    Writes t3_locality for the given ids, refreshes their billing rows,
+    keeps the pending counter in step and releases any work-queue claims.
+    Returns the number of rows updated.
+    """
+    with transaction.atomic():
+        existing = list(
+            T3Locality.objects.filter(id__in=list(address_ids)).values_list('id', flat=True)
+        )
+        queryset = T3Locality.objects.filter(id__in=existing)
+
+        # Split the write by current status so the UPDATE itself tells us how
+        # many rows moved between Pending and Done (race-free under concurrency)
+        if counters.is_pending(locality_name):
+            same, flip = counters.PENDING_Q, ~counters.PENDING_Q
+        else:
+            same, flip = ~counters.PENDING_Q, counters.PENDING_Q
+        unchanged = queryset.filter(same).update(t3_locality=locality_name)
+        flipped = queryset.filter(flip).update(t3_locality=locality_name)
+        counters.adjust_pending(flipped if counters.is_pending(locality_name) else -flipped)
+
+        _upsert([{'id': pk, 't3_locality': locality_name} for pk in existing], resolver.current())
+
+        # Saved rows leave the operators' work queue
+        claims.release(existing)
+    return unchanged + flipped
+
+
+def fill_pending(address_ids, locality_name, within=None, skip_claimed=False):
+    """
+    Maps those of `address_ids` that are STILL pending (and still rows of
+    `within`, and not leased to an operator when `skip_claimed`). The checks
+    run on the locked rows in the writing transaction, so a mapping someone
+    saved after the ids were read is never overwritten by this one.
+    Returns the number of rows updated.
+    """
+    with transaction.atomic():
+        queryset = T3Locality.objects.filter(counters.PENDING_Q, id__in=list(address_ids))
+        if within is not None:
+            queryset = queryset.filter(id__in=within.values('id'))
+        if skip_claimed:
+            queryset = queryset.exclude(id__in=LocalityClaim.objects.filter(
+                expires_at__gt=timezone.now()).values('address_id'))
+        ids = list(queryset.select_for_update().values_list('id', flat=True))
+        if not ids:
+            return 0
+
+        T3Locality.objects.filter(id__in=ids).update(t3_locality=locality_name)
+        counters.adjust_pending(-len(ids))
+        _upsert([{'id': pk, 't3_locality': locality_name} for pk in ids], resolver.current())
+        claims.release(ids)
+    return len(ids)
+
+
+def bulk_set_locality(locality_name, address_ids=None, queryset=None, chunk_size=SAVE_CHUNK):
+    """
+    Maps pending addresses in bulk: either explicit `address_ids` or every
+    row of `queryset` (e.g. all pending rows matching a search). The rows are
+    walked in id order and written `chunk_size` at a time, each chunk in its
+    own transaction, so no statement carries a huge IN list or holds locks
+    for the whole selection. Only rows that are still pending (and still in
+    `queryset`) when their chunk is written change: a row someone mapped in
+    the meantime keeps that mapping. Returns the number of rows updated.
+    """
+    if counters.is_pending(locality_name):
+        raise ValueError("bulk_set_locality needs a locality name")
+
+    updated = 0
+    if address_ids is not None:
+        ids = sorted({int(pk) for pk in address_ids})
+        for start in range(0, len(ids), chunk_size):
+            updated += fill_pending(ids[start:start + chunk_size], locality_name)
+        return updated
+
+    last_id = 0
+    while True:
+        # Keyset on id: rows mapped by the previous chunk may drop out of the
+        # predicate, so an offset would skip rows
+        ids = list(
+            queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return updated
+        updated += fill_pending(ids, locality_name, within=queryset)
+        last_id = ids[-1]
+
+
+def set_localities(pairs):
+    """
+    Applies many {address_id: locality_name} mappings in one transaction:
+    a single bulk_update that only writes t3_locality, one billing upsert
+    and one pending-counter adjustment. Returns the ids that existed.
+    """
+    with transaction.atomic():
+        rows = list(
+            T3Locality.objects.select_for_update()
+            .filter(id__in=list(pairs)).only('id', 't3_locality')
+        )
+        delta = 0
+        for row in rows:
+            new_name = pairs[row.id]
+            delta += counters.is_pending(new_name) - counters.is_pending(row.t3_locality)
+            row.t3_locality = new_name
+        T3Locality.objects.bulk_update(rows, ['t3_locality'], batch_size=SAVE_CHUNK)
+        counters.adjust_pending(delta)
+
+        _upsert([{'id': row.id, 't3_locality': row.t3_locality} for row in rows], resolver.current())
+
+        existing = [row.id for row in rows]
+        claims.release(existing)
+    return existing
+
+
+# ==========================================
+# 3. MASTER TABLE EDITS (T3BillingZone / T3BillingKM)
+# ==========================================
+def refresh_localities(locality_names):
+    """Re-resolves every billing row whose locality matches one of the names."""
+    master = resolver.current()
+    for key in {normalize(n) for n in locality_names if n}:
+        fields = resolved_fields(key, master)
+        fields.pop('locality_key')
+        fields.pop('status')
+        T3LocalityBilling.objects.filter(locality_key=key).update(updated_at=timezone.now(), **fields)
+
+
+def refresh_zones(zone_names):
+    """Re-reads the KM of every billing row in one of the given zones."""
+    master = resolver.current()
+    for key in {normalize(n) for n in zone_names if n}:
+        found_km = master.km_for(key)
+        T3LocalityBilling.objects.filter(zone_key=key).update(
+            billing_km=None if found_km == "-" else found_km,
+            updated_at=timezone.now(),
+        )
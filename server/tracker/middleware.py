@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # gzip only
+        brotli = None
+
+BROTLI_QUALITY = getattr(settings, 'COMPRESS_BROTLI_QUALITY', 5)
+# Smaller bodies are not worth the CPU (and can grow when compressed)
+MIN_COMPRESS_BYTES = 500
+
+# Only the tracker APIs are compressed. Admin / login HTML carries CSRF
+# tokens next to reflected input (BREACH), so it is left uncompressed.
+COMPRESS_PATH_PREFIXES = tuple(getattr(settings, 'COMPRESS_PATH_PREFIXES', ('/api/',)))
+# JSON payloads and the CSV exports; PDFs, images and XLSX (a zip) are already compressed
+COMPRESSIBLE_TYPES = ('application/json', 'text/csv')
+
+re_accepts_br = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware plus brotli for the API responses under
+    COMPRESS_PATH_PREFIXES: clients that accept `br` get brotli when the
+    brotli (or brotlicffi) package is installed, everyone else gets gzip.
+    Streaming responses (CSV exports) stay on gzip, chunk by chunk.
+    """
+
+    def process_response(self, request, response):
+        if not request.path.startswith(COMPRESS_PATH_PREFIXES):
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < MIN_COMPRESS_BYTES:
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if response.streaming or brotli is None or not re_accepts_br.search(ae):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        # Same as GZipMiddleware: only if it is actually shorter
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(response.content))
+
+        # Same as GZipMiddleware: the encoded body needs a weak ETag
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,44 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_t3billingzone_vehiclelist_alter_t3billingkm_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='T3LocalityBilling',
+            fields=[
+                ('address', models.OneToOneField(db_column='address_id', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='billing', serialize=False, to='tracker.t3locality')),
+                ('locality_key', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('billing_zone', models.CharField(blank=True, max_length=255, null=True)),
+                ('zone_key', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('billing_km', models.FloatField(blank=True, db_index=True, null=True)),
+                ('status', models.CharField(db_index=True, default='Pending', max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Locality Billing',
+                'verbose_name_plural': 'Locality Billing',
+                'db_table': 't3_locality_billing',
+            },
+        ),
+        migrations.AlterField(
+            model_name='misreport',
+            name='billing_year',
+            field=models.IntegerField(choices=[(2024, 2024), (2025, 2025), (2026, 2026), (2027, 2027), (2028, 2028), (2029, 2029), (2030, 2030), (2031, 2031), (2032, 2032), (2033, 2033), (2034, 2034), (2035, 2035), (2036, 2036), (2037, 2037), (2038, 2038), (2039, 2039), (2040, 2040), (2041, 2041), (2042, 2042), (2043, 2043), (2044, 2044), (2045, 2045), (2046, 2046), (2047, 2047), (2048, 2048), (2049, 2049), (2050, 2050)], default=2026, verbose_name='Billing Year'),
+        ),
+        migrations.AlterModelTable(
+            name='t3billingkm',
+            table='t3_billing_km',
+        ),
+        migrations.AlterModelTable(
+            name='t3locality',
+            table='t3_locality',
+        ),
+    ]
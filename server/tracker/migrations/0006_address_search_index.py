@@ -0,0 +1,27 @@
+# Address search index: pg_trgm GIN indexes on PostgreSQL, FTS5 shadow table on SQLite
+
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from tracker.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    from tracker.search import drop_search_index
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0005_t3localitybilling'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:11
+
+from django.db import migrations, models
+
+# Partial index over the "pending" predicate used by global_pending / next_pending
+PENDING_INDEX = (
+    "CREATE INDEX {concurrently} IF NOT EXISTS t3_locality_pending_idx "
+    "ON t3_locality (id) WHERE t3_locality IS NULL OR t3_locality = ''"
+)
+
+
+def create_pending_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if 't3_locality' not in conn.introspection.table_names():
+        return
+    concurrently = 'CONCURRENTLY' if conn.vendor == 'postgresql' else ''
+    schema_editor.execute(PENDING_INDEX.format(concurrently=concurrently))
+
+
+def drop_pending_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS t3_locality_pending_idx")
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0006_address_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackerCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Counter',
+                'verbose_name_plural': 'Counters',
+                'db_table': 'tracker_counter',
+            },
+        ),
+        migrations.RunPython(create_pending_index, drop_pending_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_trackercounter_pending_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocalityClaim',
+            fields=[
+                ('address', models.OneToOneField(db_column='address_id', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='claim', serialize=False, to='tracker.t3locality')),
+                ('operator', models.CharField(db_index=True, max_length=150)),
+                ('claimed_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Locality Claim',
+                'verbose_name_plural': 'Locality Claims',
+                'db_table': 't3_locality_claim',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_localityclaim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocalityCentroid',
+            fields=[
+                ('locality', models.OneToOneField(db_column='locality_id', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='centroid', serialize=False, to='tracker.t3billingzone')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Locality Centroid',
+                'verbose_name_plural': 'Locality Centroids',
+                'db_table': 't3_locality_centroid',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_localitycentroid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.PositiveSmallIntegerField(choices=[(1, 'Stage 1 (1st - 10th)'), (2, 'Stage 2 (11th - 20th)'), (3, 'Stage 3 (21st - End)')])),
+                ('track_name', models.CharField(max_length=255)),
+                ('source_file', models.CharField(blank=True, default='', max_length=255)),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('distance_km', models.FloatField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_seconds', models.PositiveIntegerField(blank=True, null=True)),
+                ('uploaded_at', models.DateTimeField(auto_now=True)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tracks', to='tracker.misreport')),
+            ],
+            options={
+                'verbose_name': 'Track Summary',
+                'verbose_name_plural': 'Track Summaries',
+                'db_table': 'tracker_track_summary',
+                'constraints': [models.UniqueConstraint(fields=('report', 'stage', 'track_name'), name='unique_track_per_stage')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+STEP_FIELDS = (
+    'stage1_locality_set', 'stage1_gps_check',
+    'stage2_locality_set', 'stage2_gps_check',
+    'stage3_locality_set', 'stage3_gps_check',
+    'final_mis_status', 'bill_approval_status',
+)
+
+
+def backfill_progress(apps, schema_editor):
+    MISReport = apps.get_model('tracker', 'MISReport')
+    reports = list(MISReport.objects.all())
+    for report in reports:
+        report.stage_mask = sum(1 << bit for bit, field in enumerate(STEP_FIELDS) if getattr(report, field))
+        report.progress = int(report.stage_mask.bit_count() / len(STEP_FIELDS) * 100)
+    MISReport.objects.bulk_update(reports, ['stage_mask', 'progress'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_tracksummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='misreport',
+            name='progress',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='misreport',
+            name='stage_mask',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='misreport',
+            index=models.Index(fields=['billing_year', 'billing_month'], name='misreport_period_idx'),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:29
+
+from django.db import migrations, models
+
+
+def mark_existing_documents(apps, schema_editor):
+    # RC files uploaded before the worker existed are already in storage
+    VehicleList = apps.get_model('tracker', 'VehicleList')
+    VehicleList.objects.exclude(rc_document__isnull=True).exclude(rc_document='').update(rc_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0011_misreport_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_staged_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_status',
+            field=models.CharField(choices=[('none', 'No Document'), ('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='none', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_thumbnail',
+            field=models.FileField(blank=True, null=True, upload_to='vehicle_rc/thumbs/'),
+        ),
+        migrations.RunPython(mark_existing_documents, migrations.RunPython.noop),
+    ]
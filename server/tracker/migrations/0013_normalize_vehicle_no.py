@@ -0,0 +1,32 @@
+import re
+
+from django.db import migrations
+
+
+def normalize_vehicle_numbers(apps, schema_editor):
+    # Same form as tracker.vehicles.normalize_vehicle_no, so the roster
+    # import (which matches vehicle_no exactly) finds rows added by hand
+    VehicleList = apps.get_model('tracker', 'VehicleList')
+    taken = set(VehicleList.objects.values_list('vehicle_no', flat=True))
+    for vehicle in VehicleList.objects.only('id', 'vehicle_no').order_by('id'):
+        normalized = re.sub(r'\s+', ' ', vehicle.vehicle_no or '').strip().upper()
+        if normalized == vehicle.vehicle_no:
+            continue
+        if normalized in taken:
+            # Already stored in the normalized spelling: the two rows are the
+            # same vehicle and have to be merged by hand, keep both as they are
+            continue
+        taken.discard(vehicle.vehicle_no)
+        taken.add(normalized)
+        VehicleList.objects.filter(id=vehicle.id).update(vehicle_no=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_vehicle_rc_processing'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_vehicle_numbers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:53
+
+from django.db import migrations, models
+
+
+def copy_start_times(apps, schema_editor):
+    # rc_queued_at used to be stamped when processing started
+    VehicleList = apps.get_model('tracker', 'VehicleList')
+    VehicleList.objects.filter(rc_status='processing').update(rc_started_at=models.F('rc_queued_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_normalize_vehicle_no'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehiclelist',
+            name='rc_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_start_times, migrations.RunPython.noop),
+    ]
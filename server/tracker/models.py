@@ -48,12 +48,69 @@ class MISReport(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # --- Derived (kept in sync by save()) ---
+    # Bit N is set when STEP_FIELDS[N] is done; progress is the stored percentage
+    stage_mask = models.PositiveSmallIntegerField(default=0, editable=False)
+    progress = models.PositiveSmallIntegerField(default=0, editable=False, db_index=True)
+
+    STEP_FIELDS = (
+        'stage1_locality_set', 'stage1_gps_check',
+        'stage2_locality_set', 'stage2_gps_check',
+        'stage3_locality_set', 'stage3_gps_check',
+        'final_mis_status', 'bill_approval_status',
+    )
+
+    def compute_progress(self):
+        self.stage_mask = sum(1 << bit for bit, field in enumerate(self.STEP_FIELDS) if getattr(self, field))
+        self.progress = int(self.stage_mask.bit_count() / len(self.STEP_FIELDS) * 100)
+
+    def step_done(self, field):
+        return bool(self.stage_mask & (1 << self.STEP_FIELDS.index(field)))
+
+    def save(self, *args, **kwargs):
+        self.compute_progress()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'stage_mask', 'progress'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.billing_month} {self.billing_year}"
 
     class Meta:
         verbose_name = "MIS Workflow"
         verbose_name_plural = "MIS Workflows"
+        indexes = [
+            models.Index(fields=['billing_year', 'billing_month'], name='misreport_period_idx'),
+        ]
+
+
+class TrackSummary(models.Model):
+    # One uploaded GPS track (GPX <trk> or CSV trip) reduced to its totals,
+    # filed under the MIS report month and stage it belongs to.
+    STAGE_CHOICES = [(1, 'Stage 1 (1st - 10th)'), (2, 'Stage 2 (11th - 20th)'), (3, 'Stage 3 (21st - End)')]
+
+    report = models.ForeignKey(MISReport, on_delete=models.CASCADE, related_name='tracks')
+    stage = models.PositiveSmallIntegerField(choices=STAGE_CHOICES)
+    track_name = models.CharField(max_length=255)
+    source_file = models.CharField(max_length=255, blank=True, default='')
+    points = models.PositiveIntegerField(default=0)
+    distance_km = models.FloatField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    ended_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True)
+    uploaded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.track_name} ({self.report} / stage {self.stage})"
+
+    class Meta:
+        db_table = 'tracker_track_summary'
+        verbose_name = "Track Summary"
+        verbose_name_plural = "Track Summaries"
+        constraints = [
+            models.UniqueConstraint(fields=['report', 'stage', 'track_name'], name='unique_track_per_stage'),
+        ]
 
 
 class T3BillingKM(models.Model):
@@ -74,6 +131,25 @@ class T3BillingZone(models.Model):
         db_table = 't3_billing_zone' 
         managed = False
 
+class LocalityCentroid(models.Model):
+    # Reference point of a master locality, used by tracker.spatial to map
+    # GPS points to their nearest locality / zone.
+    locality = models.OneToOneField(
+        T3BillingZone, on_delete=models.DO_NOTHING, primary_key=True,
+        related_name='centroid', db_constraint=False, db_column='locality_id'
+    )
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.locality_id} ({self.latitude}, {self.longitude})"
+
+    class Meta:
+        db_table = 't3_locality_centroid'
+        verbose_name = "Locality Centroid"
+        verbose_name_plural = "Locality Centroids"
+
 class T3Locality(models.Model):
     id = models.AutoField(primary_key=True)
     address = models.TextField(db_column='address') 
@@ -84,6 +160,62 @@ class T3Locality(models.Model):
         managed = False
 
 
+class T3LocalityBilling(models.Model):
+    # Resolved Locality -> Zone -> KM for each T3Locality row, kept in step by
+    # tracker.mapping so zone/KM/status can be filtered and aggregated in SQL.
+    address = models.OneToOneField(
+        T3Locality, on_delete=models.DO_NOTHING, primary_key=True,
+        related_name='billing', db_constraint=False, db_column='address_id'
+    )
+    locality_key = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    billing_zone = models.CharField(max_length=255, null=True, blank=True)
+    zone_key = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    billing_km = models.FloatField(null=True, blank=True, db_index=True)
+    status = models.CharField(max_length=10, default='Pending', db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 't3_locality_billing'
+        verbose_name = "Locality Billing"
+        verbose_name_plural = "Locality Billing"
+
+
+class TrackerCounter(models.Model):
+    # Running totals kept in step by the save paths (see tracker.counters),
+    # so hot pages read one row instead of running COUNT(*) on t3_locality.
+    key = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+
+    class Meta:
+        db_table = 'tracker_counter'
+        verbose_name = "Counter"
+        verbose_name_plural = "Counters"
+
+
+class LocalityClaim(models.Model):
+    # Time-limited lease on a pending address so concurrent operators in
+    # "Set Locality (Auto)" never get the same row (see tracker.claims).
+    address = models.OneToOneField(
+        T3Locality, on_delete=models.DO_NOTHING, primary_key=True,
+        related_name='claim', db_constraint=False, db_column='address_id'
+    )
+    operator = models.CharField(max_length=150, db_index=True)
+    claimed_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.address_id} -> {self.operator}"
+
+    class Meta:
+        db_table = 't3_locality_claim'
+        verbose_name = "Locality Claim"
+        verbose_name_plural = "Locality Claims"
+
+
 
 class VehicleList(models.Model):
     # Standard Fields
@@ -97,6 +229,22 @@ class VehicleList(models.Model):
     # changed from ImageField to FileField to accept PDFs
     rc_document = models.FileField(upload_to='vehicle_rc/', null=True, blank=True)
 
+    # --- RC processing (background worker, see tracker.rc_worker) ---
+    RC_STATUS_CHOICES = [
+        ('none', 'No Document'),
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    rc_status = models.CharField(max_length=12, choices=RC_STATUS_CHOICES, default='none', db_index=True)
+    rc_staged_path = models.CharField(max_length=500, blank=True, default='')
+    rc_thumbnail = models.FileField(upload_to='vehicle_rc/thumbs/', null=True, blank=True)
+    rc_queued_at = models.DateTimeField(null=True, blank=True)
+    rc_started_at = models.DateTimeField(null=True, blank=True)
+    rc_processed_at = models.DateTimeField(null=True, blank=True)
+    rc_error = models.TextField(blank=True, default='')
+
     def __str__(self):
         return self.vehicle_no
 
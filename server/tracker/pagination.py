@@ -0,0 +1,92 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+
+PAGE_SIZE = 50
+# Upper bound for client-chosen ?page_size=
+MAX_PAGE_SIZE = 200
+
+
+# ==========================================
+# KEYSET (CURSOR) PAGINATION
+# ==========================================
+def keyset_page(queryset, after=None, page_size=PAGE_SIZE, descending=False):
+    """
+    Returns (rows, next_cursor) for the page that follows `after`.
+
+    Seeks on the id index instead of OFFSET, so page 10,000 costs the same
+    as page 1. `queryset` must be a .values() queryset that includes 'id'.
+    """
+    # Fetch one extra row to know whether another page exists
+    rows = list(_keyset_slice(queryset, after, page_size, descending))
+    return _split_page(rows, page_size)
+
+
+async def akeyset_page(queryset, after=None, page_size=PAGE_SIZE, descending=False):
+    """keyset_page for async views (async ORM iteration)."""
+    rows = [row async for row in _keyset_slice(queryset, after, page_size, descending)]
+    return _split_page(rows, page_size)
+
+
+def _keyset_slice(queryset, after, page_size, descending):
+    queryset = queryset.order_by('-id' if descending else 'id')
+    if after:
+        queryset = queryset.filter(id__lt=after) if descending else queryset.filter(id__gt=after)
+    return queryset[:page_size + 1]
+
+
+def _split_page(rows, page_size):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = rows[-1]['id'] if has_more else None
+    return rows, next_cursor
+
+
+def parse_cursor(value):
+    """'' / None -> None, '123' -> 123. Raises ValueError on junk."""
+    if value in (None, ''):
+        return None
+    return int(value)
+
+
+# ==========================================
+# APPROXIMATE TOTALS
+# ==========================================
+def approximate_count(queryset):
+    """
+    Cheap row estimate for a queryset.
+
+    On PostgreSQL this reads the planner's row estimate (EXPLAIN) instead of
+    running COUNT(*); other backends fall back to an exact count.
+    """
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().values('id').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def aapproximate_count(queryset):
+    """approximate_count for async views."""
+    if connection.vendor != 'postgresql':
+        return await queryset.acount()
+    return await sync_to_async(approximate_count)(queryset)
+
+
+def cursor_pagination(next_cursor, total=None, page_size=PAGE_SIZE):
+    """The 'pagination' block returned by the cursor-mode APIs."""
+    data = {
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }
+    if total is not None:
+        data["total_records"] = total
+        data["total_pages"] = max(1, -(-total // page_size))
+        data["approximate"] = connection.vendor == 'postgresql'
+    return data
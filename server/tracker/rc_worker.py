@@ -0,0 +1,204 @@
+# Background processing of uploaded RC documents.
+# add_vehicle only stages the upload on local disk; a worker thread pushes
+# it to the configured storage, renders a thumbnail and stamps the row.
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import VehicleList
+
+try:
+    from PIL import Image
+except ImportError:  # thumbnails for images need Pillow
+    Image = None
+
+STAGING_DIR = getattr(settings, 'RC_STAGING_DIR', os.path.join(tempfile.gettempdir(), 'rc_staging'))
+WORKERS = getattr(settings, 'RC_WORKERS', 2)
+THUMBNAIL_SIZE = (320, 320)
+PDFTOPPM_TIMEOUT = 60
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif', '.tif', '.tiff')
+
+_lock = threading.Lock()
+_executor = None
+
+
+# ==========================================
+# 1. REQUEST SIDE
+# ==========================================
+def stage_upload(uploaded_file):
+    """
+    Moves an uploaded RC file into the staging dir and returns its path.
+    Large uploads already sit in a temp file, so this is a rename.
+    """
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    extension = os.path.splitext(uploaded_file.name)[1].lower()
+    path = os.path.join(STAGING_DIR, f"{uuid.uuid4().hex}{extension}")
+
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        shutil.move(uploaded_file.temporary_file_path(), path)
+    else:
+        with open(path, 'wb') as out:
+            for chunk in uploaded_file.chunks():
+                out.write(chunk)
+    return path
+
+
+def submit_upload(vehicle_id, uploaded_file):
+    """
+    Stages an RC upload for an already saved vehicle and queues it; returns
+    the new rc_status. The staged file is removed again if the row can't be
+    updated, so nothing is left orphaned in the staging dir.
+    """
+    path = stage_upload(uploaded_file)
+    try:
+        VehicleList.objects.filter(id=vehicle_id).update(rc_status='pending', rc_staged_path=path)
+        enqueue(vehicle_id)
+    except Exception:
+        os.remove(path)
+        raise
+    return 'pending'
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='rc-worker')
+    return _executor
+
+
+def enqueue(vehicle_id):
+    """Processes the vehicle's staged RC once the current transaction commits."""
+    VehicleList.objects.filter(id=vehicle_id).update(rc_queued_at=timezone.now())
+    transaction.on_commit(lambda: _get_executor().submit(process_vehicle, vehicle_id))
+
+
+# ==========================================
+# 2. WORKER SIDE
+# ==========================================
+def _image_thumbnail(path):
+    if Image is None:
+        return None
+    with Image.open(path) as image:
+        image.thumbnail(THUMBNAIL_SIZE)
+        buffer = io.BytesIO()
+        image.convert('RGB').save(buffer, format='JPEG', quality=80)
+        return buffer.getvalue()
+
+
+def _pdf_thumbnail(path):
+    """First page as JPEG through poppler's pdftoppm, when it is installed."""
+    if not shutil.which('pdftoppm'):
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, 'page')
+        subprocess.run(
+            ['pdftoppm', '-jpeg', '-singlefile', '-f', '1', '-l', '1',
+             '-scale-to', str(max(THUMBNAIL_SIZE)), path, prefix],
+            check=True, capture_output=True, timeout=PDFTOPPM_TIMEOUT,
+        )
+        with open(prefix + '.jpg', 'rb') as f:
+            return f.read()
+
+
+def make_thumbnail(path):
+    """JPEG bytes of a small preview, or None if this file type can't be rendered here."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        return _pdf_thumbnail(path)
+    if extension in IMAGE_EXTENSIONS:
+        return _image_thumbnail(path)
+    return None
+
+
+def process_vehicle(vehicle_id):
+    """
+    Uploads one staged RC document to storage and renders its thumbnail.
+    Returns True when done, False when it failed, and None when there was
+    nothing to do: only the caller that flips the row to 'processing' does
+    the work, so calling it twice is safe.
+    """
+    close_old_connections()
+    try:
+        claimed = VehicleList.objects.filter(id=vehicle_id, rc_status='pending').update(
+            rc_status='processing', rc_started_at=timezone.now()
+        )
+        if not claimed:
+            return None
+
+        vehicle = VehicleList.objects.only('id', 'vehicle_no', 'rc_staged_path').get(id=vehicle_id)
+        staged = vehicle.rc_staged_path
+        try:
+            document_field = VehicleList._meta.get_field('rc_document')
+            with open(staged, 'rb') as f:
+                filename = f"{vehicle.vehicle_no}{os.path.splitext(staged)[1]}"
+                name = document_field.storage.save(
+                    document_field.generate_filename(vehicle, filename), File(f)
+                )
+
+            thumbnail_name = None
+            try:
+                thumbnail = make_thumbnail(staged)
+            except Exception as e:
+                # A bad preview must not fail the upload itself
+                print(f"🔥 RC THUMBNAIL ERROR ({vehicle.vehicle_no}): {e}")
+                thumbnail = None
+            if thumbnail:
+                thumb_field = VehicleList._meta.get_field('rc_thumbnail')
+                thumbnail_name = thumb_field.storage.save(
+                    thumb_field.generate_filename(vehicle, f"{vehicle.vehicle_no}.jpg"),
+                    ContentFile(thumbnail),
+                )
+
+            VehicleList.objects.filter(id=vehicle_id).update(
+                rc_document=name, rc_thumbnail=thumbnail_name, rc_status='done',
+                rc_staged_path='', rc_processed_at=timezone.now(), rc_error='',
+            )
+            os.remove(staged)
+            return True
+
+        except Exception as e:
+            print(f"🔥 RC PROCESSING ERROR ({vehicle.vehicle_no}): {e}")
+            VehicleList.objects.filter(id=vehicle_id).update(rc_status='failed', rc_error=str(e))
+            return False
+    finally:
+        close_old_connections()
+
+
+def sweep(stale_minutes=30, retry_failed=False):
+    """
+    Picks up uploads the thread pool never finished (server restarted,
+    worker crashed): pending rows, rows stuck in 'processing' for longer
+    than `stale_minutes`, and optionally failed ones. Runs them inline;
+    rows another worker claimed in the meantime are counted as skipped.
+    """
+    stale_before = timezone.now() - timedelta(minutes=stale_minutes)
+    VehicleList.objects.filter(rc_status='processing', rc_started_at__lt=stale_before).update(rc_status='pending')
+    if retry_failed:
+        VehicleList.objects.filter(rc_status='failed').exclude(rc_staged_path='').update(
+            rc_status='pending', rc_queued_at=timezone.now()
+        )
+
+    done = failed = skipped = 0
+    for vehicle_id in VehicleList.objects.filter(rc_status='pending').values_list('id', flat=True):
+        result = process_vehicle(vehicle_id)
+        if result is None:
+            skipped += 1
+        elif result:
+            done += 1
+        else:
+            failed += 1
+    return {"processed": done, "failed": failed, "skipped": skipped}
@@ -0,0 +1,125 @@
+import calendar
+
+from django.db.models import Case, F, IntegerField, Max, Value, When
+
+from .models import MISReport
+
+# The eight workflow flags that make up a month's progress
+STEP_FIELDS = MISReport.STEP_FIELDS
+DATE_FIELDS = (
+    'stage1_start_date', 'stage1_end_date',
+    'stage2_start_date', 'stage2_end_date',
+    'stage3_start_date', 'stage3_end_date',
+)
+
+# Longest range one request may ask for
+MAX_MONTHS = 60
+
+
+def parse_month(value):
+    """'2025-01' -> (2025, 1); raises ValueError on anything else."""
+    year, month = value.split('-')
+    year, month = int(year), int(month)
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {value}")
+    return year, month
+
+
+def billing_month(value):
+    """3, '3', 'march' or 'March' -> 'March' (as stored in MISReport.billing_month)."""
+    text = str(value).strip()
+    if text.isdigit() and 1 <= int(text) <= 12:
+        return calendar.month_name[int(text)]
+    for name in calendar.month_name[1:]:
+        if name.lower() == text.lower():
+            return name
+    raise ValueError(f"Invalid month: {value}")
+
+
+def month_span(start, end):
+    """Every (year, month) from start to end inclusive."""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _month_number():
+    return Case(
+        *[When(billing_month=calendar.month_name[i], then=Value(i)) for i in range(1, 13)],
+        default=Value(0), output_field=IntegerField(),
+    )
+
+
+def _flag(field):
+    return Max(Case(When(**{field: True}, then=Value(1)), default=Value(0), output_field=IntegerField()))
+
+
+def reports_for_range(start, end):
+    """
+    Report data for every month from `start` to `end` ((year, month) tuples)
+    in ONE query: the flags are rolled up per month with conditional
+    aggregation and the progress is the stored MISReport.progress column.
+    Months without a report come back as {"found": False, "progress": 0}.
+    """
+    return _months(start, end, list(_range_queryset(start, end)))
+
+
+async def areports_for_range(start, end):
+    """reports_for_range for async views."""
+    return _months(start, end, [row async for row in _range_queryset(start, end)])
+
+
+def _range_queryset(start, end):
+    # Annotation names can't shadow model fields, hence the prefixes
+    flags = {f'done_{field}': _flag(field) for field in STEP_FIELDS}
+    dates = {f'max_{field}': Max(field) for field in DATE_FIELDS}
+
+    return (
+        MISReport.objects
+        # Year bounds first so misreport_period_idx (billing_year, billing_month)
+        # narrows the scan; the computed period then trims the edge months
+        .filter(billing_year__gte=start[0], billing_year__lte=end[0])
+        .annotate(month_no=_month_number())
+        .annotate(period=F('billing_year') * 12 + F('month_no'))
+        .filter(period__gte=start[0] * 12 + start[1], period__lte=end[0] * 12 + end[1])
+        .values('billing_year', 'month_no')
+        # progress is kept by MISReport.save(), no need to recount the flags
+        .annotate(**flags, **dates, max_progress=Max('progress'))
+        .order_by()
+    )
+
+
+def _months(start, end, rows):
+    found = {(row['billing_year'], row['month_no']): row for row in rows}
+
+    months = []
+    for year, month in month_span(start, end):
+        row = found.get((year, month))
+        months.append({
+            "month": calendar.month_name[month],
+            "year": year,
+            "data": _report_data(row) if row else {"found": False, "progress": 0},
+        })
+    return months
+
+
+def _report_data(row):
+    """One month of dashboard data: progress, per-stage dates/flags, final flags."""
+    def stage(n):
+        return {
+            "start": row[f'max_stage{n}_start_date'], "end": row[f'max_stage{n}_end_date'],
+            "locality": bool(row[f'done_stage{n}_locality_set']), "gps": bool(row[f'done_stage{n}_gps_check']),
+        }
+
+    return {
+        "found": True,
+        "progress": row['max_progress'],
+        "stage1": stage(1),
+        "stage2": stage(2),
+        "stage3": stage(3),
+        "final": {
+            "mis_status": bool(row['done_final_mis_status']),
+            "bill_approval": bool(row['done_bill_approval_status']),
+        },
+    }
@@ -0,0 +1,273 @@
+import re
+import threading
+from bisect import bisect_left
+from functools import cached_property
+
+from asgiref.sync import sync_to_async
+from django.db.models import F
+from django.utils import timezone
+
+from .models import T3BillingZone, T3BillingKM, TrackerCounter
+
+# tracker_counter row holding the master tables' version. It lives in the
+# database so every worker process sees the same value: a bump in one
+# worker makes all the others reload, and the ETag never goes stale.
+# Its updated_at is when the master last changed (Last-Modified).
+MASTER_VERSION_KEY = 'master_version'
+
+
+# ==========================================
+# HELPER: SMART MATCHING (Fixes "South" vs "South Zone")
+# ==========================================
+def normalize(text):
+    """Removes spaces, lowercase, and strips 'zone' for fuzzy matching."""
+    if not text: return ""
+    # 1. Basic cleanup
+    text = str(text).strip().lower()
+    return text
+
+def create_lookup_dict(queryset, key_field, val_field):
+    """
+    Creates a dictionary where the key is the 'normalized' version of the field.
+    This allows us to find 'South Zone' even if we search for 'South'.
+    """
+    lookup = {}
+    data = list(queryset.values(key_field, val_field))
+
+    for item in data:
+        raw_key = item[key_field]
+        val = item[val_field]
+        if raw_key:
+            # Store normalized key -> value
+            clean_key = normalize(raw_key)
+            lookup[clean_key] = val
+
+            # ALSO store exact key -> value (just in case)
+            lookup[raw_key] = val
+
+    return lookup
+
+
+def get_master_stamp():
+    """
+    (version, changed_at epoch seconds) of the master tables: one indexed
+    row read, cheap enough to answer conditional GETs.
+    """
+    stamp = (
+        TrackerCounter.objects.filter(key=MASTER_VERSION_KEY)
+        .values_list('value', 'updated_at').first()
+    )
+    if stamp is None:
+        # First read after deploy: seed the version row once
+        counter, _ = TrackerCounter.objects.get_or_create(
+            key=MASTER_VERSION_KEY, defaults={'value': 1}
+        )
+        stamp = (counter.value, counter.updated_at)
+    return stamp[0], stamp[1].timestamp()
+
+async def aget_master_stamp():
+    """get_master_stamp for async views."""
+    stamp = await (
+        TrackerCounter.objects.filter(key=MASTER_VERSION_KEY)
+        .values_list('value', 'updated_at').afirst()
+    )
+    if stamp is None:
+        return await sync_to_async(get_master_stamp)()
+    return stamp[0], stamp[1].timestamp()
+
+def get_master_version():
+    """Current version of the master tables (T3BillingZone / T3BillingKM)."""
+    return get_master_stamp()[0]
+
+def bump_master_version():
+    """
+    Marks the master tables as changed so every resolver reloads once.
+    Runs in the caller's transaction, so a rolled-back edit bumps nothing.
+    """
+    bumped = TrackerCounter.objects.filter(key=MASTER_VERSION_KEY).update(
+        value=F('value') + 1, updated_at=timezone.now()
+    )
+    if not bumped:
+        get_master_stamp()
+        bump_master_version()
+
+
+# ==========================================
+# LOCALITY -> ZONE -> KM RESOLVER
+# ==========================================
+class MasterSnapshot:
+    """One immutable load of the master tables, tagged with its version."""
+
+    def __init__(self, version, loc_to_zone, zone_to_km, zone_rows):
+        self.version = version
+        self.loc_to_zone = loc_to_zone
+        self.zone_to_km = zone_to_km
+        self.zone_rows = zone_rows
+
+    def zone_for(self, locality_name):
+        return self.loc_to_zone.get(normalize(locality_name), "-")
+
+    def km_for(self, zone_name):
+        # Normalize the zone first so "South" finds "South Zone" in the KM table
+        return self.zone_to_km.get(normalize(zone_name), "-")
+
+    def resolve(self, locality_name):
+        """Returns (billing_zone, billing_km) for a locality name, '-' if unknown."""
+        found_zone = self.zone_for(locality_name)
+        return found_zone, self.km_for(found_zone)
+
+    @cached_property
+    def canonical_names(self):
+        """Normalized locality name -> its spelling in the master table."""
+        names = {}
+        for item in self.zone_rows:
+            key = normalize(item['t3_locality'])
+            if key:
+                names.setdefault(key, item['t3_locality'].strip())
+        return names
+
+    def canonical_name(self, locality_name):
+        """Master spelling of `locality_name` ("mahipalpur " -> "Mahipalpur"), None if unknown."""
+        return self.canonical_names.get(normalize(locality_name))
+
+    @cached_property
+    def prefix_index(self):
+        """Typeahead index over the master locality names, built on first use."""
+        return PrefixIndex(self.zone_rows)
+
+    def search_prefix(self, prefix, limit=20):
+        """Localities whose name (or one of its words) starts with `prefix`."""
+        return [
+            {
+                "id": name,
+                "locality_name": name,
+                "billing_zone": zone,
+                "billing_km": self.km_for(zone),
+            }
+            for name, zone in self.prefix_index.search(prefix, limit)
+        ]
+
+
+class PrefixIndex:
+    """
+    Sorted arrays of normalized locality names for bisect prefix lookups:
+    O(log n + limit) per query whatever the size of the master list.
+    Whole-name matches come first, then names with a later word matching
+    ("sec" finds "Rohini Sector 3").
+    """
+
+    WORD_START = re.compile(r'[\s\-/(,.]+')
+
+    def __init__(self, zone_rows):
+        self.entries = []
+        names, words = [], []
+        seen = set()
+        for item in zone_rows:
+            raw_loc_name = item['t3_locality']
+            key = normalize(raw_loc_name)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            ref = len(self.entries)
+            self.entries.append((raw_loc_name.strip(), item['t3_billing_zone']))
+            names.append((key, ref))
+            for match in self.WORD_START.finditer(key):
+                if match.end() < len(key):
+                    words.append((key[match.end():], ref))
+
+        names.sort()
+        words.sort()
+        self.name_keys = [key for key, _ in names]
+        self.name_refs = [ref for _, ref in names]
+        self.word_keys = [key for key, _ in words]
+        self.word_refs = [ref for _, ref in words]
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def _scan(keys, refs, prefix):
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield refs[i]
+            i += 1
+
+    def search(self, prefix, limit=20):
+        """[(locality_name, billing_zone)] matching `prefix`, at most `limit`."""
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+        found = []
+        seen = set()
+        for keys, refs in ((self.name_keys, self.name_refs), (self.word_keys, self.word_refs)):
+            for ref in self._scan(keys, refs, prefix):
+                if ref not in seen:
+                    seen.add(ref)
+                    found.append(self.entries[ref])
+                    if len(found) >= limit:
+                        return found
+        return found
+
+
+class LocalityResolver:
+    """
+    Per-worker cache of the two master tables.
+
+    The lookup dicts are built once and reused until the master version
+    changes (see bump_master_version), so page views no longer scan
+    t3_billing_zone and t3_billing_km on every request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def current(self):
+        """Returns an up-to-date MasterSnapshot (one row read when nothing changed)."""
+        version = get_master_version()
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != version:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot.version != version:
+                    snapshot = self._load(version)
+                    self._snapshot = snapshot
+        return snapshot
+
+    async def acurrent(self):
+        """current() for async views: one async row read, a thread hop only to reload."""
+        snapshot = self._snapshot
+        version = await (
+            TrackerCounter.objects.filter(key=MASTER_VERSION_KEY)
+            .values_list('value', flat=True).afirst()
+        )
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        return await sync_to_async(self.current)()
+
+    def _load(self, version):
+        # 1. SMART LOAD: Locality -> Zone
+        # Matches "Mahipalpur" to "South" even if spaces/case differ
+        loc_to_zone = create_lookup_dict(
+            T3BillingZone.objects, 't3_locality', 't3_billing_zone'
+        )
+        # 2. SMART LOAD: Zone -> KM
+        # Matches "South" to "10" even if one says "South Zone"
+        zone_to_km = create_lookup_dict(
+            T3BillingKM.objects, 't3_billing_zone', 't3_billing_km'
+        )
+        # 3. Master list for the dropdown
+        zone_rows = list(T3BillingZone.objects.values('id', 't3_locality', 't3_billing_zone'))
+        return MasterSnapshot(version, loc_to_zone, zone_to_km, zone_rows)
+
+    def invalidate(self):
+        """Drops this worker's copy and tells the other workers to reload."""
+        bump_master_version()
+        with self._lock:
+            self._snapshot = None
+
+    def resolve(self, locality_name):
+        return self.current().resolve(locality_name)
+
+
+resolver = LocalityResolver()
@@ -0,0 +1,151 @@
+from django.db import connection
+from django.db.models import CharField, Q, TextField
+from django.db.models.expressions import RawSQL
+from django.db.models.lookups import IContains
+
+FTS_TABLE = 't3_locality_fts'
+
+# The SQLite trigram tokenizer cannot match terms shorter than 3 characters
+MIN_FTS_LENGTH = 3
+
+_fts_ready = False
+
+
+class TrigramIContains(IContains):
+    """
+    `field ILIKE '%term%'` on PostgreSQL. The built-in icontains compiles to
+    UPPER("field"::text) LIKE UPPER(...), which the pg_trgm GIN indexes on
+    the bare columns cannot serve; ILIKE on the column itself can.
+    """
+
+    lookup_name = 'trgm_icontains'
+
+    def get_rhs_op(self, connection, rhs):
+        return f"ILIKE {rhs}"
+
+
+CharField.register_lookup(TrigramIContains)
+TextField.register_lookup(TrigramIContains)
+
+
+# ==========================================
+# 1. INDEX DDL (used by the migration and build_search_index)
+# ==========================================
+PG_INDEXES = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS t3_locality_address_trgm "
+    "ON t3_locality USING gin (address gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS t3_locality_locality_trgm "
+    "ON t3_locality USING gin (t3_locality gin_trgm_ops)",
+]
+
+SQLITE_FTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"address, t3_locality, content='t3_locality', content_rowid='id', tokenize='trigram')",
+    # Keep the shadow table in step with t3_locality
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON t3_locality BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, address, t3_locality) VALUES (new.id, new.address, new.t3_locality); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON t3_locality BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, address, t3_locality) "
+    f"VALUES ('delete', old.id, old.address, old.t3_locality); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON t3_locality BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, address, t3_locality) "
+    f"VALUES ('delete', old.id, old.address, old.t3_locality); "
+    f"INSERT INTO {FTS_TABLE}(rowid, address, t3_locality) VALUES (new.id, new.address, new.t3_locality); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def install_search_index(conn=connection):
+    """
+    Creates the address search index for the current database:
+    pg_trgm GIN indexes on PostgreSQL, an FTS5 trigram shadow table on SQLite.
+    Returns False when nothing could be built (e.g. t3_locality is missing).
+    """
+    if 't3_locality' not in conn.introspection.table_names():
+        return False
+
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for sql in PG_INDEXES:
+                cursor.execute(sql)
+            return True
+        if conn.vendor == 'sqlite':
+            for sql in SQLITE_FTS:
+                cursor.execute(sql)
+            return True
+    return False
+
+
+def drop_search_index(conn=connection):
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS t3_locality_address_trgm")
+            cursor.execute("DROP INDEX IF EXISTS t3_locality_locality_trgm")
+        elif conn.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts_available():
+    """True once the SQLite FTS5 shadow table exists (checked until found)."""
+    global _fts_ready
+    if not _fts_ready:
+        _fts_ready = FTS_TABLE in connection.introspection.table_names()
+    return _fts_ready
+
+
+# ==========================================
+# 2. SEARCH
+# ==========================================
+def _fts_match(query, fields):
+    # Quote the term so FTS5 treats it as a literal substring, then scope it
+    # to the requested columns: {address t3_locality} : "mahipalpur"
+    term = '"' + query.replace('"', '""') + '"'
+    return "{%s} : %s" % (" ".join(fields), term)
+
+
+def search_addresses(queryset, query, fields=('address',), ranked=False):
+    """
+    Filters a T3Locality queryset to rows whose `fields` contain `query`.
+
+    PostgreSQL: ICONTAINS served by the pg_trgm GIN indexes, ranked by word
+    similarity. SQLite: FTS5 trigram match, ranked by bm25. Anything else
+    (or a too-short term) falls back to a plain ICONTAINS scan.
+    With ranked=True the best matches come first.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    vendor = connection.vendor
+
+    if vendor == 'sqlite' and len(query) >= MIN_FTS_LENGTH and fts_available():
+        match = _fts_match(query, fields)
+        queryset = queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)
+        ))
+        if ranked:
+            # bm25() is lower-is-better
+            queryset = queryset.annotate(rank=RawSQL(
+                f"SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = t3_locality.id", (match,)
+            )).order_by('rank', 'id')
+        return queryset
+
+    # PostgreSQL: ILIKE on the bare column, so the trigram indexes are used
+    lookup = 'trgm_icontains' if vendor == 'postgresql' else 'icontains'
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__{lookup}": query})
+    queryset = queryset.filter(condition)
+
+    if ranked and vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        from django.db.models.functions import Greatest
+
+        scores = [TrigramWordSimilarity(query, field) for field in fields]
+        rank = Greatest(*scores) if len(scores) > 1 else scores[0]
+        queryset = queryset.annotate(rank=rank).order_by('-rank', 'id')
+    return queryset
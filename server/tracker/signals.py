@@ -0,0 +1,78 @@
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import T3BillingZone, T3BillingKM, T3Locality, T3LocalityBilling, LocalityCentroid, VehicleList
+from .resolver import resolver
+from . import counters, dbstats, mapping, spatial, vehicles
+
+
+# --- Remember the old row so renames / status changes refresh both sides ---
+@receiver(pre_save, sender=T3BillingZone)
+@receiver(pre_save, sender=T3BillingKM)
+@receiver(pre_save, sender=T3Locality)
+def remember_old_row(sender, instance, **kwargs):
+    old = sender.objects.filter(pk=instance.pk).values().first() if instance.pk else None
+    instance._tracker_old = old or {}
+
+
+# --- Master tables changed (add_master_locality / admin edits) ---
+@receiver(post_save, sender=T3BillingZone)
+@receiver(post_delete, sender=T3BillingZone)
+def billing_zone_changed(sender, instance, **kwargs):
+    resolver.invalidate()
+    old = getattr(instance, '_tracker_old', {})
+    mapping.refresh_localities([instance.t3_locality, old.get('t3_locality')])
+
+
+@receiver(post_save, sender=T3BillingKM)
+@receiver(post_delete, sender=T3BillingKM)
+def billing_km_changed(sender, instance, **kwargs):
+    resolver.invalidate()
+    old = getattr(instance, '_tracker_old', {})
+    mapping.refresh_zones([instance.t3_billing_zone, old.get('t3_billing_zone')])
+
+
+# --- Centroids feed the spatial grid, which has its own version ---
+@receiver(post_save, sender=LocalityCentroid)
+@receiver(post_delete, sender=LocalityCentroid)
+def centroid_changed(sender, instance, **kwargs):
+    spatial.bump_centroid_version()
+
+
+# --- Single address edited outside tracker.mapping (admin change form) ---
+@receiver(post_save, sender=T3Locality)
+def address_saved(sender, instance, created, **kwargs):
+    now_pending = counters.is_pending(instance.t3_locality)
+    if created:
+        counters.adjust_pending(int(now_pending))
+    else:
+        old = getattr(instance, '_tracker_old', {})
+        counters.adjust_pending(int(now_pending) - int(counters.is_pending(old.get('t3_locality'))))
+    mapping.materialize(T3Locality.objects.filter(id=instance.id))
+
+
+@receiver(post_delete, sender=T3Locality)
+def address_deleted(sender, instance, **kwargs):
+    if counters.is_pending(instance.t3_locality):
+        counters.adjust_pending(-1)
+    T3LocalityBilling.objects.filter(address_id=instance.id).delete()
+
+
+# --- Vehicle removed: its cached RC link must not outlive it ---
+@receiver(post_delete, sender=VehicleList)
+def vehicle_deleted(sender, instance, **kwargs):
+    vehicles.forget_rc_url(instance.rc_document.name)
+    vehicles.forget_rc_url(instance.rc_thumbnail.name)
+
+
+# --- Connection reuse counters for /api/db-stats/ ---
+@receiver(request_started)
+def count_request(sender, **kwargs):
+    dbstats.request_started()
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    dbstats.connection_opened()
@@ -0,0 +1,246 @@
+import threading
+
+import numpy as np
+from django.db.models import F
+from django.utils import timezone
+
+from .models import LocalityCentroid, TrackerCounter
+from .resolver import normalize, resolver
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+# Grid cell edge is picked from the centroid density within these bounds
+MIN_CELL_KM = 0.25
+MAX_CELL_KM = 5.0
+CELL_TARGET = 4  # average localities per occupied cell
+# Points farther than this from every centroid map to "-"
+MAX_REACH_KM = 10.0
+# Cells are searched in rings out to this distance before falling back to
+# a full scan
+RING_SEARCH_KM = 2.0
+# Points per vectorized batch, and point x centroid pairs per full-scan block
+LOOKUP_CHUNK = 50000
+BRUTE_FORCE_CELLS = 2_000_000
+
+# tracker_counter row bumped whenever the centroids change
+CENTROID_VERSION_KEY = 'centroid_version'
+
+
+# ==========================================
+# GRID INDEX (geohash-style fixed cells)
+# ==========================================
+class LocalityGrid:
+    """
+    Locality centroids bucketed into fixed-size cells on an equirectangular
+    projection, stored as a sorted cell -> members table so a batch of
+    points is resolved with array gathers instead of a Python loop.
+    Lookups scan the rings of cells around each point and stop once the
+    best hit is provably the nearest; the rare points left over (far from
+    every centroid) are compared with all centroids directly.
+    """
+
+    def __init__(self, names, zones, lat, lng, cell_km=None):
+        self.names = list(names)
+        self.zones = list(zones)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lng = np.asarray(lng, dtype=float)
+        self.by_key = {normalize(name): i for i, name in enumerate(self.names)}
+
+        # Longitude degrees shrink with latitude; scale once around the data
+        self.lng_scale = np.cos(np.radians(self.lat.mean())) if self.lat.size else 1.0
+        self.cell_km = cell_km or self._density_cell_km()
+        while True:
+            self.cell_deg = self.cell_km / KM_PER_DEGREE
+            keys = self._keys(*self._cells(self.lat, self.lng))
+            # Clustered localities: shrink cells until the occupied ones are small
+            if cell_km or self.cell_km <= MIN_CELL_KM or keys.size <= CELL_TARGET * np.unique(keys).size:
+                break
+            self.cell_km = max(self.cell_km / 2, MIN_CELL_KM)
+        self.members = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_start, self.cell_count = np.unique(
+            keys[self.members], return_index=True, return_counts=True
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def _density_cell_km(self):
+        if self.lat.size < 2:
+            return MAX_CELL_KM
+        height_km = np.ptp(self.lat) * KM_PER_DEGREE
+        width_km = np.ptp(self.lng) * self.lng_scale * KM_PER_DEGREE
+        cell_km = np.sqrt(max(height_km * width_km, 1e-9) / self.lat.size)
+        return float(np.clip(cell_km, MIN_CELL_KM, MAX_CELL_KM))
+
+    @classmethod
+    def build(cls, rows, cell_km=None):
+        """rows: iterable of (locality_name, billing_zone, latitude, longitude)."""
+        names, zones, lat, lng = [], [], [], []
+        for name, zone, latitude, longitude in rows:
+            names.append(name)
+            zones.append(zone)
+            lat.append(latitude)
+            lng.append(longitude)
+        return cls(names, zones, lat, lng, cell_km)
+
+    def _cells(self, lat, lng):
+        cx = np.floor(lng * self.lng_scale / self.cell_deg).astype(np.int64)
+        cy = np.floor(lat / self.cell_deg).astype(np.int64)
+        return cx, cy
+
+    @staticmethod
+    def _keys(cx, cy):
+        return cx * 1_000_003 + cy
+
+    def _dist2(self, candidates, lat, lng):
+        # Squared equirectangular distance is enough to rank candidates
+        d_lat = self.lat[candidates] - lat
+        d_lng = (self.lng[candidates] - lng) * self.lng_scale
+        return d_lat ** 2 + d_lng ** 2
+
+    def _scan_cells(self, rows, cells, lat, lng, best_idx, best_d2):
+        """Offers every member of cells[k] to point rows[k]."""
+        counts = self.cell_count[cells]
+        owner = np.repeat(rows, counts)
+        offset = np.arange(owner.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = self.members[np.repeat(self.cell_start[cells], counts) + offset]
+
+        d2 = self._dist2(candidates, lat[owner], lng[owner])
+        np.minimum.at(best_d2, owner, d2)
+        won = d2 == best_d2[owner]
+        best_idx[owner[won]] = candidates[won]
+
+    def _nearest_chunk(self, lat, lng):
+        cx, cy = self._cells(lat, lng)
+        best_idx = np.full(lat.size, -1, dtype=np.int64)
+        best_d2 = np.full(lat.size, np.inf)
+        todo = np.arange(lat.size)
+
+        rings = max(2, int(np.ceil(RING_SEARCH_KM / self.cell_km)))
+        for r in range(rings + 1):
+            offsets = [
+                (dx, dy)
+                for dx in range(-r, r + 1)
+                for dy in range(-r, r + 1)
+                if max(abs(dx), abs(dy)) == r
+            ]
+            for dx, dy in offsets:
+                keys = self._keys(cx[todo] + dx, cy[todo] + dy)
+                pos = np.searchsorted(self.cell_keys, keys).clip(max=self.cell_keys.size - 1)
+                found = self.cell_keys[pos] == keys
+                if found.any():
+                    self._scan_cells(todo[found], pos[found], lat, lng, best_idx, best_d2)
+
+            # Anything outside rings 0..r is at least r cells away
+            todo = todo[best_d2[todo] > (r * self.cell_deg) ** 2]
+            if not todo.size:
+                break
+
+        # Leftovers: compare with every centroid, a bounded block at a time
+        step = max(1, BRUTE_FORCE_CELLS // len(self))
+        for start in range(0, todo.size, step):
+            rows = todo[start:start + step]
+            d2 = self._dist2(np.arange(len(self))[None, :], lat[rows, None], lng[rows, None])
+            pick = d2.argmin(axis=1)
+            best_idx[rows] = pick
+            best_d2[rows] = d2[np.arange(rows.size), pick]
+
+        best_idx[best_d2 > (MAX_REACH_KM / KM_PER_DEGREE) ** 2] = -1
+        return best_idx
+
+    def nearest(self, lat, lng):
+        """
+        Nearest centroid for each point. Returns (indexes, distance_km);
+        index -1 / distance NaN where nothing is within MAX_REACH_KM.
+        """
+        lat = np.asarray(lat, dtype=float)
+        lng = np.asarray(lng, dtype=float)
+        idx = np.full(lat.size, -1, dtype=np.int64)
+        if not len(self) or not lat.size:
+            return idx, np.full(lat.size, np.nan)
+
+        ok = np.isfinite(lat) & np.isfinite(lng)
+        rows = np.flatnonzero(ok)
+        for start in range(0, rows.size, LOOKUP_CHUNK):
+            part = rows[start:start + LOOKUP_CHUNK]
+            idx[part] = self._nearest_chunk(lat[part], lng[part])
+
+        hit = idx >= 0
+        dist = np.full(lat.size, np.nan)
+        dist[hit] = haversine_km(lat[hit], lng[hit], self.lat[idx[hit]], self.lng[idx[hit]])
+        return idx, dist
+
+    def distance_to(self, locality_names, lat, lng):
+        """km from each point to the centroid of the given locality (NaN if unknown)."""
+        idx = np.array([self.by_key.get(normalize(name), -1) for name in locality_names], dtype=np.int64)
+        lat = np.asarray(lat, dtype=float)
+        lng = np.asarray(lng, dtype=float)
+        dist = np.full(idx.size, np.nan)
+        hit = idx >= 0
+        dist[hit] = haversine_km(lat[hit], lng[hit], self.lat[idx[hit]], self.lng[idx[hit]])
+        return dist
+
+    def lookup(self, lat, lng):
+        """[{locality, billing_zone, distance_km}] for a batch of points."""
+        idx, dist = self.nearest(lat, lng)
+        return [
+            {
+                "locality": self.names[i] if i >= 0 else "-",
+                "billing_zone": self.zones[i] if i >= 0 else "-",
+                "distance_km": round(float(d), 3) if i >= 0 else None,
+            }
+            for i, d in zip(idx.tolist(), dist.tolist())
+        ]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Element-wise great-circle distance in km (all arguments in degrees)."""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+# ==========================================
+# PER-WORKER CACHE
+# ==========================================
+_lock = threading.Lock()
+_cached = {'grid': None, 'version': None}
+
+
+def get_centroid_version():
+    value = TrackerCounter.objects.filter(key=CENTROID_VERSION_KEY).values_list('value', flat=True).first()
+    return value or 0
+
+
+def bump_centroid_version():
+    """
+    Marks the centroids as changed so every worker rebuilds its grid once.
+    Leaves the master version (and the master ETag) alone.
+    """
+    bumped = TrackerCounter.objects.filter(key=CENTROID_VERSION_KEY).update(
+        value=F('value') + 1, updated_at=timezone.now()
+    )
+    if not bumped:
+        TrackerCounter.objects.get_or_create(key=CENTROID_VERSION_KEY, defaults={'value': 1})
+
+
+def build_grid():
+    rows = LocalityCentroid.objects.values_list(
+        'locality__t3_locality', 'locality__t3_billing_zone', 'latitude', 'longitude'
+    )
+    return LocalityGrid.build(rows)
+
+
+def get_grid():
+    """
+    The worker's LocalityGrid, rebuilt when the centroids change or when
+    the master tables do (the grid carries their names and zones).
+    """
+    version = (resolver.current().version, get_centroid_version())
+    if _cached['grid'] is None or _cached['version'] != version:
+        with _lock:
+            if _cached['grid'] is None or _cached['version'] != version:
+                _cached.update(grid=build_grid(), version=version)
+    return _cached['grid']
@@ -0,0 +1,187 @@
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+from .models import T3Locality
+from .counters import PENDING_Q
+from .resolver import normalize, resolver
+
+# How many already-mapped addresses feed the index, and how long a worker
+# keeps its copy before rebuilding (new mappings arrive all the time)
+SAMPLE_SIZE = getattr(settings, 'SUGGEST_SAMPLE_SIZE', 200000)
+INDEX_TTL = getattr(settings, 'SUGGEST_INDEX_TTL', 600)
+
+# Master names count as this many mapped addresses for their own tokens
+MASTER_WEIGHT = 5
+# Localities kept per token after the build (keeps postings small)
+TOP_PER_TOKEN = 20
+# A suggestion is only trusted for auto-mapping when one of its matched tokens
+# is backed by at least this many mapped addresses (a master name hit counts
+# as MASTER_WEIGHT); thinner evidence is shown to operators but never applied
+MIN_SUPPORT = getattr(settings, 'SUGGEST_MIN_SUPPORT', 3)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    'near', 'opp', 'opposite', 'behind', 'house', 'flat', 'floor', 'plot',
+    'no', 'the', 'and', 'of', 'at', 'in', 'on', 'to', 'road', 'rd', 'h',
+}
+
+
+def address_tokens(text):
+    """Unigrams (3+ letters, no bare numbers) and adjacent-word bigrams."""
+    words = [w for w in TOKEN_RE.findall(normalize(text)) if w not in STOPWORDS]
+    unigrams = {w for w in words if len(w) >= 3 and not w.isdigit()}
+    bigrams = {f"{a} {b}" for a, b in zip(words, words[1:])}
+    return unigrams | bigrams
+
+
+# ==========================================
+# INVERTED INDEX
+# ==========================================
+class SuggestionIndex:
+    """
+    token -> {locality_key: weight} built from mapped addresses and the
+    T3BillingZone master list. Plain dicts only, so it pickles cheaply into
+    worker processes.
+    """
+
+    def __init__(self, postings, token_totals, doc_count, names):
+        self.postings = postings
+        self.token_totals = token_totals
+        self.doc_count = doc_count
+        self.names = names  # locality_key -> master spelling
+
+    @classmethod
+    def build(cls, master_rows, mapped_rows):
+        names = {}
+        counts = defaultdict(lambda: defaultdict(int))
+        doc_count = 0
+
+        # 1. Master list: each locality name is strong evidence for itself
+        for row in master_rows:
+            raw_name = row['t3_locality']
+            if not raw_name:
+                continue
+            key = normalize(raw_name)
+            names[key] = raw_name
+            for token in address_tokens(raw_name) | {key}:
+                counts[token][key] += MASTER_WEIGHT
+            doc_count += 1
+
+        # 2. Already-mapped addresses (only localities that exist in the master)
+        for address, locality in mapped_rows:
+            key = normalize(locality)
+            if key not in names:
+                continue
+            for token in address_tokens(address):
+                counts[token][key] += 1
+            doc_count += 1
+
+        postings = {}
+        token_totals = {}
+        for token, per_loc in counts.items():
+            token_totals[token] = sum(per_loc.values())
+            top = sorted(per_loc.items(), key=lambda kv: kv[1], reverse=True)[:TOP_PER_TOKEN]
+            postings[token] = dict(top)
+        return cls(postings, token_totals, max(doc_count, 1), names)
+
+    def idf(self, token):
+        return math.log(1 + self.doc_count / self.token_totals[token])
+
+    def suggest(self, address, limit=3):
+        """
+        Ranked [(locality_name, score, support)] for an address.
+
+        score = agreement * coverage: agreement is the IDF-weighted share of
+        the address's known tokens that point at the locality, coverage the
+        share of the address's words the index knows at all, so words never
+        seen in a mapped address pull the score down instead of being ignored.
+        support is the largest number of mapped addresses behind any one
+        matched token (see MIN_SUPPORT).
+        """
+        scores = defaultdict(float)
+        support = defaultdict(int)
+        evidence = 0.0
+        known_words = unknown_words = 0
+        for token in address_tokens(address):
+            is_word = ' ' not in token
+            per_loc = self.postings.get(token)
+            if not per_loc:
+                unknown_words += is_word
+                continue
+            known_words += is_word
+            weight = self.idf(token)
+            total = self.token_totals[token]
+            evidence += weight
+            for key, count in per_loc.items():
+                scores[key] += weight * count / total
+                support[key] = max(support[key], count)
+
+        if not evidence:
+            return []
+        words = known_words + unknown_words
+        coverage = known_words / words if words else 1.0
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return [
+            (self.names[key], round(score / evidence * coverage, 3), support[key])
+            for key, score in ranked
+        ]
+
+
+# ==========================================
+# PER-WORKER CACHE
+# ==========================================
+_lock = threading.Lock()
+_cached = {'index': None, 'version': None, 'built_at': 0.0}
+
+
+def build_index(sample_size=SAMPLE_SIZE):
+    master = resolver.current()
+    mapped = (
+        T3Locality.objects.exclude(PENDING_Q)
+        .order_by('-id')
+        .values_list('address', 't3_locality')[:sample_size]
+    )
+    return SuggestionIndex.build(master.zone_rows, mapped.iterator(chunk_size=5000))
+
+
+def _is_stale(version):
+    return (
+        _cached['index'] is None
+        or _cached['version'] != version
+        or time.monotonic() - _cached['built_at'] > INDEX_TTL
+    )
+
+
+def get_index(master=None):
+    """The worker's SuggestionIndex, rebuilt on master changes or after INDEX_TTL."""
+    version = (master or resolver.current()).version
+    if _is_stale(version):
+        with _lock:
+            if _is_stale(version):
+                _cached.update(index=build_index(), version=version, built_at=time.monotonic())
+    return _cached['index']
+
+
+def suggest_localities(address, limit=3, master=None):
+    """
+    Top locality suggestions for an address, with zone and KM attached.
+    Pass `master` (a MasterSnapshot) when suggesting for many addresses in
+    one request so the master version is read once, not per address.
+    """
+    master = master or resolver.current()
+    results = []
+    for name, score, support in get_index(master).suggest(address, limit=limit):
+        found_zone, found_km = master.resolve(name)
+        results.append({
+            "locality": name,
+            "score": score,
+            "support": support,
+            "billing_zone": found_zone,
+            "billing_km": found_km,
+        })
+    return results
@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.db import connections
+from django.db.models.signals import pre_migrate
+from django.test.runner import DiscoverRunner
+
+
+def create_unmanaged_tables(sender, using, **kwargs):
+    """
+    The T3 tables are managed=False (they come from the billing import), so
+    migrate never creates them; the test database needs them before the
+    tracker migrations index them and point foreign keys at them.
+    """
+    connection = connections[using]
+    existing = set(connection.introspection.table_names())
+    with connection.schema_editor() as editor:
+        for model in sender.get_models():
+            if not model._meta.managed and model._meta.db_table not in existing:
+                editor.create_model(model)
+
+
+class TrackerTestRunner(DiscoverRunner):
+    """DiscoverRunner that also creates the unmanaged T3 tables in the test database."""
+
+    def setup_databases(self, **kwargs):
+        tracker = apps.get_app_config('tracker')
+        pre_migrate.connect(create_unmanaged_tables, sender=tracker)
+        try:
+            return super().setup_databases(**kwargs)
+        finally:
+            pre_migrate.disconnect(create_unmanaged_tables, sender=tracker)
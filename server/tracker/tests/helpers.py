@@ -0,0 +1,19 @@
+from ..models import T3BillingKM, T3BillingZone, T3Locality
+from .. import counters
+
+
+def make_master():
+    T3BillingKM.objects.create(t3_billing_zone='South', t3_billing_km=10)
+    T3BillingZone.objects.create(t3_locality='Mahipalpur', t3_billing_zone='South')
+    T3BillingZone.objects.create(t3_locality='Saket', t3_billing_zone='South')
+
+
+def make_addresses(count, locality=None, address='House {} near Mahipalpur metro'):
+    return [
+        T3Locality.objects.create(address=address.format(i), t3_locality=locality).id
+        for i in range(count)
+    ]
+
+
+def real_pending():
+    return T3Locality.objects.filter(counters.PENDING_Q).count()
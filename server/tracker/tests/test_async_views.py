@@ -0,0 +1,52 @@
+from asgiref.sync import iscoroutinefunction
+from django.test import AsyncClient, TestCase
+
+from ..models import MISReport, VehicleList
+from .. import resolver, views
+from .helpers import make_master, make_addresses
+
+
+# ==========================================
+# ASYNC (ASGI) READ APIS
+# ==========================================
+class AsyncViewTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        make_addresses(3)
+        make_addresses(2, locality='Saket', address='Mapped {}')
+        VehicleList.objects.create(vehicle_no='DL1C1234')
+        MISReport.objects.create(billing_year=2025, billing_month='March')
+        resolver.resolver._snapshot = None
+        self.client = AsyncClient()
+
+    def test_read_apis_are_coroutines(self):
+        for view in (views.dashboard_data, views.locality_list_api,
+                     views.dropdown_localities, views.get_vehicle_list):
+            self.assertTrue(iscoroutinefunction(view), view.__name__)
+
+    async def test_locality_table(self):
+        data = (await self.client.get('/api/localities/', {'after': '', 'approx': '1'})).json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertEqual(data['global_pending'], 3)
+        self.assertFalse(data['pagination']['has_more'])
+
+        data = (await self.client.get('/api/localities/', {'status': 'done'})).json()
+        self.assertEqual({row['locality'] for row in data['results']}, {'Saket'})
+
+    async def test_dropdown_and_vehicles(self):
+        dropdown = (await self.client.get('/api/dropdown-localities/')).json()
+        self.assertEqual([row['locality_name'] for row in dropdown], ['Mahipalpur', 'Saket'])
+        vehicles = (await self.client.get('/api/vehicles/')).json()
+        self.assertEqual([row['vehicle_no'] for row in vehicles['results']], ['DL1C1234'])
+
+    async def test_dashboard(self):
+        data = (await self.client.get('/api/dashboard-data/', {'year': 2025, 'month': 3})).json()
+        self.assertEqual(data['current']['month'], 'March')
+        self.assertEqual(data['previous']['month'], 'February')
+
+    async def test_csv_export_streams_under_asgi(self):
+        response = await self.client.get('/api/export-localities/')
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode('utf-8-sig')
+        self.assertEqual(len(body.strip().splitlines()), 6)
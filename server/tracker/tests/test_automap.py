@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from ..models import T3BillingKM, T3BillingZone, T3Locality, T3LocalityBilling, LocalityClaim
+from .. import automap, claims, counters, mapping, suggest
+from .helpers import make_master, make_addresses, real_pending
+
+
+# ==========================================
+# AUTO-MAPPING WRITES (fill_pending)
+# ==========================================
+class FillPendingTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        self.ids = make_addresses(4)
+        counters.recount_pending()
+
+    def test_keeps_rows_mapped_after_scoring(self):
+        # An operator saves a row between the automap read and its write
+        mapping.set_locality(self.ids[:1], 'Saket')
+
+        self.assertEqual(mapping.fill_pending(self.ids, 'Mahipalpur'), 3)
+        self.assertEqual(T3Locality.objects.get(id=self.ids[0]).t3_locality, 'Saket')
+        self.assertEqual(T3LocalityBilling.objects.filter(address_id__in=self.ids).count(), 4)
+        self.assertEqual(counters.pending_count(), real_pending())
+
+    def test_skips_rows_leased_to_an_operator(self):
+        held = [row['id'] for row in claims.claim_pending('op-a', batch_size=2)]
+
+        self.assertEqual(mapping.fill_pending(self.ids, 'Mahipalpur', skip_claimed=True), 2)
+        self.assertEqual(real_pending(), 2)
+        self.assertFalse(T3Locality.objects.filter(id__in=held, t3_locality='Mahipalpur').exists())
+        self.assertEqual(LocalityClaim.objects.count(), 2)
+
+
+# ==========================================
+# AUTO-MAPPING RUN (process pool)
+# ==========================================
+class AutomapRunTests(TransactionTestCase):
+
+    def setUp(self):
+        make_master()
+        make_addresses(6, locality='Mahipalpur', address='House {} Mahipalpur Extension')
+        self.likely = make_addresses(3, address='Plot {} Mahipalpur Extension')
+        self.unknown = make_addresses(2, address='Shop {} Xyzzy Bazaar')
+        counters.recount_pending()
+        suggest._cached.update(index=None, version=None)
+
+    def tearDown(self):
+        # flush() between TransactionTestCases skips the unmanaged T3 tables
+        T3Locality.objects.all().delete()
+        T3BillingZone.objects.all().delete()
+        T3BillingKM.objects.all().delete()
+
+    def test_maps_confident_matches_and_skips_claimed_rows(self):
+        LocalityClaim.objects.create(
+            address_id=self.likely[0], operator='op-a', expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        seen = []
+        stats = automap.run_automap(cutoff=0.5, workers=1, chunk_size=2, progress=seen.append)
+
+        self.assertEqual((stats['scanned'], stats['applied'], stats['no_match']), (4, 2, 2))
+        self.assertEqual(len(seen), 2)
+        self.assertEqual(
+            set(T3Locality.objects.filter(t3_locality='Mahipalpur', id__in=self.likely).values_list('id', flat=True)),
+            set(self.likely[1:]),
+        )
+        self.assertEqual(counters.pending_count(), real_pending())
+
+    def test_dry_run_writes_nothing(self):
+        stats = automap.run_automap(cutoff=0.5, workers=1, dry_run=True)
+        self.assertEqual(stats['applied'], 3)
+        self.assertEqual(real_pending(), 5)
@@ -0,0 +1,53 @@
+from django.test import TestCase
+
+from ..models import T3BillingKM, T3BillingZone, T3Locality, T3LocalityBilling
+from .. import mapping
+from ..resolver import resolver
+from .helpers import make_master, make_addresses
+
+
+# ==========================================
+# MATERIALIZED ZONE / KM (t3_locality_billing)
+# ==========================================
+class LocalityBillingTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        self.mapped = make_addresses(2, locality='Mahipalpur')
+        self.pending = make_addresses(1)
+
+    def billing(self, address_id):
+        row = T3LocalityBilling.objects.get(address_id=address_id)
+        return row.billing_zone, row.billing_km, row.status
+
+    def test_rows_written_on_create_and_save(self):
+        self.assertEqual(self.billing(self.mapped[0]), ('South', 10.0, 'Done'))
+        self.assertEqual(self.billing(self.pending[0]), (None, None, 'Pending'))
+
+        mapping.set_locality(self.pending, 'saket')
+        self.assertEqual(self.billing(self.pending[0]), ('South', 10.0, 'Done'))
+
+    def test_zone_edit_refreshes_its_localities(self):
+        zone = T3BillingZone.objects.get(t3_locality='Mahipalpur')
+        zone.t3_billing_zone = 'West'
+        zone.save()
+        self.assertEqual(self.billing(self.mapped[1]), ('West', None, 'Done'))
+
+        T3BillingKM.objects.create(t3_billing_zone='West', t3_billing_km=22)
+        self.assertEqual(self.billing(self.mapped[1]), ('West', 22.0, 'Done'))
+
+    def test_km_edit_refreshes_its_zone(self):
+        km = T3BillingKM.objects.get(t3_billing_zone='South')
+        km.t3_billing_km = 12.5
+        km.save()
+        self.assertEqual(self.billing(self.mapped[0]), ('South', 12.5, 'Done'))
+
+    def test_materialize_rebuilds_missing_rows(self):
+        T3LocalityBilling.objects.all().delete()
+        self.assertEqual(mapping.materialize(), 3)
+        self.assertEqual(self.billing(self.mapped[0]), ('South', 10.0, 'Done'))
+
+    def test_resolved_row_prefers_the_stored_columns(self):
+        T3LocalityBilling.objects.filter(address_id=self.mapped[0]).update(billing_km=99)
+        row = T3Locality.objects.values(*mapping.RESOLVED_VALUES).get(id=self.mapped[0])
+        self.assertEqual(mapping.resolved_row(row, resolver.current())['billing_km'], 99.0)
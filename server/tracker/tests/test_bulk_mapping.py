@@ -0,0 +1,76 @@
+import json
+
+from django.test import Client, TestCase
+
+from ..models import T3Locality, T3LocalityBilling, LocalityClaim
+from .. import claims, counters, mapping
+from .helpers import make_master, make_addresses, real_pending
+
+
+# ==========================================
+# BULK MAPPING (bulk-save)
+# ==========================================
+class BulkMappingTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        self.metro = make_addresses(4)
+        self.saket = make_addresses(3, address='Flat {} Press Enclave Saket')
+        counters.recount_pending()
+        self.client = Client()
+
+    def bulk_save(self, **body):
+        return self.client.post('/api/bulk-save/', json.dumps(body), content_type='application/json')
+
+    def test_selected_ids(self):
+        response = self.bulk_save(address_ids=self.metro[:3], locality_id='Mahipalpur')
+        self.assertEqual(response.json(), {'success': True, 'count': 3})
+
+        self.assertEqual(
+            set(T3Locality.objects.filter(t3_locality='Mahipalpur').values_list('id', flat=True)),
+            set(self.metro[:3]),
+        )
+        billing = T3LocalityBilling.objects.filter(address_id__in=self.metro[:3])
+        self.assertEqual({(row.billing_zone, row.billing_km, row.status) for row in billing},
+                         {('South', 10.0, 'Done')})
+        self.assertEqual(counters.pending_count(), 4)
+
+    def test_search_predicate_maps_only_matching_pending_rows(self):
+        T3Locality.objects.filter(id=self.saket[0]).update(t3_locality='Mahipalpur')
+        counters.recount_pending()
+
+        response = self.bulk_save(q='Press Enclave', locality_id='Saket')
+        self.assertEqual(response.json(), {'success': True, 'count': 2})
+        self.assertEqual(T3Locality.objects.get(id=self.saket[0]).t3_locality, 'Mahipalpur')
+        self.assertEqual(T3Locality.objects.filter(t3_locality='Saket').count(), 2)
+        self.assertEqual(counters.pending_count(), real_pending())
+
+    def test_keeps_rows_mapped_since_selection(self):
+        mapping.set_locality(self.metro[:1], 'Saket')
+
+        response = self.bulk_save(address_ids=self.metro, locality_id='Mahipalpur')
+        self.assertEqual(response.json(), {'success': True, 'count': 3})
+        self.assertEqual(T3Locality.objects.get(id=self.metro[0]).t3_locality, 'Saket')
+
+    def test_queryset_chunks_recheck_pending(self):
+        # The predicate is re-evaluated per chunk, on the locked rows
+        T3Locality.objects.filter(id=self.saket[1]).update(t3_locality='Mahipalpur')
+        matching = T3Locality.objects.filter(address__contains='Press Enclave')
+
+        self.assertEqual(mapping.bulk_set_locality('Saket', queryset=matching, chunk_size=2), 2)
+        self.assertEqual(T3Locality.objects.get(id=self.saket[1]).t3_locality, 'Mahipalpur')
+
+    def test_releases_claims(self):
+        claims.claim_pending('op-a', batch_size=2)
+        held = list(LocalityClaim.objects.values_list('address_id', flat=True))
+        self.bulk_save(address_ids=held, locality_id='Mahipalpur')
+        self.assertFalse(LocalityClaim.objects.exists())
+
+    def test_unknown_locality(self):
+        response = self.bulk_save(address_ids=self.metro, locality_id='Atlantis')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(T3Locality.objects.filter(t3_locality='Atlantis').exists())
+        self.assertEqual(counters.pending_count(), 7)
+
+    def test_needs_ids_or_search(self):
+        self.assertEqual(self.bulk_save(locality_id='Mahipalpur').status_code, 400)
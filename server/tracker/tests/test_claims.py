@@ -0,0 +1,74 @@
+import threading
+
+from django.db import connections
+from django.test import Client, TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from ..models import T3Locality, LocalityClaim
+from .. import claims, mapping
+from .helpers import make_master, make_addresses
+
+
+# ==========================================
+# WORK QUEUE (next-pending / claims)
+# ==========================================
+class ClaimTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        make_addresses(12)
+
+    def test_operators_get_disjoint_batches(self):
+        first = {row['id'] for row in claims.claim_pending('op-a', batch_size=5)}
+        second = {row['id'] for row in claims.claim_pending('op-b', batch_size=5)}
+        self.assertEqual(len(first), 5)
+        self.assertEqual(len(second), 5)
+        self.assertFalse(first & second)
+
+    def test_operator_keeps_its_batch_until_saved(self):
+        batch = [row['id'] for row in claims.claim_pending('op-a', batch_size=3)]
+        self.assertEqual([row['id'] for row in claims.claim_pending('op-a', batch_size=3)], batch)
+
+        mapping.set_locality(batch[:1], 'Mahipalpur')
+        again = [row['id'] for row in claims.claim_pending('op-a', batch_size=3)]
+        self.assertNotIn(batch[0], again)
+        self.assertEqual(again[:2], batch[1:])
+
+    def test_next_pending_with_operator(self):
+        client = Client()
+        a = client.get('/api/next-pending/', {'operator': 'op-a'}).json()
+        b = client.get('/api/next-pending/', {'operator': 'op-b'}).json()
+        seen_a = {a['data']['id']} | {row['id'] for row in a['prefetch']}
+        seen_b = {b['data']['id']} | {row['id'] for row in b['prefetch']}
+        self.assertFalse(seen_a & seen_b)
+        self.assertEqual(LocalityClaim.objects.filter(operator='op-a').count(), len(seen_a))
+
+
+class ConcurrentClaimTests(TransactionTestCase):
+    """Two operators claiming at the same moment (needs SELECT ... SKIP LOCKED)."""
+
+    def tearDown(self):
+        # flush() between TransactionTestCases skips the unmanaged T3 tables
+        T3Locality.objects.all().delete()
+
+    @skipUnlessDBFeature('has_select_for_update_skip_locked')
+    def test_simultaneous_claims_are_disjoint(self):
+        make_addresses(20)
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def claim(operator):
+            try:
+                barrier.wait()
+                results[operator] = {row['id'] for row in claims.claim_pending(operator, batch_size=8)}
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=claim, args=(op,)) for op in ('op-a', 'op-b')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results['op-a']), 8)
+        self.assertEqual(len(results['op-b']), 8)
+        self.assertFalse(results['op-a'] & results['op-b'])
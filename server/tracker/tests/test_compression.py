@@ -0,0 +1,64 @@
+import gzip
+import json
+from unittest import skipIf
+
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase
+
+from ..middleware import CompressionMiddleware, brotli
+from .helpers import make_addresses
+
+
+# ==========================================
+# API RESPONSE COMPRESSION
+# ==========================================
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    BODY = {'results': [{'id': i, 'locality': 'Mahipalpur', 'zone': 'South'} for i in range(50)]}
+
+    def respond(self, response, path='/api/localities/', encoding='gzip, deflate, br'):
+        request = RequestFactory().get(path, headers={'Accept-Encoding': encoding})
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_api_json_is_gzipped(self):
+        response = self.respond(JsonResponse(self.BODY), encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.BODY)
+
+    def test_left_alone(self):
+        cases = {
+            'small body': (JsonResponse({'success': True}), '/api/localities/'),
+            'outside /api/': (JsonResponse(self.BODY), '/admin/tracker/'),
+            'html': (HttpResponse('<p>x</p>' * 200), '/api/localities/'),
+            'pdf': (HttpResponse(b'%PDF' * 500, content_type='application/pdf'), '/api/localities/'),
+        }
+        for name, (response, path) in cases.items():
+            with self.subTest(name):
+                self.assertFalse(self.respond(response, path).has_header('Content-Encoding'))
+
+    def test_streaming_csv_is_gzipped_chunk_by_chunk(self):
+        rows = (f"{i},House {i},Mahipalpur,South,10\n".encode() for i in range(1000))
+        response = self.respond(StreamingHttpResponse(rows, content_type='text/csv'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response.streaming)
+        self.assertEqual(gzip.decompress(b''.join(response)).count(b'\n'), 1000)
+
+    @skipIf(brotli is None, "brotli is not installed")
+    def test_brotli_when_accepted(self):
+        response = JsonResponse(self.BODY)
+        response['ETag'] = '"v1"'
+        response = self.respond(response)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['ETag'], 'W/"v1"')
+        self.assertEqual(json.loads(brotli.decompress(response.content)), self.BODY)
+
+
+class CompressedExportTests(TestCase):
+
+    def test_csv_export_download_is_gzipped(self):
+        make_addresses(50)
+        response = Client().get('/api/export-localities/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        text = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8-sig')
+        self.assertIn('House 49 near Mahipalpur metro', text)
@@ -0,0 +1,61 @@
+from django.test import TestCase
+
+from ..models import T3Locality
+from .. import counters, mapping
+from .helpers import make_master, make_addresses, real_pending
+
+
+# ==========================================
+# PENDING COUNTER (tracker_counter)
+# ==========================================
+class PendingCounterTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        make_addresses(3)
+        make_addresses(2, locality='Saket')
+        counters.recount_pending()
+
+    def assertCounterAccurate(self, expected):
+        self.assertEqual(real_pending(), expected)
+        self.assertEqual(counters.pending_count(), expected)
+
+    def test_create(self):
+        T3Locality.objects.create(address='Flat 9 Saket', t3_locality=None)
+        T3Locality.objects.create(address='Flat 10 Saket', t3_locality='')
+        T3Locality.objects.create(address='Flat 11 Saket', t3_locality='Saket')
+        self.assertCounterAccurate(5)
+
+    def test_update(self):
+        row = T3Locality.objects.filter(counters.PENDING_Q).first()
+        row.t3_locality = 'Mahipalpur'
+        row.save()
+        self.assertCounterAccurate(2)
+
+        row.t3_locality = ''
+        row.save()
+        self.assertCounterAccurate(3)
+
+        # Mapped -> mapped leaves the count alone
+        done = T3Locality.objects.exclude(counters.PENDING_Q).first()
+        done.t3_locality = 'Mahipalpur'
+        done.save()
+        self.assertCounterAccurate(3)
+
+    def test_delete(self):
+        T3Locality.objects.filter(counters.PENDING_Q).first().delete()
+        T3Locality.objects.exclude(counters.PENDING_Q).first().delete()
+        self.assertCounterAccurate(2)
+
+    def test_set_locality_counts_only_rows_that_flip(self):
+        ids = list(T3Locality.objects.values_list('id', flat=True))
+        self.assertEqual(mapping.set_locality(ids, 'Mahipalpur'), 5)
+        self.assertCounterAccurate(0)
+
+        mapping.set_locality(ids[:2], '')
+        self.assertCounterAccurate(2)
+
+    def test_recount_repairs_drift(self):
+        counters.adjust_pending(40)
+        self.assertEqual(counters.recount_pending(), 3)
+        self.assertCounterAccurate(3)
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase
+
+from .. import dbstats
+
+
+# ==========================================
+# CONNECTION / POOL STATISTICS
+# ==========================================
+class DbStatsApiTests(TestCase):
+
+    def test_reports_this_worker(self):
+        client = Client()
+        before = client.get('/api/db-stats/').json()
+        after = client.get('/api/db-stats/').json()
+        self.assertEqual(after['vendor'], connection.vendor)
+        self.assertEqual(after['process']['requests'], before['process']['requests'] + 1)
+        self.assertIn('reuse_ratio', after['process'])
+        if getattr(connection, 'pool', None) is None:
+            self.assertIsNone(after['pool'])
+
+
+class PoolStatsTests(SimpleTestCase):
+
+    def test_pool_counters_are_reshaped(self):
+        pool = SimpleNamespace(min_size=2, max_size=10, get_stats=lambda: {
+            'pool_size': 4, 'pool_available': 1, 'requests_num': 8, 'requests_wait_ms': 20,
+            'requests_waiting': 0, 'connections_num': 4,
+        })
+        stats = dbstats._pool_stats(pool)
+        self.assertEqual(stats['in_use'], 3)
+        self.assertEqual(stats['saturation'], 0.3)
+        self.assertEqual(stats['avg_wait_ms'], 2.5)
+        self.assertEqual(stats['timeouts'], 0)
+        self.assertEqual(stats['connections_opened'], 4)
+
+    def test_idle_pool(self):
+        pool = SimpleNamespace(min_size=0, max_size=4, get_stats=lambda: {})
+        self.assertEqual(dbstats._pool_stats(pool)['avg_wait_ms'], 0)
@@ -0,0 +1,62 @@
+import csv
+import io
+import unittest
+from importlib.util import find_spec
+
+from django.test import AsyncClient, Client, TestCase
+
+from .. import export
+from .helpers import make_master, make_addresses
+
+
+# ==========================================
+# LOCALITY EXPORT (CSV / XLSX)
+# ==========================================
+class ExportTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        self.done = make_addresses(3, locality='Saket', address='Flat {}, Saket')
+        self.pending = make_addresses(2)
+
+    def rows(self, content):
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_csv_streams_every_row(self):
+        response = Client().get('/api/export-localities/')
+        self.assertTrue(response.streaming)
+        rows = self.rows(b''.join(response.streaming_content).decode())
+        self.assertEqual(rows[0], ['ID', 'Address', 'Locality', 'Billing Zone', 'Billing KM', 'Status'])
+        self.assertEqual([int(row[0]) for row in rows[1:]], self.done + self.pending)
+        self.assertEqual(rows[1][2:], ['Saket', 'South', '10.0', 'Done'])
+        self.assertEqual(rows[-1][2:], ['', '-', '-', 'Pending'])
+
+    def test_filters(self):
+        response = Client().get('/api/export-localities/', {'status': 'pending'})
+        rows = self.rows(b''.join(response.streaming_content).decode())
+        self.assertEqual([int(row[0]) for row in rows[1:]], self.pending)
+
+        response = Client().get('/api/export-localities/', {'zone': 'south'})
+        self.assertEqual(len(self.rows(b''.join(response.streaming_content).decode())), 4)
+
+    def test_csv_batches_keep_every_line(self):
+        chunks = list(export.stream_csv(export.iter_resolved_rows(export.export_queryset(), chunk_size=2), batch=2))
+        self.assertEqual(len(chunks), 1 + 3)
+        self.assertEqual(len(self.rows(''.join(chunks))), 6)
+
+    async def test_asgi_streams_asynchronously(self):
+        response = await AsyncClient().get('/api/export-localities/')
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertEqual(len(self.rows(content)), 6)
+
+    @unittest.skipUnless(find_spec('openpyxl'), "needs openpyxl")
+    def test_xlsx(self):
+        from openpyxl import load_workbook
+
+        response = Client().get('/api/export-localities/', {'format': 'xlsx'})
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        values = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(values[0][0], 'ID')
+        self.assertEqual(values[1][1:], ('Flat 0, Saket', 'Saket', 'South', 10, 'Done'))
+        self.assertEqual(len(values), 6)
@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+from django.test import Client, TestCase
+
+from ..models import LocalityCentroid, MISReport, T3BillingZone
+from .. import gps, resolver, spatial
+from .helpers import make_master
+
+
+# ==========================================
+# GPS VALIDATION
+# ==========================================
+class GpsStageMarkTests(TestCase):
+
+    POINTS = "28.5000, 77.1000\n28.5010, 77.1010\n28.5020, 77.1020\n"
+
+    def setUp(self):
+        self.report = MISReport.objects.create(billing_year=2025, billing_month='March')
+
+    def validate(self, **body):
+        return Client().post('/api/validate-gps/', json.dumps({'text': self.POINTS, **body}),
+                             content_type='application/json')
+
+    def test_month_number_marks_the_stage(self):
+        data = self.validate(year=2025, month=3, stage=2).json()
+        self.assertTrue(data['summary']['passed'])
+        self.assertTrue(data['stage_marked'])
+        self.report.refresh_from_db()
+        self.assertTrue(self.report.stage2_gps_check)
+        self.assertEqual(self.report.progress, 12)
+
+    def test_month_name_in_any_case(self):
+        self.assertTrue(self.validate(year=2025, month='march', stage=1).json()['stage_marked'])
+
+    def test_bad_month_is_rejected(self):
+        response = self.validate(year=2025, month=13, stage=1)
+        self.assertEqual(response.status_code, 400)
+        self.report.refresh_from_db()
+        self.assertFalse(self.report.stage1_gps_check)
+
+
+class ValidatePointsTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        spatial._cached.update(grid=None, version=None)
+        resolver.resolver._snapshot = None
+
+    def test_clean_trip_passes(self):
+        result = gps.validate_points(['a'] * 3, [28.50, 28.51, 28.52], [77.10, 77.10, 77.10],
+                                     [0, 600, 1200], {'a': {'zone': 'South'}})
+        trip = result['trips'][0]
+        self.assertTrue(result['summary']['passed'])
+        self.assertEqual(trip['billing_km'], 10)
+        self.assertTrue(trip['km_ok'])
+        self.assertAlmostEqual(trip['distance_km'], 2.224, places=2)
+
+    def test_out_of_range_and_null_island_are_flagged(self):
+        result = gps.validate_points(['a'] * 4, [28.5, 95.0, 0.0, 28.5], [77.1, 77.1, 0.0, 77.1],
+                                     [np.nan] * 4)
+        self.assertEqual(result['summary']['invalid'], 2)
+        self.assertEqual([f['index'] for f in result['flags'] if f['issue'] == 'out_of_range'], [1, 2])
+        self.assertFalse(result['summary']['passed'])
+
+    def test_repeated_fix_is_a_duplicate_not_a_failure(self):
+        result = gps.validate_points(['a'] * 3, [28.5, 28.5, 28.51], [77.1, 77.1, 77.1], [np.nan] * 3)
+        self.assertEqual(result['summary']['duplicates'], 1)
+        self.assertTrue(result['summary']['passed'])
+
+    def test_teleports_by_speed_and_by_jump(self):
+        # 0.1 degree (~11 km) in one minute, then the same jump without timestamps
+        timed = gps.validate_points(['a'] * 2, [28.5, 28.6], [77.1, 77.1], [0, 60])
+        untimed = gps.validate_points(['a'] * 2, [28.5, 28.6], [77.1, 77.1], [np.nan] * 2)
+        slow = gps.validate_points(['a'] * 2, [28.5, 28.6], [77.1, 77.1], [0, 3600])
+        self.assertEqual(timed['summary']['teleports'], 1)
+        self.assertEqual(untimed['summary']['teleports'], 1)
+        self.assertEqual(slow['summary']['teleports'], 0)
+        # Teleport segments do not count towards the trip distance
+        self.assertEqual(timed['trips'][0]['distance_km'], 0)
+
+    def test_points_are_ordered_per_trip_by_time(self):
+        # Interleaved trips, b's fixes out of order: no jump once sorted
+        result = gps.validate_points(['a', 'b', 'a', 'b'], [28.5, 28.52, 28.51, 28.51],
+                                     [77.1, 77.1, 77.1, 77.1], [0, 1200, 600, 600])
+        self.assertEqual(result['summary']['trips'], 2)
+        self.assertEqual(result['summary']['teleports'], 0)
+        self.assertEqual([t['distance_km'] for t in result['trips']], [1.112, 1.112])
+
+    def test_trip_longer_than_zone_km_is_a_mismatch(self):
+        lat = [28.50, 28.55, 28.60, 28.65]  # ~16.7 km against South's 10 km (+20%)
+        result = gps.validate_points(['a'] * 4, lat, [77.1] * 4, [0, 600, 1200, 1800],
+                                     {'a': {'zone': 'South'}})
+        self.assertFalse(result['trips'][0]['km_ok'])
+        self.assertEqual(result['summary']['km_mismatches'], 1)
+        self.assertFalse(result['summary']['passed'])
+
+    def test_drop_point_is_checked_against_the_mapped_locality(self):
+        zones = {row.t3_locality: row for row in T3BillingZone.objects.all()}
+        LocalityCentroid.objects.create(locality=zones['Saket'], latitude=28.52, longitude=77.21)
+        LocalityCentroid.objects.create(locality=zones['Mahipalpur'], latitude=28.55, longitude=77.12)
+
+        result = gps.validate_points(['a', 'b'], [28.521, 28.521], [77.211, 77.211], [np.nan] * 2,
+                                     {'a': {'locality': 'saket'}, 'b': {'locality': 'Mahipalpur'}})
+        a, b = result['trips']
+        self.assertEqual(a['drop_locality'], 'Saket')
+        self.assertTrue(a['drop_ok'])
+        self.assertFalse(b['drop_ok'])
+        self.assertEqual(result['summary']['drop_mismatches'], 1)
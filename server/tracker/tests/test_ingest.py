@@ -0,0 +1,39 @@
+import io
+
+from django.test import TestCase
+
+from ..models import T3Locality, T3LocalityBilling
+from .. import counters, ingest
+from .helpers import make_master, make_addresses, real_pending
+
+
+# ==========================================
+# ADDRESS INGEST
+# ==========================================
+class IngestTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        make_addresses(1, address='Existing {} Saket')
+        counters.recount_pending()
+
+    def ingest(self, content):
+        return ingest.ingest_addresses(io.BytesIO(content), chunk_size=2)
+
+    def test_dedupes_in_file_and_against_the_table(self):
+        stats = self.ingest(
+            b"Pickup Address,Locality\n"
+            b"Existing 0 Saket,\n"
+            b"A1 Mahipalpur,Mahipalpur\n"
+            b"A1 Mahipalpur,\n"
+            b"B2 Press Enclave,\n"
+        )
+        self.assertEqual((stats['read'], stats['inserted'], stats['duplicates']), (4, 2, 2))
+        self.assertEqual(T3Locality.objects.get(address='A1 Mahipalpur').t3_locality, 'Mahipalpur')
+        self.assertEqual(T3LocalityBilling.objects.get(address__address='A1 Mahipalpur').billing_zone, 'South')
+        self.assertEqual(counters.pending_count(), real_pending())
+
+    def test_headerless_file_keeps_its_first_row(self):
+        stats = self.ingest(b"C3 Saket\nC4 Saket\nC5 Saket\n")
+        self.assertEqual(stats['inserted'], 3)
+        self.assertTrue(T3Locality.objects.filter(address='C3 Saket').exists())
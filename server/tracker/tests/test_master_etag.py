@@ -0,0 +1,41 @@
+from django.test import Client, TestCase
+
+from ..models import T3BillingZone
+from .helpers import make_master
+
+
+# ==========================================
+# CONDITIONAL GET FOR MASTER DATA
+# ==========================================
+class MasterEtagTests(TestCase):
+
+    URLS = ('/api/master-zones/', '/api/dropdown-localities/', '/api/locality-typeahead/?prefix=sa')
+
+    def setUp(self):
+        make_master()
+        self.client = Client()
+
+    def test_unchanged_master_answers_304(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                self.assertTrue(first['ETag'])
+                self.assertTrue(first['Last-Modified'])
+
+                again = self.client.get(url, headers={'If-None-Match': first['ETag']})
+                self.assertEqual(again.status_code, 304)
+                self.assertEqual(again.content, b'')
+                self.assertEqual(again['ETag'], first['ETag'])
+
+    def test_master_edit_changes_the_etag(self):
+        etag = self.client.get('/api/master-zones/')['ETag']
+        T3BillingZone.objects.create(t3_locality='Dwarka', t3_billing_zone='South')
+
+        response = self.client.get('/api/master-zones/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_all_views_share_one_version(self):
+        etags = {self.client.get(url)['ETag'] for url in self.URLS}
+        self.assertEqual(len(etags), 1)
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import MISReport
+
+
+# ==========================================
+# MIS REPORT PROGRESS
+# ==========================================
+class StoredProgressTests(TestCase):
+
+    def test_save_packs_the_steps(self):
+        report = MISReport.objects.create(
+            billing_year=2025, billing_month='March', stage1_locality_set=True, final_mis_status=True,
+        )
+        self.assertEqual(report.stage_mask, 0b1000001)
+        self.assertEqual(report.progress, 25)
+        self.assertTrue(report.step_done('final_mis_status'))
+        self.assertFalse(report.step_done('stage1_gps_check'))
+
+    def test_update_fields_also_writes_the_derived_columns(self):
+        report = MISReport.objects.create(billing_year=2025, billing_month='March')
+        for field in MISReport.STEP_FIELDS:
+            setattr(report, field, True)
+        report.save(update_fields=MISReport.STEP_FIELDS)
+        self.assertEqual(MISReport.objects.values_list('stage_mask', 'progress').get(), (0xFF, 100))
+
+
+class ProgressAdminTests(TestCase):
+
+    def setUp(self):
+        MISReport.objects.create(billing_year=2025, billing_month='January')
+        MISReport.objects.create(billing_year=2025, billing_month='February', stage1_locality_set=True)
+        MISReport.objects.create(billing_year=2025, billing_month='March', **dict.fromkeys(MISReport.STEP_FIELDS, True))
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def months(self, query):
+        response = self.client.get('/admin/tracker/misreport/' + query)
+        self.assertEqual(response.status_code, 200)
+        return [str(report) for report in response.context['cl'].result_list]
+
+    def test_filter_by_progress_bucket(self):
+        self.assertEqual(self.months('?progress=not_started'), ['January 2025'])
+        self.assertEqual(self.months('?progress=in_progress'), ['February 2025'])
+        self.assertEqual(self.months('?progress=done'), ['March 2025'])
+
+    def test_sort_by_progress_without_per_row_queries(self):
+        # Column 2 is visual_progress (ordering='progress')
+        with CaptureQueriesContext(connection) as few:
+            months = self.months('?o=-2')
+        self.assertEqual(months, ['March 2025', 'February 2025', 'January 2025'])
+
+        for year in (2023, 2024):
+            MISReport.objects.create(billing_year=year, billing_month='March', stage1_gps_check=True)
+        with CaptureQueriesContext(connection) as more:
+            self.months('?o=-2')
+        self.assertEqual(len(more), len(few))
@@ -0,0 +1,116 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock, skipIf
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from ..models import VehicleList
+from .. import rc_worker
+
+
+# ==========================================
+# RC DOCUMENT QUEUE
+# ==========================================
+class RcWorkerTestMixin:
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        staging = mock.patch.object(rc_worker, 'STAGING_DIR', os.path.join(self.tmp, 'staging'))
+        staging.start()
+        self.addCleanup(staging.stop)
+        media = override_settings(MEDIA_ROOT=os.path.join(self.tmp, 'media'))
+        media.enable()
+        self.addCleanup(media.disable)
+        self.vehicle = VehicleList.objects.create(vehicle_no='DL1C1234', last_digit='1234')
+
+    def stage(self, name='rc.txt', content=b'scan'):
+        path = rc_worker.stage_upload(SimpleUploadedFile(name, content))
+        VehicleList.objects.filter(id=self.vehicle.id).update(rc_status='pending', rc_staged_path=path)
+        return path
+
+
+class SubmitUploadTests(RcWorkerTestMixin, TestCase):
+
+    def test_upload_is_staged_and_queued_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            status = rc_worker.submit_upload(self.vehicle.id, SimpleUploadedFile('rc.pdf', b'%PDF'))
+        self.assertEqual(status, 'pending')
+        self.assertEqual(len(callbacks), 1)
+
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.rc_status, 'pending')
+        self.assertIsNotNone(self.vehicle.rc_queued_at)
+        self.assertTrue(self.vehicle.rc_staged_path.endswith('.pdf'))
+        with open(self.vehicle.rc_staged_path, 'rb') as f:
+            self.assertEqual(f.read(), b'%PDF')
+
+    def test_staged_file_is_removed_when_queueing_fails(self):
+        with mock.patch.object(rc_worker, 'enqueue', side_effect=RuntimeError('down')):
+            with self.assertRaises(RuntimeError):
+                rc_worker.submit_upload(self.vehicle.id, SimpleUploadedFile('rc.pdf', b'%PDF'))
+        self.assertEqual(os.listdir(rc_worker.STAGING_DIR), [])
+
+
+class ProcessVehicleTests(RcWorkerTestMixin, TransactionTestCase):
+
+    def test_staged_file_moves_to_storage(self):
+        staged = self.stage()
+        self.assertIs(rc_worker.process_vehicle(self.vehicle.id), True)
+
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.rc_status, 'done')
+        self.assertEqual(self.vehicle.rc_staged_path, '')
+        self.assertFalse(self.vehicle.rc_thumbnail)  # no preview for this file type
+        self.assertFalse(os.path.exists(staged))
+        with self.vehicle.rc_document.open('rb') as f:
+            self.assertEqual(f.read(), b'scan')
+
+    def test_second_call_does_nothing(self):
+        self.stage()
+        rc_worker.process_vehicle(self.vehicle.id)
+        self.assertIsNone(rc_worker.process_vehicle(self.vehicle.id))
+
+    def test_missing_staged_file_fails_the_row(self):
+        os.remove(self.stage())
+        self.assertIs(rc_worker.process_vehicle(self.vehicle.id), False)
+        self.vehicle.refresh_from_db()
+        self.assertEqual(self.vehicle.rc_status, 'failed')
+        self.assertTrue(self.vehicle.rc_error)
+
+    @skipIf(rc_worker.Image is None, "Pillow is not installed")
+    def test_image_gets_a_thumbnail(self):
+        buffer = io.BytesIO()
+        rc_worker.Image.new('RGB', (1000, 800), 'white').save(buffer, format='PNG')
+        self.stage('rc.png', buffer.getvalue())
+        rc_worker.process_vehicle(self.vehicle.id)
+        self.vehicle.refresh_from_db()
+        with rc_worker.Image.open(self.vehicle.rc_thumbnail.path) as thumb:
+            self.assertEqual(thumb.size, (320, 256))
+
+    def test_sweep_picks_up_pending_stale_and_failed_rows(self):
+        self.stage()
+        stuck = VehicleList.objects.create(vehicle_no='DL1C5678', last_digit='5678')
+        fresh = VehicleList.objects.create(vehicle_no='DL1C9012', last_digit='9012')
+        broken = VehicleList.objects.create(vehicle_no='DL1C3456', last_digit='3456')
+        for row, started in ((stuck, timezone.now() - timedelta(hours=1)), (fresh, timezone.now())):
+            path = rc_worker.stage_upload(SimpleUploadedFile('rc.txt', b'scan'))
+            VehicleList.objects.filter(id=row.id).update(
+                rc_status='processing', rc_started_at=started, rc_staged_path=path,
+            )
+        VehicleList.objects.filter(id=broken.id).update(
+            rc_status='failed', rc_staged_path=os.path.join(self.tmp, 'gone.txt'),
+        )
+
+        self.assertEqual(rc_worker.sweep(), {"processed": 2, "failed": 0, "skipped": 0})
+        self.assertEqual(rc_worker.sweep(retry_failed=True), {"processed": 0, "failed": 1, "skipped": 0})
+        statuses = dict(VehicleList.objects.values_list('vehicle_no', 'rc_status'))
+        self.assertEqual(statuses, {
+            'DL1C1234': 'done', 'DL1C5678': 'done', 'DL1C9012': 'processing', 'DL1C3456': 'failed',
+        })
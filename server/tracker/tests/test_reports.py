@@ -0,0 +1,30 @@
+from django.test import Client, TestCase
+
+from ..models import MISReport
+
+
+# ==========================================
+# DASHBOARD RANGES
+# ==========================================
+class ReportRangeTests(TestCase):
+
+    def setUp(self):
+        MISReport.objects.create(billing_year=2024, billing_month='October', final_mis_status=True)
+        MISReport.objects.create(billing_year=2024, billing_month='December', stage1_gps_check=True)
+        MISReport.objects.create(billing_year=2025, billing_month='January', stage2_locality_set=True)
+        MISReport.objects.create(billing_year=2025, billing_month='March')
+
+    def test_range_spans_the_year_boundary(self):
+        months = Client().get('/api/dashboard-range/', {'from': '2024-11', 'to': '2025-02'}).json()['months']
+        self.assertEqual([(m['month'], m['year']) for m in months], [
+            ('November', 2024), ('December', 2024), ('January', 2025), ('February', 2025),
+        ])
+        self.assertEqual([m['data']['found'] for m in months], [False, True, True, False])
+        self.assertTrue(months[1]['data']['stage1']['gps'])
+        self.assertEqual(months[2]['data']['progress'], 12)
+
+    def test_dashboard_data_previous_month_crosses_the_year(self):
+        data = Client().get('/api/dashboard-data/', {'year': 2025, 'month': 1}).json()
+        self.assertEqual((data['previous']['month'], data['previous']['year']), ('December', 2024))
+        self.assertTrue(data['current']['data']['stage2']['locality'])
+        self.assertTrue(data['previous']['data']['stage1']['gps'])
@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.test import TestCase
+
+from ..models import T3BillingKM, T3BillingZone
+from .. import resolver
+from .helpers import make_master
+
+
+# ==========================================
+# LOCALITY -> ZONE -> KM RESOLVER
+# ==========================================
+class ResolverTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        resolver.resolver._snapshot = None
+
+    def test_lookups_ignore_case_and_spacing(self):
+        master = resolver.resolver.current()
+        self.assertEqual(master.resolve('  mahipalpur '), ('South', 10.0))
+        self.assertEqual(master.km_for('SOUTH'), 10.0)
+        self.assertEqual(master.resolve('Atlantis'), ('-', '-'))
+
+    def test_snapshot_reused_until_a_master_edit(self):
+        first = resolver.resolver.current()
+        self.assertIs(resolver.resolver.current(), first)
+
+        T3BillingZone.objects.create(t3_locality='Dwarka', t3_billing_zone='West')
+        T3BillingKM.objects.create(t3_billing_zone='West', t3_billing_km=22)
+        second = resolver.resolver.current()
+        self.assertGreater(second.version, first.version)
+        self.assertEqual(second.resolve('Dwarka'), ('West', 22.0))
+
+    def test_rolled_back_edit_keeps_the_version(self):
+        version = resolver.get_master_version()
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                T3BillingZone.objects.create(t3_locality='Dwarka', t3_billing_zone='West')
+                raise RuntimeError
+        self.assertEqual(resolver.get_master_version(), version)
+        self.assertEqual(resolver.resolver.current().zone_for('Dwarka'), '-')
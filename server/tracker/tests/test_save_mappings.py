@@ -0,0 +1,66 @@
+import json
+
+from django.test import Client, TestCase
+
+from ..models import LocalityClaim, T3LocalityBilling
+from .. import claims, counters
+from .helpers import make_master, make_addresses, real_pending
+
+
+# ==========================================
+# BATCH SAVE (save-mappings)
+# ==========================================
+class SaveMappingsTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        self.ids = make_addresses(4)
+        counters.recount_pending()
+
+    def save(self, mappings):
+        return Client().post('/api/save-mappings/', json.dumps({'mappings': mappings}),
+                             content_type='application/json')
+
+    def test_returns_resolved_rows_and_materializes_them(self):
+        data = self.save([{'address_id': pk, 'locality': 'Saket'} for pk in self.ids[:3]]).json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['results'][0], {
+            'id': self.ids[0], 'address': 'House 0 near Mahipalpur metro', 'locality': 'Saket',
+            'locality_id': 'Saket', 'billing_zone': 'South', 'billing_km': 10, 'status': 'Done',
+        })
+        self.assertEqual(T3LocalityBilling.objects.filter(billing_zone='South').count(), 3)
+        self.assertEqual(counters.pending_count(), real_pending())
+        self.assertEqual(real_pending(), 1)
+
+    def test_remapping_does_not_touch_the_pending_count(self):
+        self.save([{'address_id': self.ids[0], 'locality': 'Saket'}])
+        self.save([{'address_id': self.ids[0], 'locality': 'Mahipalpur'}])
+        self.assertEqual(counters.pending_count(), real_pending())
+
+    def test_repeated_ids_keep_the_last_pair(self):
+        data = self.save([
+            {'address_id': self.ids[0], 'locality': 'Saket'},
+            {'address_id': self.ids[0], 'locality': 'Mahipalpur'},
+        ]).json()
+        self.assertEqual([row['locality'] for row in data['results']], ['Mahipalpur'])
+
+    def test_bad_pairs_are_reported_not_fatal(self):
+        data = self.save([
+            {'address_id': self.ids[0], 'locality': 'Saket'},
+            {'address_id': self.ids[1], 'locality': ''},
+            {'address_id': 999999, 'locality': 'Saket'},
+        ]).json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(
+            [(e['address_id'], e['error']) for e in data['errors']],
+            [(self.ids[1], 'Missing ID or Locality'), (999999, 'Address not found')],
+        )
+
+    def test_saved_rows_release_their_claims(self):
+        claimed = claims.claim_pending('alice', batch_size=2)
+        self.save([{'address_id': claimed[0]['id'], 'locality': 'Saket'}])
+        self.assertEqual(list(LocalityClaim.objects.values_list('address_id', flat=True)), [claimed[1]['id']])
+
+    def test_batch_size_is_limited(self):
+        response = self.save([{'address_id': 1, 'locality': 'Saket'}] * 501)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test import Client, TestCase
+
+from ..models import T3Locality
+from .. import search
+from .helpers import make_addresses
+
+
+# ==========================================
+# ADDRESS SEARCH (trigram / FTS5)
+# ==========================================
+class AddressSearchTests(TestCase):
+
+    def setUp(self):
+        make_addresses(1, address='Flat {} Press Enclave, Saket')
+        make_addresses(1, address='H.No {} near MAHIPALPUR metro')
+        make_addresses(1, locality='Mahipalpur', address='Plot {} Aerocity')
+        self.ids = {row.address: row.id for row in T3Locality.objects.all()}
+
+    def found(self, query, **kwargs):
+        return set(
+            search.search_addresses(T3Locality.objects.all(), query, **kwargs)
+            .values_list('address', flat=True)
+        )
+
+    def test_substring_in_any_case(self):
+        self.assertEqual(self.found('press encl'), {'Flat 0 Press Enclave, Saket'})
+        self.assertEqual(self.found('Mahipalpur'), {'H.No 0 near MAHIPALPUR metro'})
+
+    def test_locality_column_when_asked(self):
+        self.assertEqual(self.found('mahipalpur', fields=('address', 't3_locality')), {
+            'H.No 0 near MAHIPALPUR metro', 'Plot 0 Aerocity',
+        })
+
+    def test_short_terms_and_quotes(self):
+        self.assertEqual(self.found('H.'), {'H.No 0 near MAHIPALPUR metro'})
+        self.assertEqual(self.found('"enclave'), set())
+
+    def test_follows_edits(self):
+        T3Locality.objects.filter(address='Plot 0 Aerocity').update(address='Plot 0 Vasant Kunj')
+        self.assertEqual(self.found('aerocity'), set())
+        self.assertEqual(self.found('vasant'), {'Plot 0 Vasant Kunj'})
+
+    def test_uses_the_index(self):
+        queryset = search.search_addresses(T3Locality.objects.all(), 'enclave')
+        sql = str(queryset.query)
+        if connection.vendor == 'postgresql':
+            self.assertIn('ILIKE', sql)
+        else:
+            self.assertIn(search.FTS_TABLE, sql)
+
+    def test_search_pending_endpoint(self):
+        results = Client().get('/api/search-pending/', {'q': 'MAHIPALPUR', 'order': 'rank'}).json()['results']
+        self.assertEqual([row['id'] for row in results], [self.ids['H.No 0 near MAHIPALPUR metro']])
@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+from django.test import Client, SimpleTestCase, TestCase
+
+from ..models import T3BillingZone, LocalityCentroid
+from .. import resolver, spatial
+from .helpers import make_master
+
+
+# ==========================================
+# SPATIAL GRID CACHE
+# ==========================================
+class CentroidVersionTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        # Versions restart with every rolled-back test; drop the worker cache
+        spatial._cached.update(grid=None, version=None)
+
+    def test_centroid_edit_rebuilds_grid_not_master(self):
+        master_version = resolver.get_master_version()
+        self.assertEqual(len(spatial.get_grid()), 0)
+
+        LocalityCentroid.objects.create(
+            locality=T3BillingZone.objects.get(t3_locality='Saket'), latitude=28.52, longitude=77.21,
+        )
+        self.assertEqual(resolver.get_master_version(), master_version)
+        self.assertEqual(spatial.get_grid().lookup([28.521], [77.211])[0]['locality'], 'Saket')
+
+    def test_master_edit_rebuilds_grid(self):
+        saket = T3BillingZone.objects.get(t3_locality='Saket')
+        LocalityCentroid.objects.create(locality=saket, latitude=28.52, longitude=77.21)
+        spatial.get_grid()
+
+        saket.t3_billing_zone = 'West'
+        saket.save()
+        self.assertEqual(spatial.get_grid().zones, ['West'])
+
+
+class NearestLookupTests(SimpleTestCase):
+
+    def test_grid_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        lat = 28.4 + rng.random(500) * 0.4
+        lng = 76.9 + rng.random(500) * 0.5
+        grid = spatial.LocalityGrid([f'L{i}' for i in range(500)], ['Z'] * 500, lat, lng)
+
+        q_lat = 28.4 + rng.random(2000) * 0.4
+        q_lng = 76.9 + rng.random(2000) * 0.5
+        idx, dist = grid.nearest(q_lat, q_lng)
+
+        # Same ranking as comparing every centroid (equirectangular, like the grid)
+        d2 = (lat[None, :] - q_lat[:, None]) ** 2 + ((lng[None, :] - q_lng[:, None]) * grid.lng_scale) ** 2
+        np.testing.assert_array_equal(idx, d2.argmin(axis=1))
+        all_km = spatial.haversine_km(q_lat[:, None], q_lng[:, None], lat[None, :], lng[None, :])
+        np.testing.assert_allclose(dist, all_km.min(axis=1), atol=0.01)
+
+    def test_points_out_of_reach_have_no_locality(self):
+        grid = spatial.LocalityGrid.build([('Saket', 'South', 28.52, 77.21)])
+        hit, far, broken = grid.lookup([28.521, 29.5, np.nan], [77.211, 77.21, 77.21])
+        self.assertEqual(hit['locality'], 'Saket')
+        self.assertEqual(hit['billing_zone'], 'South')
+        self.assertEqual(far, {'locality': '-', 'billing_zone': '-', 'distance_km': None})
+        self.assertEqual(broken['locality'], '-')
+
+    def test_distance_to_named_locality(self):
+        grid = spatial.LocalityGrid.build([('Saket', 'South', 28.52, 77.21)])
+        km = grid.distance_to(['saket', 'Nowhere'], [28.53, 28.53], [77.21, 77.21])
+        self.assertAlmostEqual(km[0], 1.112, places=3)
+        self.assertTrue(np.isnan(km[1]))
+
+
+class NearestLocalityApiTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        spatial._cached.update(grid=None, version=None)
+
+    def post(self, body):
+        return Client().post('/api/nearest-locality/', body, content_type='application/json')
+
+    def test_points_resolve_to_locality_and_zone(self):
+        LocalityCentroid.objects.create(
+            locality=T3BillingZone.objects.get(t3_locality='Saket'), latitude=28.52, longitude=77.21,
+        )
+        data = self.post(json.dumps({'points': [[28.521, 77.211]]})).json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['results'][0]['locality'], 'Saket')
+        self.assertEqual(data['results'][0]['billing_zone'], 'South')
+
+    def test_no_centroids_and_bad_points(self):
+        self.assertEqual(self.post(json.dumps({'points': [[28.5, 77.2]]})).json()['error'],
+                         'No locality centroids loaded')
+        self.assertEqual(self.post(json.dumps({'points': [['x']]})).status_code, 400)
@@ -0,0 +1,34 @@
+from unittest import mock
+
+from django.test import Client, TestCase
+
+from .. import resolver, suggest
+from .helpers import make_master, make_addresses
+
+
+# ==========================================
+# SUGGESTIONS
+# ==========================================
+class SuggestTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        make_addresses(4, locality='Mahipalpur', address='House {} Mahipalpur Extension')
+        self.pending = make_addresses(3, address='Plot {} Mahipalpur Extension')
+        suggest._cached.update(index=None, version=None)
+
+    def test_suggests_from_mapped_addresses(self):
+        response = Client().get('/api/suggest-locality/', {'address_id': self.pending[0]})
+        self.assertEqual(response.json()['suggestions'][0]['locality'], 'Mahipalpur')
+        self.assertEqual(response.json()['suggestions'][0]['billing_zone'], 'South')
+
+    def test_bad_address_id(self):
+        self.assertEqual(Client().get('/api/suggest-locality/', {'address_id': 'abc'}).status_code, 400)
+        self.assertEqual(Client().get('/api/suggest-locality/', {'address_id': 0}).status_code, 404)
+
+    def test_next_pending_reads_the_master_version_once(self):
+        suggest.get_index()
+        with mock.patch.object(resolver.resolver, 'current', wraps=resolver.resolver.current) as current:
+            data = Client().get('/api/next-pending/', {'operator': 'op-a'}).json()
+        self.assertEqual(len(data['prefetch']), 2)
+        self.assertEqual(current.call_count, 1)
@@ -0,0 +1,100 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase
+
+from ..models import MISReport, TrackSummary
+from .. import tracks as tracks_module
+
+
+# ==========================================
+# TRACK UPLOADS
+# ==========================================
+class TrackTimeTests(TestCase):
+
+    def setUp(self):
+        MISReport.objects.create(billing_year=2025, billing_month='March')
+
+    def upload(self, name, content):
+        return Client().post('/api/upload-tracks/', {
+            'file': SimpleUploadedFile(name, content), 'year': '2025', 'month': '3',
+        })
+
+    def test_out_of_range_epoch_drops_the_time_not_the_upload(self):
+        response = self.upload('trips.csv', (
+            b"trip_id,lat,lng,timestamp\n"
+            b"t1,28.50,77.10,1741651200\n"
+            b"t1,28.51,77.10,1e20\n"
+            b"t1,28.52,77.10,inf\n"
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['points'], 3)
+        track = TrackSummary.objects.get()
+        self.assertEqual(track.started_at, track.ended_at)
+        self.assertEqual(track.stage, 2)
+
+
+GPX = b"""<?xml version="1.0"?>
+<gpx xmlns="http://www.topografix.com/GPX/1/1" version="1.1">
+  <wpt lat="28.0" lon="77.0"><name>depot</name></wpt>
+  <trk><name>DL1C-1234</name><trkseg>
+    <trkpt lat="28.50" lon="77.10"><time>2025-03-12T08:00:00Z</time></trkpt>
+    <trkpt lat="28.51" lon="77.10"><time>2025-03-12T08:10:00Z</time></trkpt>
+  </trkseg></trk>
+  <trk><trkseg>
+    <trkpt lat="28.50" lon="77.10"><time>2025-03-25T09:00:00Z</time></trkpt>
+  </trkseg></trk>
+  <trk><name>empty</name><trkseg/></trk>
+  <rte><name>DL1C-1234</name>
+    <rtept lat="28.50" lon="77.10"/><rtept lat="28.52" lon="77.10"/>
+  </rte>
+</gpx>
+"""
+
+
+class TrackParsingTests(TestCase):
+
+    def setUp(self):
+        self.report = MISReport.objects.create(billing_year=2025, billing_month='March')
+
+    def test_gpx_tracks_and_routes(self):
+        tracks = {t.name: t for t in tracks_module.iter_gpx_tracks(io.BytesIO(GPX))}
+        self.assertEqual(sorted(tracks), ['DL1C-1234', 'empty', 'track-2'])
+        first = next(tracks_module.iter_gpx_tracks(io.BytesIO(GPX)))
+        self.assertEqual(first.points, 2)
+        self.assertAlmostEqual(first.distance_km, 1.112, places=3)
+        self.assertEqual(first.duration_seconds, 600)
+
+    def test_gpx_upload_files_tracks_by_stage(self):
+        stats = tracks_module.summarize_tracks(io.BytesIO(GPX), 'march.gpx', self.report)
+        self.assertEqual((stats['tracks'], stats['points'], stats['skipped']), (3, 5, 1))
+        rows = {t.track_name: t for t in TrackSummary.objects.all()}
+        self.assertEqual(rows['DL1C-1234'].stage, 2)
+        self.assertEqual(rows['track-2'].stage, 3)
+        # The route shares the track's name and no time: kept apart, stage 1
+        self.assertEqual(rows['DL1C-1234 #2'].stage, 1)
+        self.assertEqual(rows['DL1C-1234 #2'].distance_km, 2.224)
+
+    def test_interleaved_csv_trips(self):
+        csv = (b"Vehicle_No,Latitude,Longitude,Time\n"
+               b"A,28.50,77.10,2025-03-02T08:00:00\n"
+               b"B,28.60,77.20,2025-03-02T09:00:00\n"
+               b"A,28.51,77.10,2025-03-02T08:05:00\n"
+               b"B,999,77.20,2025-03-02T09:05:00\n"
+               b"B,28.61,77.20,2025-03-02T09:10:00\n")
+        tracks = {t.name: t for t in tracks_module.iter_csv_tracks(io.BytesIO(csv))}
+        self.assertEqual(tracks['A'].points, 2)
+        self.assertEqual(tracks['B'].points, 2)
+        self.assertAlmostEqual(tracks['B'].distance_km, 1.112, places=3)
+        self.assertEqual(tracks['B'].duration_seconds, 600)
+
+    def test_reupload_replaces_the_summary(self):
+        csv = b"trip_id,lat,lng\nA,28.50,77.10\nA,28.51,77.10\n"
+        tracks_module.summarize_tracks(io.BytesIO(csv), 'a.csv', self.report, stage=1)
+        tracks_module.summarize_tracks(io.BytesIO(csv + b"A,28.52,77.10\n"), 'b.csv', self.report, stage=1)
+        track = TrackSummary.objects.get()
+        self.assertEqual((track.points, track.source_file), (3, 'b.csv'))
+
+    def test_csv_without_coordinates_is_rejected(self):
+        with self.assertRaises(ValueError):
+            list(tracks_module.iter_csv_tracks(io.BytesIO(b"trip_id,x,y\nA,1,2\n")))
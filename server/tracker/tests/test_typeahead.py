@@ -0,0 +1,35 @@
+import json
+
+from django.test import Client, TestCase
+
+from ..models import T3Locality
+from .helpers import make_master, make_addresses
+
+
+# ==========================================
+# CANONICAL LOCALITY SPELLING
+# ==========================================
+class CanonicalNameTests(TestCase):
+
+    def setUp(self):
+        make_master()
+        self.ids = make_addresses(3)
+        self.client = Client()
+
+    def post(self, url, body):
+        return self.client.post(url, json.dumps(body), content_type='application/json')
+
+    def test_save_mappings_stores_master_spelling(self):
+        response = self.post('/api/save-mappings/', {'mappings': [
+            {'address_id': self.ids[0], 'locality': ' mahipalpur '},
+            {'address_id': self.ids[1], 'locality': 'Mahipalpur Extn'},
+        ]})
+        data = response.json()
+        self.assertEqual([row['locality'] for row in data['results']], ['Mahipalpur'])
+        self.assertEqual(data['errors'][0]['address_id'], self.ids[1])
+        self.assertEqual(T3Locality.objects.get(id=self.ids[0]).t3_locality, 'Mahipalpur')
+
+    def test_bulk_save_stores_master_spelling(self):
+        response = self.post('/api/bulk-save/', {'address_ids': self.ids, 'locality_id': 'SAKET'})
+        self.assertEqual(response.json()['count'], 3)
+        self.assertEqual(T3Locality.objects.filter(t3_locality='Saket').count(), 3)
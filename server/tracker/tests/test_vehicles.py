@@ -0,0 +1,95 @@
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+
+from ..models import VehicleList
+from .. import vehicles
+
+
+# ==========================================
+# VEHICLE ROSTER IMPORT
+# ==========================================
+class VehicleImportTests(TestCase):
+
+    def import_csv(self, content, dry_run=False):
+        return vehicles.import_vehicles(io.BytesIO(content), 'roster.csv', dry_run=dry_run)
+
+    def test_creates_updates_and_reports_bad_rows(self):
+        VehicleList.objects.create(vehicle_no='DL01 AB1234', cab_type='Sedan')
+        stats = self.import_csv(
+            b"Vehicle Number,Mobile,Type\n"
+            b" dl01  ab1234,+91 98100 00001,SUV\n"
+            b"HR26 CD5678,9810000002,Sedan\n"
+            b"hr26 cd5678,9810000003,Sedan\n"
+            b"NOPLATE,9810000004,Sedan\n"
+            b"UP16 EF9012,12345,Sedan\n"
+        )
+        self.assertEqual((stats['rows'], stats['created'], stats['updated'], stats['error_count']), (5, 1, 1, 3))
+        self.assertEqual([e['row'] for e in stats['errors']], [4, 5, 6])
+
+        updated = VehicleList.objects.get(vehicle_no='DL01 AB1234')
+        self.assertEqual((updated.contact_no, updated.cab_type, updated.last_digit), ('9810000001', 'SUV', '1234'))
+        self.assertEqual(VehicleList.objects.count(), 2)
+
+    def test_blank_cells_keep_stored_values(self):
+        VehicleList.objects.create(vehicle_no='DL01 AB1234', contact_no='9810000001', cab_type='Sedan')
+        VehicleList.objects.create(vehicle_no='HR26 CD5678', contact_no='9810000002', cab_type='Sedan')
+        stats = self.import_csv(
+            b"vehicle_no,contact_no,cab_type,ownership\n"
+            b"DL01 AB1234,,SUV,Vendor A\n"
+            b"HR26 CD5678,9810000009,,\n"
+        )
+        self.assertEqual(stats['updated'], 2)
+        self.assertEqual(
+            list(VehicleList.objects.order_by('vehicle_no').values_list('contact_no', 'cab_type', 'vehicle_ownership')),
+            [('9810000001', 'SUV', 'Vendor A'), ('9810000009', 'Sedan', None)],
+        )
+
+    def test_dry_run_writes_nothing(self):
+        stats = self.import_csv(b"vehicle_no\nDL01 AB1234\n", dry_run=True)
+        self.assertEqual(stats['valid'], 1)
+        self.assertFalse(VehicleList.objects.exists())
+
+
+class VehicleListApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            VehicleList.objects.create(vehicle_no=f'DL1C{1000 + i}', contact_no=f'98100000{i:02d}',
+                                       rc_document=f'vehicle_rc/rc{i}.pdf')
+
+    def get(self, **params):
+        return Client().get('/api/vehicles/', params).json()
+
+    def test_pages_newest_first(self):
+        first = self.get(page_size=3)
+        second = self.get(page_size=3, after=first['pagination']['next_cursor'])
+        self.assertEqual([v['vehicle_no'] for v in first['results']], ['DL1C1004', 'DL1C1003', 'DL1C1002'])
+        self.assertEqual([v['vehicle_no'] for v in second['results']], ['DL1C1001', 'DL1C1000'])
+        self.assertFalse(second['pagination']['has_more'])
+
+    def test_search_on_number_and_contact(self):
+        self.assertEqual([v['vehicle_no'] for v in self.get(search='c1003')['results']], ['DL1C1003'])
+        self.assertEqual([v['contact_no'] for v in self.get(search='0001')['results']], ['9810000001'])
+
+    def test_bad_cursor(self):
+        self.assertEqual(Client().get('/api/vehicles/', {'after': 'x'}).status_code, 400)
+
+    def test_rc_urls_are_signed_once(self):
+        storage = VehicleList._meta.get_field('rc_document').storage
+        with mock.patch.object(storage, 'url', side_effect=lambda name: f'https://signed/{name}') as url:
+            first = self.get()
+            second = self.get()
+        self.assertEqual(url.call_count, 5)
+        self.assertEqual(first['results'], second['results'])
+        self.assertEqual(first['results'][0]['rc_document'], 'https://signed/vehicle_rc/rc4.pdf')
+        self.assertIsNone(first['results'][0]['rc_thumbnail'])
+
+    def test_deleted_vehicle_drops_its_cached_url(self):
+        self.get()
+        VehicleList.objects.get(vehicle_no='DL1C1000').delete()
+        self.assertIsNone(cache.get(vehicles.RC_URL_KEY.format('vehicle_rc/rc0.pdf')))
+        self.assertIsNotNone(cache.get(vehicles.RC_URL_KEY.format('vehicle_rc/rc1.pdf')))
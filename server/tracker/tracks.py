@@ -0,0 +1,229 @@
+import csv
+import io
+import math
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+
+from .models import TrackSummary
+from .gps import LAT_COLUMNS, LNG_COLUMNS, TRIP_COLUMNS, TIME_COLUMNS
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Finished tracks are written in batches of this size
+SUMMARY_BATCH = 500
+
+
+# ==========================================
+# 1. RUNNING TOTALS PER TRACK
+# ==========================================
+def _haversine_km(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((p2 - p1) / 2) ** 2
+         + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _parse_time(value):
+    """ISO-8601 (GPX <time>) or epoch seconds -> aware datetime, None if unusable."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            return datetime.fromtimestamp(float(value), tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            # Epochs beyond datetime's range (1e20, inf) are as unusable as text
+            return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+class TrackTotals:
+    """Distance / duration of one track, updated point by point (O(1) memory)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.points = 0
+        self.distance_km = 0.0
+        self.started_at = None
+        self.ended_at = None
+        self._last = None
+
+    def add(self, lat, lng, when=None):
+        if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return
+        if self._last is not None:
+            self.distance_km += _haversine_km(self._last[0], self._last[1], lat, lng)
+        self._last = (lat, lng)
+        self.points += 1
+        if when is not None:
+            if self.started_at is None or when < self.started_at:
+                self.started_at = when
+            if self.ended_at is None or when > self.ended_at:
+                self.ended_at = when
+
+    @property
+    def duration_seconds(self):
+        if self.started_at and self.ended_at:
+            return int((self.ended_at - self.started_at).total_seconds())
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+# ==========================================
+# 2. STREAMING READERS
+# ==========================================
+def iter_gpx_tracks(fileobj):
+    """
+    Yields TrackTotals for every <trk> (and <rte>) in a GPX file using
+    iterparse; each point is dropped from the tree as soon as it is counted,
+    so memory stays flat however many vehicles the dump holds.
+    """
+    stack = []
+    current = None
+    unnamed = 0
+
+    for event, elem in ET.iterparse(fileobj, events=('start', 'end')):
+        tag = _local(elem.tag)
+
+        if event == 'start':
+            stack.append(elem)
+            if tag in ('trk', 'rte'):
+                unnamed += 1
+                current = TrackTotals(f"track-{unnamed}")
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        if tag == 'name' and current is not None and parent is not None and _local(parent.tag) in ('trk', 'rte'):
+            if elem.text and elem.text.strip():
+                current.name = elem.text.strip()
+        elif tag in ('trkpt', 'rtept') and current is not None:
+            when = next((child.text for child in elem if _local(child.tag) == 'time'), None)
+            current.add(_to_float(elem.get('lat')), _to_float(elem.get('lon')), _parse_time(when))
+            parent.remove(elem)
+        elif tag in ('trk', 'rte') and current is not None:
+            yield current
+            current = None
+
+        # Finished top-level elements (tracks, waypoints, metadata) leave the tree
+        if len(stack) == 1:
+            parent.remove(elem)
+
+
+def iter_csv_tracks(fileobj):
+    """
+    Yields TrackTotals per trip from a CSV of points (lat/lng + optional
+    trip_id and timestamp). Rows of different trips may be interleaved;
+    only one running total per trip is kept.
+    """
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    fields = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+
+    def column(options):
+        return next((fields[c] for c in options if c in fields), None)
+
+    lat_col, lng_col = column(LAT_COLUMNS), column(LNG_COLUMNS)
+    if not lat_col or not lng_col:
+        raise ValueError("CSV needs latitude and longitude columns")
+    trip_col, time_col = column(TRIP_COLUMNS), column(TIME_COLUMNS)
+
+    tracks = {}
+    for row in reader:
+        name = (row.get(trip_col) if trip_col else None) or 'track-1'
+        totals = tracks.get(name)
+        if totals is None:
+            totals = tracks[name] = TrackTotals(name)
+        totals.add(
+            _to_float(row.get(lat_col)), _to_float(row.get(lng_col)),
+            _parse_time(row.get(time_col)) if time_col else None,
+        )
+    yield from tracks.values()
+
+
+# ==========================================
+# 3. PIPELINE
+# ==========================================
+def stage_for(when):
+    """MIS stage of a date: 1st-10th -> 1, 11th-20th -> 2, 21st-end -> 3."""
+    if when is None:
+        return None
+    return 1 if when.day <= 10 else 2 if when.day <= 20 else 3
+
+
+def _save(batch):
+    TrackSummary.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['report', 'stage', 'track_name'],
+        update_fields=['source_file', 'points', 'distance_km', 'started_at',
+                       'ended_at', 'duration_seconds', 'uploaded_at'],
+    )
+
+
+def summarize_tracks(fileobj, filename, report, stage=None):
+    """
+    Streams a GPX or CSV track file into TrackSummary rows for `report`.
+
+    Without an explicit `stage`, each track is filed under the stage its
+    first timestamp falls in (tracks with no time go to stage 1). Re-uploading
+    a track replaces its summary. Returns upload stats.
+    """
+    started = time.monotonic()
+    is_gpx = filename.lower().endswith('.gpx')
+    tracks = iter_gpx_tracks(fileobj) if is_gpx else iter_csv_tracks(fileobj)
+
+    stats = {"tracks": 0, "points": 0, "distance_km": 0.0, "skipped": 0}
+    now = timezone.now()
+    batch = []
+    seen = {}
+    for totals in tracks:
+        if not totals.points:
+            stats["skipped"] += 1
+            continue
+        # Same name twice in one file (split tracks): keep both
+        seen[totals.name] = seen.get(totals.name, 0) + 1
+        if seen[totals.name] > 1:
+            totals.name = f"{totals.name} #{seen[totals.name]}"
+        batch.append(TrackSummary(
+            report=report,
+            stage=stage or stage_for(totals.started_at) or 1,
+            track_name=totals.name[:255],
+            source_file=filename[:255],
+            points=totals.points,
+            distance_km=round(totals.distance_km, 3),
+            started_at=totals.started_at,
+            ended_at=totals.ended_at,
+            duration_seconds=totals.duration_seconds,
+            uploaded_at=now,
+        ))
+        stats["tracks"] += 1
+        stats["points"] += totals.points
+        stats["distance_km"] += totals.distance_km
+        if len(batch) >= SUMMARY_BATCH:
+            _save(batch)
+            batch = []
+    if batch:
+        _save(batch)
+
+    stats["distance_km"] = round(stats["distance_km"], 3)
+    stats["seconds"] = round(time.monotonic() - started, 2)
+    return stats
@@ -4,12 +4,19 @@ from . import views
 urlpatterns = [
     # --- Dashboard & Reports ---
     path('dashboard-data/', views.dashboard_data, name='dashboard_data'),
+    path('dashboard-range/', views.dashboard_range, name='dashboard_range'),
 
     # --- Locality Manager ---
     path('localities/', views.locality_list_api, name='locality_list_api'),
     path('dropdown-localities/', views.dropdown_localities, name='dropdown_localities'),
+    path('locality-typeahead/', views.locality_typeahead, name='locality_typeahead'),
+    path('master-zones/', views.master_zones, name='master_zones'),
     path('next-pending/', views.next_pending, name='next_pending'),
+    path('claim-pending/', views.claim_pending_batch, name='claim_pending_batch'),
+    path('release-claims/', views.release_claims, name='release_claims'),
+    path('suggest-locality/', views.suggest_locality, name='suggest_locality'),
     path('save-mapping/', views.save_mapping, name='save_mapping'),
+    path('save-mappings/', views.save_mappings, name='save_mappings'),
     
     # --- Bulk Operations ---
     path('search-pending/', views.search_pending_addresses, name='search_pending_addresses'),
@@ -17,8 +24,22 @@ urlpatterns = [
 
     # --- Add New Master Locality (Tab 3) ---
     path('add-master-locality/', views.add_master_locality, name='add_master_locality'),
+    path('upload-addresses/', views.upload_addresses, name='upload_addresses'),
+
+    # --- Billing Reports ---
+    path('zone-summary/', views.zone_summary, name='zone_summary'),
+    path('export-localities/', views.export_localities, name='export_localities'),
 
     # --- NEW: VEHICLE MANAGEMENT (Add these lines!) ---
     path('vehicles/', views.get_vehicle_list, name='get_vehicle_list'),
     path('add-vehicle/', views.add_vehicle, name='add_vehicle'),
+    path('import-vehicles/', views.import_vehicles, name='import_vehicles'),
+
+    # --- GPS Checker ---
+    path('validate-gps/', views.validate_gps, name='validate_gps'),
+    path('upload-tracks/', views.upload_tracks, name='upload_tracks'),
+    path('nearest-locality/', views.nearest_locality, name='nearest_locality'),
+
+    # --- Monitoring ---
+    path('db-stats/', views.db_stats, name='db_stats'),
 ]
\ No newline at end of file
@@ -0,0 +1,234 @@
+import csv
+import io
+import re
+from collections import defaultdict
+from itertools import chain
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from .models import VehicleList
+
+# Signed S3/Supabase URLs expire (1 hour by default); cache them for less
+RC_URL_TTL = getattr(settings, 'RC_URL_CACHE_SECONDS', 3000)
+RC_URL_KEY = 'tracker:rc_url:{}'
+
+# Columns the vehicle screen shows (no model instances needed)
+LIST_FIELDS = (
+    'id', 'vehicle_no', 'contact_no', 'vehicle_ownership', 'cab_type',
+    'rc_document', 'rc_thumbnail', 'rc_status',
+)
+
+# Bulk import: header names accepted per field (case-insensitive)
+IMPORT_COLUMNS = {
+    'vehicle_no': ('vehicle_no', 'vehicle no', 'vehicle number', 'vehicle', 'cab_no', 'cab no'),
+    'contact_no': ('contact_no', 'contact no', 'contact', 'mobile', 'phone'),
+    'cab_type': ('cab_type', 'cab type', 'type'),
+    'vehicle_ownership': ('vehicle_ownership', 'ownership', 'owner', 'vendor'),
+}
+IMPORT_BATCH = 1000
+# Errors listed in the response; the total is always reported
+MAX_IMPORT_ERRORS = 500
+
+
+def vehicle_queryset(search=''):
+    """Projected vehicle rows, optionally filtered on vehicle_no / contact_no."""
+    queryset = VehicleList.objects.values(*LIST_FIELDS)
+    if search:
+        queryset = queryset.filter(Q(vehicle_no__icontains=search) | Q(contact_no__icontains=search))
+    return queryset
+
+
+def rc_urls(names):
+    """
+    {file_name: url} for stored RC documents. Cached URLs come back in one
+    cache round trip; only the misses are signed by the storage backend.
+    """
+    names = {name for name in names if name}
+    if not names:
+        return {}
+
+    keys = {RC_URL_KEY.format(name): name for name in names}
+    cached = cache.get_many(list(keys))
+    urls = {keys[key]: url for key, url in cached.items()}
+
+    missing = names - urls.keys()
+    if missing:
+        storage = VehicleList._meta.get_field('rc_document').storage
+        fresh = {name: storage.url(name) for name in missing}
+        cache.set_many({RC_URL_KEY.format(name): url for name, url in fresh.items()}, RC_URL_TTL)
+        urls.update(fresh)
+    return urls
+
+
+def forget_rc_url(name):
+    """Drops a cached URL (the document was replaced or deleted)."""
+    if name:
+        cache.delete(RC_URL_KEY.format(name))
+
+
+def vehicle_rows(rows):
+    """API dicts for the VehicleList.jsx table."""
+    urls = rc_urls([row['rc_document'] for row in rows] + [row['rc_thumbnail'] for row in rows])
+    return [{
+        "id": row['id'],
+        "vehicle_no": row['vehicle_no'],
+        "contact_no": row['contact_no'],
+        "ownership": row['vehicle_ownership'],
+        "cab_type": row['cab_type'],
+        "rc_document": urls.get(row['rc_document']),
+        "rc_thumbnail": urls.get(row['rc_thumbnail']),
+        "rc_status": row['rc_status'],
+    } for row in rows]
+
+
+# ==========================================
+# BULK IMPORT (CSV / XLSX roster)
+# ==========================================
+def last_digit_for(vehicle_no):
+    """Trailing number of a registration: 'DL-01-AB-1234' -> '1234'."""
+    match = re.search(r'(\d+)\D*$', vehicle_no or '')
+    return match.group(1)[-4:] if match else None
+
+
+def _sheet_rows(fileobj, filename):
+    """Raw rows (lists of cells) of an uploaded CSV or XLSX roster."""
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield ['' if cell is None else str(cell) for cell in row]
+        finally:
+            workbook.close()
+    else:
+        yield from csv.reader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+
+
+def read_vehicle_rows(fileobj, filename):
+    """
+    Yields (row_number, {field: value}) for every non-empty roster row.
+    Only the columns present in the header show up in the dicts.
+    """
+    rows = _sheet_rows(fileobj, filename)
+    header = [cell.strip().lower() for cell in next(rows, [])]
+    columns = {}
+    for field, options in IMPORT_COLUMNS.items():
+        index = next((header.index(c) for c in options if c in header), None)
+        if index is not None:
+            columns[field] = index
+    if 'vehicle_no' not in columns:
+        raise ValueError("Roster needs a vehicle_no column")
+
+    for number, row in enumerate(rows, start=2):
+        values = {field: row[i].strip() if i < len(row) else '' for field, i in columns.items()}
+        if any(values.values()):
+            yield number, values
+
+
+def normalize_vehicle_no(value):
+    """' dl01  ab1234' -> 'DL01 AB1234': the form every save path stores."""
+    return re.sub(r'\s+', ' ', value or '').strip().upper()
+
+
+def _clean_vehicle(values):
+    """
+    Validated field dict for one roster row; raises ValueError with the
+    reason. Blank cells are left out, so they never overwrite stored values.
+    """
+    cleaned = {}
+    vehicle_no = normalize_vehicle_no(values['vehicle_no'])
+    if not vehicle_no:
+        raise ValueError("Vehicle Number is required")
+    if not re.search(r'\d', vehicle_no):
+        raise ValueError(f"Invalid vehicle number: {vehicle_no}")
+    cleaned['vehicle_no'] = vehicle_no
+
+    if 'contact_no' in values:
+        contact = re.sub(r'\D', '', values['contact_no'])
+        if len(contact) == 12 and contact.startswith('91'):
+            contact = contact[2:]
+        if contact and len(contact) != 10:
+            raise ValueError(f"Contact number must have 10 digits: {values['contact_no']}")
+        if contact:
+            cleaned['contact_no'] = contact
+
+    for field in ('cab_type', 'vehicle_ownership'):
+        if values.get(field):
+            cleaned[field] = values[field]
+
+    for field, value in cleaned.items():
+        max_length = VehicleList._meta.get_field(field).max_length
+        if value and len(value) > max_length:
+            raise ValueError(f"{field} longer than {max_length} characters: {value}")
+
+    cleaned['last_digit'] = last_digit_for(vehicle_no)
+    return cleaned
+
+
+def _upsert(batch, update_fields):
+    existing = set(
+        VehicleList.objects.filter(vehicle_no__in=[v.vehicle_no for v in batch])
+        .values_list('vehicle_no', flat=True)
+    )
+    VehicleList.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['vehicle_no'],
+        update_fields=update_fields,
+    )
+    return len(batch) - len(existing), len(existing)
+
+
+def import_vehicles(fileobj, filename, dry_run=False):
+    """
+    Upserts a CSV / XLSX fleet roster on vehicle_no.
+
+    Every row is validated first; bad rows (and repeats of a vehicle already
+    seen in the file) are reported and skipped, the rest are written in
+    batches inside one transaction. Existing vehicles only get the cells the
+    row fills (a blank cell keeps the stored value), last_digit is always
+    refreshed. With `dry_run` nothing is written. Returns import stats and
+    the row errors.
+    """
+    rows = read_vehicle_rows(fileobj, filename)
+    first = next(rows, None)
+    if first is None:
+        return {"rows": 0, "created": 0, "updated": 0, "error_count": 0, "errors": []}
+
+    stats = {"rows": 0, "created": 0, "updated": 0, "error_count": 0, "errors": []}
+    seen = {}
+    valid = []
+    for number, values in chain([first], rows):
+        stats["rows"] += 1
+        try:
+            cleaned = _clean_vehicle(values)
+            if cleaned['vehicle_no'] in seen:
+                raise ValueError(f"Duplicate of row {seen[cleaned['vehicle_no']]}")
+        except ValueError as e:
+            stats["error_count"] += 1
+            if len(stats["errors"]) < MAX_IMPORT_ERRORS:
+                stats["errors"].append({"row": number, "vehicle_no": values['vehicle_no'], "error": str(e)})
+            continue
+        seen[cleaned['vehicle_no']] = number
+        valid.append(cleaned)
+
+    if dry_run:
+        stats["valid"] = len(valid)
+        return stats
+
+    with transaction.atomic():
+        for start in range(0, len(valid), IMPORT_BATCH):
+            # Rows filling the same columns share one upsert that updates just those
+            groups = defaultdict(list)
+            for cleaned in valid[start:start + IMPORT_BATCH]:
+                fields = tuple(f for f in cleaned if f not in ('vehicle_no', 'last_digit'))
+                groups[fields].append(VehicleList(**cleaned))
+            for fields, batch in groups.items():
+                created, updated = _upsert(batch, [*fields, 'last_digit'])
+                stats["created"] += created
+                stats["updated"] += updated
+    return stats
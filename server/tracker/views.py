@@ -1,87 +1,49 @@
 import logging
 import json
-import calendar
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from django.http import JsonResponse
-from django.core.paginator import Paginator
-from django.db.models import Count, Q, Max
+from functools import wraps
+from inspect import iscoroutinefunction
+from django.http import StreamingHttpResponse, FileResponse
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import AsyncPaginator, Paginator
+from django.db import transaction
+from django.db.models import Count
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 
 # IMPORT YOUR MODELS
-from .models import MISReport, T3Locality, T3BillingZone, T3BillingKM, VehicleList
+from .models import MISReport, T3Locality, T3BillingZone, T3LocalityBilling, LocalityClaim, VehicleList
+from .resolver import aget_master_stamp, get_master_stamp, normalize, resolver
+from . import claims, counters, dbstats, export, mapping, rc_worker, vehicles
+from .search import search_addresses
+from .ingest import ingest_addresses
+from .suggest import suggest_localities
+from . import gps
+from .tracks import summarize_tracks
+from .reports import MAX_MONTHS, areports_for_range, billing_month, parse_month, reports_for_range
+from .spatial import get_grid
+from .responses import JsonResponse, table_results
+from .pagination import (
+    PAGE_SIZE, MAX_PAGE_SIZE, keyset_page, akeyset_page, parse_cursor,
+    approximate_count, aapproximate_count, cursor_pagination,
+)
 
 logger = logging.getLogger(__name__)
 
-# ==========================================
-# HELPER: SMART MATCHING (Fixes "South" vs "South Zone")
-# ==========================================
-def normalize(text):
-    """Removes spaces, lowercase, and strips 'zone' for fuzzy matching."""
-    if not text: return ""
-    # 1. Basic cleanup
-    text = str(text).strip().lower()
-    return text
-
-def create_lookup_dict(queryset, key_field, val_field):
-    """
-    Creates a dictionary where the key is the 'normalized' version of the field.
-    This allows us to find 'South Zone' even if we search for 'South'.
-    """
-    lookup = {}
-    data = list(queryset.values(key_field, val_field))
-    
-    for item in data:
-        raw_key = item[key_field]
-        val = item[val_field]
-        if raw_key:
-            # Store normalized key -> value
-            clean_key = normalize(raw_key)
-            lookup[clean_key] = val
-            
-            # ALSO store exact key -> value (just in case)
-            lookup[raw_key] = val
-            
-    return lookup
+# Pairs accepted by one save_mappings request
+MAX_BATCH_MAPPINGS = 500
+# Typeahead hits per request (default / ceiling)
+TYPEAHEAD_LIMIT = 20
+MAX_TYPEAHEAD_LIMIT = 100
 
 # ==========================================
 # 1. DASHBOARD & REPORTING
 # ==========================================
-def get_report_for_month(year, month_name):
-    try:
-        report = MISReport.objects.get(billing_year=year, billing_month=month_name)
-        total_steps = 8
-        completed = sum([
-            report.stage1_locality_set, report.stage1_gps_check,
-            report.stage2_locality_set, report.stage2_gps_check,
-            report.stage3_locality_set, report.stage3_gps_check,
-            report.final_mis_status, report.bill_approval_status
-        ])
-        progress = int((completed / total_steps) * 100)
-
-        return {
-            "found": True,
-            "progress": progress,
-            "stage1": {
-                "start": report.stage1_start_date, "end": report.stage1_end_date,
-                "locality": report.stage1_locality_set, "gps": report.stage1_gps_check
-            },
-            "stage2": {
-                "start": report.stage2_start_date, "end": report.stage2_end_date,
-                "locality": report.stage2_locality_set, "gps": report.stage2_gps_check
-            },
-            "stage3": {
-                "start": report.stage3_start_date, "end": report.stage3_end_date,
-                "locality": report.stage3_locality_set, "gps": report.stage3_gps_check
-            },
-            "final": {
-                "mis_status": report.final_mis_status,
-                "bill_approval": report.bill_approval_status
-            }
-        }
-    except MISReport.DoesNotExist:
-        return {"found": False, "progress": 0}
-
-def dashboard_data(request):
+async def dashboard_data(request):
     req_year = request.GET.get('year')
     req_month = request.GET.get('month')
 
@@ -92,105 +54,153 @@ def dashboard_data(request):
 
     curr_year = current_date.year
     curr_month_idx = current_date.month
-    curr_month_name = calendar.month_name[curr_month_idx]
-    
+
     first_day = current_date.replace(day=1)
     prev_date = first_day - timedelta(days=1)
     prev_year = prev_date.year
-    prev_month_name = calendar.month_name[prev_date.month]
 
-    current_report_data = get_report_for_month(curr_year, curr_month_name)
-    prev_report_data = get_report_for_month(prev_year, prev_month_name)
+    # Both months in one query
+    previous, current = await areports_for_range((prev_year, prev_date.month), (curr_year, curr_month_idx))
 
     data = {
-        "current": {
-            "month": curr_month_name,
-            "year": curr_year,
-            "data": current_report_data
-        },
-        "previous": {
-            "month": prev_month_name,
-            "year": prev_year,
-            "data": prev_report_data
-        }
+        "current": current,
+        "previous": previous
     }
     return JsonResponse(data)
 
+# --- Year-at-a-glance: every month of a range in one query ---
+def dashboard_range(request):
+    """
+    ?from=2025-01&to=2025-12 (defaults to the current year). Returns the
+    same per-month data as dashboard_data for every month in the range.
+    """
+    this_year = datetime.now().year
+    try:
+        start = parse_month(request.GET.get('from') or f"{this_year}-01")
+        end = parse_month(request.GET.get('to') or f"{this_year}-12")
+    except ValueError:
+        return JsonResponse({"error": "Use ?from=YYYY-MM&to=YYYY-MM"}, status=400)
+
+    if end < start:
+        start, end = end, start
+    if (end[0] - start[0]) * 12 + end[1] - start[1] >= MAX_MONTHS:
+        return JsonResponse({"error": f"Range is limited to {MAX_MONTHS} months"}, status=400)
+
+    try:
+        return JsonResponse({"months": reports_for_range(start, end)})
+    except Exception as e:
+        print(f"🔥 DASHBOARD RANGE ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
 
 # ==========================================
 # 2. LOCALITY MANAGEMENT APIS
 # ==========================================
 
+# --- Conditional GET for master data (T3BillingZone / T3BillingKM) ---
+# The ETag / Last-Modified come from the master version row in tracker_counter
+# (shared by every worker), so an unchanged list is answered with 304 before the view body runs.
+# Like django's @condition, but the row is read once per request and with the
+# async ORM for async views (condition() calls its functions synchronously).
+def _master_validators(version, changed_at):
+    return quote_etag(f"master-{version}-{int(changed_at * 1000)}"), int(changed_at)
+
+
+def _with_master_headers(request, response, etag, last_modified):
+    if request.method in ('GET', 'HEAD'):
+        if not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified)
+        response.headers.setdefault('ETag', etag)
+    return response
+
+
+def master_data(view):
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            etag, last_modified = _master_validators(*await aget_master_stamp())
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            return _with_master_headers(request, response, etag, last_modified)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified = _master_validators(*get_master_stamp())
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _with_master_headers(request, response, etag, last_modified)
+    return wrapper
+
+
+def get_operator(request, data):
+    """Who is mapping: the logged-in user, else an explicit 'operator' value."""
+    if request.user.is_authenticated:
+        return request.user.get_username()
+    return (data.get('operator') or '').strip() or None
+
+
 # --- API 1: Main Table View ---
-def locality_list_api(request):
+async def locality_list_api(request):
+    """
+    Address table for LocalityChecker. Async so a slow page doesn't pin an
+    ASGI worker; the queries still run one after another.
+    """
     try:
-        # 1. SMART LOAD: Locality -> Zone
-        # Matches "Mahipalpur" to "South" even if spaces/case differ
-        loc_to_zone = create_lookup_dict(
-            T3BillingZone.objects, 't3_locality', 't3_billing_zone'
-        )
-
-        # 2. SMART LOAD: Zone -> KM
-        # Matches "South" to "10" even if one says "South Zone"
-        zone_to_km = create_lookup_dict(
-            T3BillingKM.objects, 't3_billing_zone', 't3_billing_km'
-        )
+        after = parse_cursor(request.GET['after']) if 'after' in request.GET else None
+    except ValueError:
+        return JsonResponse({"results": [], "error": "Invalid cursor"}, status=400)
 
-        # 3. Query Addresses
+    try:
+        # 1. Query Addresses (with the materialized zone/KM from t3_locality_billing)
         page_number = request.GET.get('page', 1)
         search_query = request.GET.get('search', '').strip()
+        zone_filter = request.GET.get('zone', '').strip()
+        status_filter = request.GET.get('status', '').strip()
 
-        queryset = T3Locality.objects.values('id', 'address', 't3_locality').order_by('-id')
+        queryset = T3Locality.objects.values(*mapping.RESOLVED_VALUES).order_by('-id')
 
         if search_query:
-            queryset = queryset.filter(
-                Q(address__icontains=search_query) | 
-                Q(t3_locality__icontains=search_query)
+            # Indexed search (trigram / FTS5); ?order=rank puts best matches first
+            # (sync: it may introspect the FTS table once)
+            queryset = await sync_to_async(search_addresses)(
+                queryset, search_query, fields=('address', 't3_locality'),
+                ranked=request.GET.get('order') == 'rank'
             )
 
-        paginator = Paginator(queryset, 50)
-        page_obj = paginator.get_page(page_number)
+        # 2. Zone / Status filters run as indexed queries on t3_locality_billing
+        if zone_filter:
+            queryset = queryset.filter(billing__zone_key=normalize(zone_filter))
+        if status_filter:
+            queryset = queryset.filter(billing__status__iexact=status_filter)
+
+        # 3. Page: keyset cursor (?after=<id>) or classic page numbers
+        if 'after' in request.GET:
+            rows, next_cursor = await akeyset_page(queryset, after, descending=True)
+            total = await aapproximate_count(queryset) if request.GET.get('approx') else None
+            pagination = cursor_pagination(next_cursor, total)
+        else:
+            paginator = AsyncPaginator(queryset, PAGE_SIZE)
+            page_obj = await paginator.aget_page(page_number)
+            rows = await page_obj.aget_object_list()
+            pagination = {
+                "total_pages": await paginator.anum_pages(),
+                "current_page": page_obj.number,
+                "total_records": await paginator.acount()
+            }
 
-        results = []
-        for row in page_obj:
-            raw_loc_name = row.get('t3_locality') or ""
-            
-            # --- SMART LOOKUP ---
-            # 1. Normalize the locality name from the address
-            clean_loc = normalize(raw_loc_name)
-            
-            # 2. Find Zone (Look up using normalized key)
-            found_zone = loc_to_zone.get(clean_loc, "-")
-            
-            # 3. Find KM (Normalize the found zone first!)
-            # This ensures "South" finds "South Zone" in the KM table
-            clean_zone_key = normalize(found_zone)
-            found_km = zone_to_km.get(clean_zone_key, "-")
-
-            status = "Done" if (raw_loc_name and raw_loc_name.strip()) else "Pending"
-
-            results.append({
-                "id": row['id'],
-                "address": row['address'],
-                "locality": raw_loc_name,
-                "locality_id": raw_loc_name,
-                "billing_zone": found_zone,
-                "billing_km": found_km,
-                "status": status
-            })
+        # 4. Cached master snapshot + maintained pending counter (no COUNT(*))
+        master = await resolver.acurrent()
+        global_pending = await counters.apending_count()
 
-        global_pending = T3Locality.objects.filter(
-            Q(t3_locality__isnull=True) | Q(t3_locality='')
-        ).count()
+        # Materialized zone/KM, or the cached resolver for rows not materialized yet
+        results = [mapping.resolved_row(row, master) for row in rows]
 
         return JsonResponse({
-            "results": results,
+            "results": table_results(request, results),
             "global_pending": global_pending,
-            "pagination": {
-                "total_pages": paginator.num_pages,
-                "current_page": page_obj.number,
-                "total_records": paginator.count
-            }
+            "pagination": pagination
         })
 
     except Exception as e:
@@ -199,15 +209,15 @@ def locality_list_api(request):
 
 
 # --- API 2: Dropdown Data (Used for Preview) ---
-def dropdown_localities(request):
+@cache_control(no_cache=True)
+@master_data
+async def dropdown_localities(request):
     try:
-        # 1. SMART LOAD: Zone -> KM
-        zone_to_km = create_lookup_dict(
-            T3BillingKM.objects, 't3_billing_zone', 't3_billing_km'
-        )
+        # 1. SMART LOAD: Zone -> KM (cached per worker)
+        master = await resolver.acurrent()
 
         # 2. Fetch all Zones
-        zone_list = list(T3BillingZone.objects.values('id', 't3_locality', 't3_billing_zone'))
+        zone_list = master.zone_rows
         
         data = []
         seen_names = set()
@@ -223,8 +233,7 @@ def dropdown_localities(request):
             
             # 3. SMART LOOKUP for KM
             # Normalize zone name to find match (e.g. "South" matches "South Zone")
-            clean_zone = normalize(raw_zone_name)
-            found_km = zone_to_km.get(clean_zone, "-")
+            found_km = master.km_for(raw_zone_name)
 
             data.append({
                 "id": raw_loc_name,             
@@ -234,19 +243,101 @@ def dropdown_localities(request):
             })
 
         data.sort(key=lambda x: x['locality_name'])
-        return JsonResponse(data, safe=False)
+        return JsonResponse(table_results(request, data), safe=False)
 
     except Exception as e:
         print(f"🔥 DROPDOWN ERROR: {e}")
         return JsonResponse({"error": str(e)}, status=500)
 
 
+# --- API 2a: Locality Typeahead (?prefix=mahi&limit=20) ---
+@cache_control(no_cache=True)
+@master_data
+def locality_typeahead(request):
+    """
+    Master localities starting with `prefix`, with zone and KM, from the
+    worker's in-memory prefix index (no query while the master is unchanged).
+    """
+    try:
+        prefix = request.GET.get('prefix', '').strip()
+        limit = min(int(request.GET.get('limit') or TYPEAHEAD_LIMIT), MAX_TYPEAHEAD_LIMIT)
+        return JsonResponse({"results": resolver.current().search_prefix(prefix, limit)})
+    except ValueError:
+        return JsonResponse({"error": "Invalid limit"}, status=400)
+    except Exception as e:
+        print(f"🔥 TYPEAHEAD ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# --- API 2b: Billing Zones with their KM (master data) ---
+@cache_control(no_cache=True)
+@master_data
+def master_zones(request):
+    """Every billing zone in T3BillingZone with its KM and locality count."""
+    try:
+        master = resolver.current()
+        zones = {}
+        for item in master.zone_rows:
+            raw_zone_name = item['t3_billing_zone']
+            if not raw_zone_name or not item['t3_locality']:
+                continue
+            key = normalize(raw_zone_name)
+            if key not in zones:
+                zones[key] = {
+                    "billing_zone": raw_zone_name,
+                    "billing_km": master.km_for(raw_zone_name),
+                    "localities": 0,
+                }
+            zones[key]["localities"] += 1
+
+        data = sorted(zones.values(), key=lambda x: x['billing_zone'].lower())
+        return JsonResponse({"results": data})
+
+    except Exception as e:
+        print(f"🔥 MASTER ZONES ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
 # --- API 3: Next Pending Address ---
 def next_pending(request):
+    """
+    Next address to map. Logged-in operators (or ?operator=<name>) get a
+    leased batch from the work queue, so two people never see the same row;
+    the rest of the batch comes back as 'prefetch'.
+    """
     try:
-        pending_item = T3Locality.objects.filter(
-            Q(t3_locality__isnull=True) | Q(t3_locality='')
-        ).first()
+        operator = get_operator(request, request.GET)
+
+        if operator:
+            batch = claims.claim_pending(operator)
+            if not batch:
+                return JsonResponse({"found": False})
+            current, prefetch = batch[0], batch[1:]
+            # One master snapshot for the whole batch's suggestions
+            master = resolver.current()
+            return JsonResponse({
+                "found": True,
+                "data": {
+                    "id": current['id'],
+                    "address": current['address'],
+                    "locality": "",
+                    "lease_expires": current['expires_at'],
+                    "suggestions": suggest_localities(current['address'], master=master)
+                },
+                "prefetch": [{
+                    "id": row['id'],
+                    "address": row['address'],
+                    "suggestions": suggest_localities(row['address'], limit=1, master=master)
+                } for row in prefetch]
+            })
+
+        # Anonymous: first pending row nobody has claimed
+        # (served by the partial index t3_locality_pending_idx)
+        pending_item = (
+            T3Locality.objects.filter(counters.PENDING_Q)
+            .exclude(id__in=LocalityClaim.objects.values('address_id'))
+            .order_by('id').first()
+        )
 
         if pending_item:
             return JsonResponse({
@@ -254,7 +345,8 @@ def next_pending(request):
                 "data": {
                     "id": pending_item.id,
                     "address": pending_item.address,
-                    "locality": "" 
+                    "locality": "",
+                    "suggestions": suggest_localities(pending_item.address)
                 }
             })
         else:
@@ -265,6 +357,86 @@ def next_pending(request):
         return JsonResponse({"error": str(e)}, status=500)
 
 
+# --- API 3b: Claim / Release Work-Queue Batches ---
+@csrf_exempt
+def claim_pending_batch(request):
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'})
+
+    try:
+        data = json.loads(request.body or '{}')
+        operator = get_operator(request, data)
+        if not operator:
+            return JsonResponse({'success': False, 'error': 'Missing operator'})
+
+        batch_size = min(int(data.get('batch_size') or claims.BATCH_SIZE), 100)
+        batch = claims.claim_pending(operator, batch_size=batch_size)
+
+        return JsonResponse({
+            'success': True,
+            'lease_seconds': claims.LEASE_SECONDS,
+            'results': batch
+        })
+    except Exception as e:
+        print(f"🔥 CLAIM ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@csrf_exempt
+def release_claims(request):
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'})
+
+    try:
+        data = json.loads(request.body or '{}')
+        operator = get_operator(request, data)
+        if not operator:
+            return JsonResponse({'success': False, 'error': 'Missing operator'})
+
+        address_ids = data.get('address_ids')
+        if address_ids:
+            released = claims.release(address_ids, operator=operator)
+        else:
+            released = claims.release_operator(operator)
+
+        return JsonResponse({'success': True, 'count': released})
+    except Exception as e:
+        print(f"🔥 RELEASE ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+# --- API 3c: Locality Suggestions ---
+def suggest_locality(request):
+    """
+    Ranked locality suggestions for ?address_id=<id> or free text ?address=...,
+    learned from already-mapped addresses and the master list.
+    """
+    try:
+        address = request.GET.get('address', '').strip()
+        address_id = request.GET.get('address_id')
+        try:
+            address_id = int(address_id) if address_id else None
+            limit = min(int(request.GET.get('limit', 5)), 20)
+        except ValueError:
+            return JsonResponse({"error": "Invalid address_id or limit"}, status=400)
+
+        if address_id is not None:
+            address = T3Locality.objects.values_list('address', flat=True).get(id=address_id)
+        if not address:
+            return JsonResponse({"error": "Missing address or address_id"}, status=400)
+
+        return JsonResponse({
+            "address": address,
+            "suggestions": suggest_localities(address, limit=limit)
+        })
+
+    except T3Locality.DoesNotExist:
+        return JsonResponse({"error": "Address not found"}, status=404)
+    except Exception as e:
+        print(f"🔥 SUGGEST ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
 # --- API 4: Save Mapping (Single) ---
 @csrf_exempt
 def save_mapping(request):
@@ -278,10 +450,12 @@ def save_mapping(request):
 
         if not address_id or not new_locality_name:
             return JsonResponse({'success': False, 'error': 'Missing ID or Locality'})
+        # Store the master spelling, not whatever case the operator typed
+        new_locality_name = resolver.current().canonical_name(new_locality_name) or new_locality_name
 
-        obj = T3Locality.objects.get(id=address_id)
-        obj.t3_locality = new_locality_name 
-        obj.save()
+        # Writes t3_locality and refreshes the materialized zone/KM row
+        if not mapping.set_locality([address_id], new_locality_name):
+            raise T3Locality.DoesNotExist
 
         return JsonResponse({'success': True})
 
@@ -292,25 +466,87 @@ def save_mapping(request):
         return JsonResponse({'success': False, 'error': str(e)})
 
 
+# --- API 4b: Save Mappings (Batch) ---
+@csrf_exempt
+def save_mappings(request):
+    """
+    Saves many {address_id, locality} pairs in one request and returns the
+    resolved rows (same shape as API 1) so the client can patch its table
+    in place. Unknown localities / addresses are reported per pair.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Method not allowed'})
+
+    try:
+        data = json.loads(request.body)
+        items = data.get('mappings') or []
+        if not isinstance(items, list) or len(items) > MAX_BATCH_MAPPINGS:
+            return JsonResponse({'success': False, 'error': f'Send up to {MAX_BATCH_MAPPINGS} mappings'}, status=400)
+
+        master = resolver.current()
+        pairs, errors = {}, []
+        for item in items:
+            address_id = item.get('address_id')
+            locality = (item.get('locality') or item.get('locality_id') or '').strip()
+            canonical = master.canonical_name(locality)
+            if not address_id or not locality:
+                errors.append({'address_id': address_id, 'error': 'Missing ID or Locality'})
+            elif canonical is None:
+                errors.append({'address_id': address_id, 'error': f'Unknown locality: {locality}'})
+            else:
+                # Repeated ids: the last pair wins; stored in the master spelling
+                pairs[int(address_id)] = canonical
+
+        saved = mapping.set_localities(pairs) if pairs else []
+        errors += [{'address_id': pk, 'error': 'Address not found'} for pk in pairs if pk not in set(saved)]
+
+        rows = T3Locality.objects.filter(id__in=saved).values(*mapping.RESOLVED_VALUES).order_by('id')
+        return JsonResponse({
+            'success': True,
+            'count': len(saved),
+            'results': [mapping.resolved_row(row, master) for row in rows],
+            'errors': errors,
+        })
+
+    except (TypeError, ValueError, AttributeError) as e:
+        return JsonResponse({'success': False, 'error': f'Invalid request: {e}'}, status=400)
+    except Exception as e:
+        print(f"🔥 SAVE MAPPINGS ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
 # --- API 5: Search Pending (Bulk Tab) ---
 def search_pending_addresses(request):
     query = request.GET.get('q', '').strip()
     page_number = request.GET.get('page', 1)
     
-    queryset = T3Locality.objects.filter(
-        Q(t3_locality__isnull=True) | Q(t3_locality='')
-    ).order_by('id')
+    queryset = T3Locality.objects.filter(counters.PENDING_Q).order_by('id')
     
     if query:
-        queryset = queryset.filter(address__icontains=query)
+        queryset = search_addresses(queryset, query, ranked=request.GET.get('order') == 'rank')
+
+    queryset = queryset.values('id', 'address')
 
-    paginator = Paginator(queryset, 50)
+    # Keyset cursor (?after=<id>) avoids COUNT(*) + OFFSET on deep pages
+    if 'after' in request.GET:
+        try:
+            after = parse_cursor(request.GET['after'])
+        except ValueError:
+            return JsonResponse({'results': [], 'error': 'Invalid cursor'}, status=400)
+        results, next_cursor = keyset_page(queryset, after)
+        total = approximate_count(queryset) if request.GET.get('approx') else None
+        return JsonResponse({
+            'results': table_results(request, results),
+            'pagination': cursor_pagination(next_cursor, total)
+        })
+
+    paginator = Paginator(queryset, PAGE_SIZE)
     page_obj = paginator.get_page(page_number)
     
-    results = list(page_obj.object_list.values('id', 'address'))
+    results = list(page_obj.object_list)
     
     return JsonResponse({
-        'results': results,
+        'results': table_results(request, results),
         'pagination': {
             'current_page': page_obj.number,
             'total_pages': paginator.num_pages,
@@ -322,16 +558,41 @@ def search_pending_addresses(request):
 # --- API 6: Bulk Save ---
 @csrf_exempt
 def bulk_save_mapping(request):
+    """
+    Maps many pending addresses to one locality. Body: locality_id plus
+    either address_ids [..] or q (every pending row matching the search).
+    Rows are written in bounded chunks and only while still pending (a row
+    mapped since the selection keeps its mapping); count is the number
+    really updated.
+    """
     if request.method == "POST":
         try:
             data = json.loads(request.body)
-            address_ids = data.get('address_ids', [])
-            loc_id_from_dropdown = data.get('locality_id')
-            
-            T3Locality.objects.filter(id__in=address_ids).update(t3_locality=loc_id_from_dropdown)
-            
-            return JsonResponse({'success': True, 'count': len(address_ids)})
+            address_ids = data.get('address_ids')
+            query = (data.get('q') or '').strip()
+            loc_id_from_dropdown = (data.get('locality_id') or '').strip()
+
+            # Validate once against the master list instead of per row
+            if not loc_id_from_dropdown:
+                return JsonResponse({'success': False, 'error': 'Missing Locality'}, status=400)
+            canonical = resolver.current().canonical_name(loc_id_from_dropdown)
+            if canonical is None:
+                return JsonResponse({'success': False, 'error': f"Unknown locality: {loc_id_from_dropdown}"}, status=400)
+            loc_id_from_dropdown = canonical
+
+            if address_ids:
+                count = mapping.bulk_set_locality(loc_id_from_dropdown, address_ids=address_ids)
+            elif query:
+                pending = search_addresses(T3Locality.objects.filter(counters.PENDING_Q), query)
+                count = mapping.bulk_set_locality(loc_id_from_dropdown, queryset=pending)
+            else:
+                return JsonResponse({'success': False, 'error': 'Send address_ids or a search q'}, status=400)
+
+            return JsonResponse({'success': True, 'count': count})
+        except (TypeError, ValueError) as e:
+            return JsonResponse({'success': False, 'error': f"Invalid request: {e}"}, status=400)
         except Exception as e:
+            print(f"🔥 BULK SAVE ERROR: {e}")
             return JsonResponse({'success': False, 'error': str(e)})
             
     return JsonResponse({'success': False, 'error': 'Invalid method'})
@@ -378,32 +639,121 @@ def add_master_locality(request):
     return JsonResponse({'success': False, 'error': 'Invalid method'})
 
 
+# --- API 7b: Upload Monthly Addresses (CSV) ---
+@csrf_exempt
+def upload_addresses(request):
+    """
+    Streams an uploaded *_locality.csv into t3_locality in chunks,
+    skipping addresses that already exist. Replaces the upload notebook.
+    """
+    if request.method != "POST":
+        return JsonResponse({'success': False, 'error': 'Invalid method'})
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'error': 'No CSV file uploaded'})
+
+    try:
+        stats = ingest_addresses(upload.file)
+        logger.info("Address upload %s: %s", upload.name, stats)
+        return JsonResponse({'success': True, **stats})
+    except Exception as e:
+        print(f"🔥 UPLOAD ADDRESSES ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+# ==========================================
+# 3. BILLING REPORTS
+# ==========================================
+
+# --- Zone / KM Summary (from t3_locality_billing) ---
+def zone_summary(request):
+    """
+    Address counts per billing zone and KM, aggregated in SQL on the
+    materialized t3_locality_billing table.
+    """
+    try:
+        rows = (
+            T3LocalityBilling.objects
+            .values('billing_zone', 'billing_km', 'status')
+            .annotate(addresses=Count('address'))
+            .order_by('billing_zone', 'status')
+        )
+        data = [{
+            "billing_zone": row['billing_zone'] or "-",
+            "billing_km": row['billing_km'] if row['billing_km'] is not None else "-",
+            "status": row['status'],
+            "addresses": row['addresses'],
+        } for row in rows]
+        return JsonResponse({"results": data})
+    except Exception as e:
+        print(f"🔥 ZONE SUMMARY ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+# --- Export Mapped Localities (Downloads page) ---
+def export_localities(request):
+    """
+    Streams the full address -> locality -> zone -> KM table as CSV
+    (default) or XLSX, optionally filtered by ?status= and ?zone=.
+    """
+    try:
+        queryset = export.export_queryset(
+            zone=request.GET.get('zone', '').strip(),
+            status=request.GET.get('status', '').strip()
+        )
+        stamp = datetime.now().strftime('%Y%m%d')
+
+        if request.GET.get('format', 'csv').lower() == 'xlsx':
+            try:
+                xlsx_file = export.write_xlsx(export.iter_resolved_rows(queryset))
+            except ImportError:
+                return JsonResponse({"error": "XLSX export needs openpyxl installed"}, status=400)
+            return FileResponse(xlsx_file, as_attachment=True, filename=f"localities_{stamp}.xlsx")
+
+        # ASGI sends only async iterators chunk by chunk; WSGI only sync ones
+        if isinstance(request, ASGIRequest):
+            content = export.astream_csv(export.aiter_resolved_rows(queryset))
+        else:
+            content = export.stream_csv(export.iter_resolved_rows(queryset))
+        response = StreamingHttpResponse(content, content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="localities_{stamp}.csv"'
+        return response
+
+    except Exception as e:
+        print(f"🔥 EXPORT ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+
 # ==========================================
 # 4. VEHICLE MANAGEMENT APIS
 # ==========================================
 
 # --- API 8: Get All Vehicles ---
-def get_vehicle_list(request):
+async def get_vehicle_list(request):
     """
-    Fetches all vehicles to display in the VehicleList.jsx table.
+    Vehicles for the VehicleList.jsx table, newest first, one keyset page
+    at a time (?after=<id>, ?page_size=, ?search= on vehicle_no / contact_no).
     """
     try:
-        # Get all vehicles, newest first
-        vehicles = VehicleList.objects.all().order_by('-id')
-        
-        data = []
-        for v in vehicles:
-            data.append({
-                "id": v.id,
-                "vehicle_no": v.vehicle_no,
-                "contact_no": v.contact_no,
-                "ownership": v.vehicle_ownership,
-                "cab_type": v.cab_type,
-                # .url gives the public link to the file on Supabase
-                "rc_document": v.rc_document.url if v.rc_document else None
-            })
-            
-        return JsonResponse({"results": data})
+        search_query = request.GET.get('search', '').strip()
+        page_size = min(int(request.GET.get('page_size') or PAGE_SIZE), MAX_PAGE_SIZE)
+        queryset = vehicles.vehicle_queryset(search_query)
+
+        rows, next_cursor = await akeyset_page(
+            queryset, parse_cursor(request.GET.get('after')), page_size=page_size, descending=True
+        )
+        total = await aapproximate_count(queryset)
+        # RC links come from the URL cache, only misses are signed (storage
+        # backends are sync)
+        data = await sync_to_async(vehicles.vehicle_rows)(rows)
+
+        return JsonResponse({
+            "results": table_results(request, data),
+            "pagination": cursor_pagination(next_cursor, total, page_size)
+        })
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor or page size"}, status=400)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
@@ -417,8 +767,8 @@ def add_vehicle(request):
     """
     if request.method == "POST":
         try:
-            # 1. Extract Text Data
-            vehicle_no = request.POST.get('vehicle_no')
+            # 1. Extract Text Data (vehicle_no stored as the roster import does)
+            vehicle_no = vehicles.normalize_vehicle_no(request.POST.get('vehicle_no'))
             contact_no = request.POST.get('contact_no')
             cab_type = request.POST.get('cab_type')
             ownership = request.POST.get('vehicle_ownership')
@@ -431,19 +781,224 @@ def add_vehicle(request):
                 return JsonResponse({"success": False, "error": "Vehicle Number is required"})
 
             # 3. Create Record in Database
-            # Django + boto3 will automatically stream the file to Supabase here
-            VehicleList.objects.create(
-                vehicle_no=vehicle_no,
-                contact_no=contact_no,
-                cab_type=cab_type,
-                vehicle_ownership=ownership,
-                rc_document=rc_file 
-            )
+            # The RC is only staged locally, once the row exists (a rejected
+            # vehicle leaves no file behind); rc_worker pushes it to storage
+            # (Supabase) and renders the thumbnail in the background
+            with transaction.atomic():
+                vehicle = VehicleList.objects.create(
+                    vehicle_no=vehicle_no,
+                    contact_no=contact_no,
+                    cab_type=cab_type,
+                    vehicle_ownership=ownership,
+                    last_digit=vehicles.last_digit_for(vehicle_no),
+                )
+                if rc_file:
+                    vehicle.rc_status = rc_worker.submit_upload(vehicle.id, rc_file)
 
-            return JsonResponse({"success": True, "message": "Vehicle Added Successfully!"})
+            return JsonResponse({
+                "success": True,
+                "message": "Vehicle Added Successfully!",
+                "id": vehicle.id,
+                "rc_status": vehicle.rc_status
+            })
 
         except Exception as e:
             print(f"🔥 ADD VEHICLE ERROR: {e}")
             return JsonResponse({"success": False, "error": str(e)})
 
-    return JsonResponse({"success": False, "error": "Invalid method"})
\ No newline at end of file
+    return JsonResponse({"success": False, "error": "Invalid method"})
+
+
+# --- API 9b: Bulk Vehicle Import (CSV / XLSX roster) ---
+@csrf_exempt
+def import_vehicles(request):
+    """
+    Upserts a vendor's fleet roster on vehicle_no in one request and returns
+    a per-row error report. Form fields: file, optional dry_run=1 to only
+    validate.
+    """
+    if request.method != "POST":
+        return JsonResponse({'success': False, 'error': 'Invalid method'})
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'error': 'No roster file uploaded'})
+
+    try:
+        dry_run = request.POST.get('dry_run') in ('1', 'true')
+        stats = vehicles.import_vehicles(upload.file, upload.name, dry_run=dry_run)
+        logger.info("Vehicle import %s: %s", upload.name, {k: v for k, v in stats.items() if k != 'errors'})
+        return JsonResponse({'success': True, 'dry_run': dry_run, **stats})
+    except ImportError:
+        return JsonResponse({'success': False, 'error': 'XLSX import needs openpyxl installed'}, status=400)
+    except (ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"🔥 IMPORT VEHICLES ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# ==========================================
+# 5. GPS VALIDATION
+# ==========================================
+
+# --- API 10: Validate GPS Points (GPS Checker page) ---
+@csrf_exempt
+def validate_gps(request):
+    """
+    Bulk-validates GPS points with NumPy: range, duplicate and teleport
+    checks, plus haversine trip distance vs the zone's T3BillingKM.
+
+    Accepts an uploaded CSV (`file`), JSON `points` [{trip_id, lat, lng,
+    ts, zone, locality, address_id}], or pasted `text` ("lat, long" per
+    line, optional `zone`). A trip's drop point is compared with its
+    mapped locality (given directly or via the T3Locality address_id).
+    With `year`, `month` (name or number) and `stage`, a clean run ticks
+    that stage's GPS Check on the MISReport.
+    """
+    if request.method != "POST":
+        return JsonResponse({'success': False, 'error': 'Invalid method'})
+
+    try:
+        upload = request.FILES.get('file')
+        if upload:
+            data = request.POST
+            trips, lat, lng, ts, info = gps.points_from_csv(upload.file)
+        else:
+            data = json.loads(request.body or '{}')
+            if data.get('points'):
+                trips, lat, lng, ts, info = gps.points_from_json(data['points'])
+            else:
+                trips, lat, lng, ts, info = gps.points_from_text(data.get('text', ''))
+
+        zone = (data.get('zone') or '').strip()
+        if zone:
+            for trip in set(trips):
+                info.setdefault(trip, {}).setdefault('zone', zone)
+
+        # Trips that name an address_id are checked against its mapped locality
+        address_ids = {trip: details['address_id'] for trip, details in info.items() if details.get('address_id')}
+        if address_ids:
+            mapped = dict(
+                T3Locality.objects.filter(id__in=list(address_ids.values()))
+                .values_list('id', 't3_locality')
+            )
+            for trip, address_id in address_ids.items():
+                info[trip].setdefault('locality', mapped.get(int(address_id)))
+
+        if not trips:
+            return JsonResponse({'success': False, 'error': 'No coordinates supplied'})
+
+        # Report whose GPS Check a clean run ticks; a bad year / month is a 400
+        stage = str(data.get('stage') or '')
+        mark = None
+        if stage in ('1', '2', '3') and data.get('year') and data.get('month'):
+            mark = (int(data['year']), billing_month(data['month']))
+
+        result = gps.validate_points(
+            trips, lat, lng, ts, info,
+            max_speed_kmh=float(data.get('max_speed_kmh') or gps.MAX_SPEED_KMH),
+            max_jump_km=float(data.get('max_jump_km') or gps.MAX_JUMP_KM),
+            km_tolerance=float(data.get('km_tolerance') or gps.KM_TOLERANCE),
+        )
+
+        result['stage_marked'] = False
+        if result['summary']['passed'] and mark:
+            # save() (not .update()) so the stored progress follows
+            flag = f'stage{stage}_gps_check'
+            for report in MISReport.objects.filter(billing_year=mark[0], billing_month=mark[1]):
+                setattr(report, flag, True)
+                report.save(update_fields=[flag])
+                result['stage_marked'] = True
+
+        return JsonResponse({'success': True, **result})
+
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"🔥 GPS VALIDATION ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# --- API 10b: Upload GPX / CSV Tracks ---
+@csrf_exempt
+def upload_tracks(request):
+    """
+    Streams an uploaded GPX or CSV track file and stores one summary
+    (points, distance, duration) per track under the month's MISReport.
+    Form fields: file, year, month (name or number), optional stage.
+    """
+    if request.method != "POST":
+        return JsonResponse({'success': False, 'error': 'Invalid method'})
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'error': 'No track file uploaded'})
+
+    try:
+        year = int(request.POST.get('year'))
+        month_name = billing_month(request.POST.get('month', ''))
+        stage = int(request.POST.get('stage') or 0) or None
+        if stage not in (None, 1, 2, 3):
+            return JsonResponse({'success': False, 'error': 'Stage must be 1, 2 or 3'}, status=400)
+    except (TypeError, ValueError, IndexError):
+        return JsonResponse({'success': False, 'error': 'Valid year and month are required'}, status=400)
+
+    report = MISReport.objects.filter(billing_year=year, billing_month=month_name).first()
+    if report is None:
+        return JsonResponse({'success': False, 'error': f'No MIS report for {month_name} {year}'})
+
+    try:
+        stats = summarize_tracks(upload.file, upload.name, report, stage=stage)
+        logger.info("Track upload %s: %s", upload.name, stats)
+        return JsonResponse({'success': True, **stats})
+    except (ValueError, ET.ParseError) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except Exception as e:
+        print(f"🔥 UPLOAD TRACKS ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+# --- API 11: Nearest Locality for GPS Points ---
+@csrf_exempt
+def nearest_locality(request):
+    """
+    Reverse-geocodes a batch of points to the nearest master locality and
+    zone using the in-memory centroid grid. Body: {"points": [[lat, lng], ...]}.
+    """
+    if request.method != "POST":
+        return JsonResponse({'success': False, 'error': 'Invalid method'})
+
+    try:
+        data = json.loads(request.body or '{}')
+        points = data.get('points') or []
+        lat = [float(p[0]) for p in points]
+        lng = [float(p[1]) for p in points]
+
+        grid = get_grid()
+        if not len(grid):
+            return JsonResponse({'success': False, 'error': 'No locality centroids loaded'})
+
+        return JsonResponse({'success': True, 'results': grid.lookup(lat, lng)})
+
+    except (TypeError, ValueError, IndexError):
+        return JsonResponse({'success': False, 'error': 'Points must be [lat, lng] pairs'}, status=400)
+    except Exception as e:
+        print(f"🔥 NEAREST LOCALITY ERROR: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# ==========================================
+# 6. MONITORING
+# ==========================================
+
+# --- Database connection / pool statistics ---
+def db_stats(request):
+    """
+    Connection mode and reuse counters of the worker that answers; in pool
+    mode also checkouts, wait times and saturation from psycopg_pool.
+    """
+    try:
+        return JsonResponse(dbstats.db_stats())
+    except Exception as e:
+        print(f"🔥 DB STATS ERROR: {e}")
+        return JsonResponse({"error": str(e)}, status=500)